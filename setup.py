@@ -0,0 +1,24 @@
+from setuptools import setup
+
+import turbo_coder
+
+setup(
+    name="turbo_coder",
+    version=turbo_coder.__version__,
+    description="Turbo code encoders, decoders and bit error rate simulations",
+    license="EPL-1.0",
+    packages=["turbo_coder"],
+    python_requires=">=3.8",
+    install_requires=["humanize"],
+    extras_require={
+        "yaml": ["PyYAML"],
+        "numpy": ["numpy"],
+        "numba": ["numpy", "numba"],
+        "plot": ["matplotlib"],
+    },
+    entry_points={
+        "console_scripts": [
+            "turbo-sim = turbo_coder.runner:main",
+        ],
+    },
+)
@@ -0,0 +1,45 @@
+import unittest
+
+from turbo_coder import benchmark
+from turbo_coder import lookup_tables
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_find_tables_skips_aliases(self):
+        names = [name for name, table in benchmark.find_tables()]
+        self.assertIn("gzl_rsc212", names)
+        self.assertNotIn("gzl_rsc", names)
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_is_systematic(self):
+        self.assertTrue(benchmark.is_systematic(lookup_tables.gzl_rsc))
+        self.assertFalse(benchmark.is_systematic(lookup_tables.gzl_convo213))
+
+    def test_cases_run(self):
+        tables = [("gzl_rsc212", lookup_tables.gzl_rsc212)]
+        cases = benchmark.make_cases(tables, [64])
+        components = set(case_id.split("/")[0] for case_id, bit_count, func in cases)
+        self.assertTrue({"interleaver", "map", "map_radix4", "turbo_decode", "batch_turbo_f32"} <= components)
+
+        for case_id, bit_count, func in cases:
+            if not case_id.startswith("batch_turbo"):
+                func()
+
+    def test_measure(self):
+        result = benchmark.measure(lambda: sum(range(100)), 100, 2)
+        self.assertGreater(result["mbps"], 0)
+        self.assertGreaterEqual(result["seconds"], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"a": {"mbps": 10.0}, "b": {"mbps": 10.0}}
+        results = {"a": {"mbps": 9.5}, "b": {"mbps": 5.0}, "c": {"mbps": 1.0}}
+        self.assertEqual(benchmark.compare(results, baseline, 0.1), ["b"])
+
+    def test_validate_precision(self):
+        check = benchmark.validate_precision(lookup_tables.gzl_rsc, 64, frame_count=10, iterations=2)
+        self.assertTrue(check["agree"])
+        self.assertGreater(check["errors_f64"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import unittest
+from multiprocessing.connection import Client
+
+from turbo_coder import config
+from turbo_coder import distributed
+from turbo_coder import simcore
+
+
+def configurations(**options):
+    spec = {"description": "turbo", "frame_length": 40, "ebn0s": [-2.0, 0.0], "repeat_count": 12,
+            "interleaver": "random:1", "code": "gzl_rsc", "stopping": {"without_errors": False}}
+    spec.update(options)
+    return config.build_configurations({"specimens": [spec]})
+
+
+class TestDistributed(unittest.TestCase):
+    def serve(self, configs, process_count=2):
+        coordinator = distributed.Coordinator(configs, ("127.0.0.1", 0), b"secret", chunk_size=5, seed=7)
+        workers = distributed.start_workers(coordinator.address, process_count, b"secret")
+        results = coordinator.serve()
+        for process in workers:
+            process.join()
+        return coordinator, results
+
+    def test_same_frames_as_simcore(self):
+        coordinator, results = self.serve(configurations())
+        expected = simcore.create_specimens(configurations(), 7)[0].samplen()
+
+        self.assertEqual(coordinator.done_count, len(coordinator.chunks))
+        self.assertEqual(results[0].frame_counts, [12, 12])
+        self.assertEqual(results[0].bit_errors, expected.bit_errors)
+        self.assertEqual(results[0].frame_errors, expected.frame_errors)
+
+    def test_make_chunks(self):
+        specimens = simcore.create_specimens(configurations(), 7)
+        chunks = distributed.make_chunks(specimens, 5)
+        self.assertEqual([(chunk.point, chunk.start, chunk.count) for chunk in chunks],
+                         [(0, 0, 5), (0, 5, 5), (0, 10, 2), (1, 0, 5), (1, 5, 5), (1, 10, 2)])
+
+    def test_listens_on_loopback_with_a_random_key(self):
+        previous = os.environ.pop(distributed.AUTHKEY_VARIABLE, None)
+        try:
+            coordinator = distributed.Coordinator(configurations(), (distributed.HOST, 0))
+        finally:
+            if previous is not None:
+                os.environ[distributed.AUTHKEY_VARIABLE] = previous
+        try:
+            self.assertEqual(coordinator.address[0], "127.0.0.1")
+            self.assertTrue(coordinator.generated_authkey)
+            self.assertEqual(len(coordinator.authkey), 32)
+            self.assertNotEqual(coordinator.authkey, distributed.Coordinator(
+                configurations(), (distributed.HOST, 0)).authkey)
+        finally:
+            coordinator.listener.close()
+
+    def test_rejects_wrong_key(self):
+        coordinator = distributed.Coordinator(configurations(), ("127.0.0.1", 0), b"secret")
+        try:
+            with self.assertRaises(multiprocessing.AuthenticationError):
+                Client(coordinator.address, authkey=b"turbo")
+        finally:
+            coordinator.listener.close()
+
+    def test_rejects_sweeps(self):
+        with self.assertRaises(ValueError):
+            distributed.Coordinator(configurations(sweep=True), ("127.0.0.1", 0), b"secret")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from turbo_coder import decode
+from turbo_coder import lookup_tables
+from turbo_coder import results
+from turbo_coder import simcore
+
+
+def make_result(bit_errors, frame_counts=(10, 10, 0), description="turbo"):
+    return simcore.SampleResult([0.0, 1.0, 2.0], [0.0] * 3, description, 100, [10] * 3, list(frame_counts),
+                                list(bit_errors), [min(e, 1) for e in bit_errors], [0.5] * 3, 1, [None] * 3)
+
+
+class TestConfigHash(unittest.TestCase):
+    def test_ignores_what_is_simulated(self):
+        config = {"description": "a", "frame_length": 100, "ebn0s": [1], "repeat_count": 10,
+                  "decoder_func": decode.MapDecoder(lookup_tables.gzl_rsc)}
+        other = dict(config, description="b", ebn0s=[2, 3], repeat_count=[5, 5])
+        self.assertEqual(results.config_hash(config), results.config_hash(other))
+
+    def test_depends_on_the_system(self):
+        config = {"frame_length": 100, "decoder_func": decode.MapDecoder(lookup_tables.gzl_rsc)}
+        self.assertNotEqual(results.config_hash(config), results.config_hash(dict(config, frame_length=200)))
+        self.assertNotEqual(results.config_hash(config), results.config_hash(
+            dict(config, decoder_func=decode.MapDecoder(lookup_tables.gzl_rsc, radix=4))))
+
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = results.ResultsStore(os.path.join(self.directory, "results.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        run_id = self.store.add_run({"seed": 1})
+        self.store.add_results(run_id, [make_result([30, 4, 0])], ["abc"])
+
+        points = self.store.points("abc")
+        self.assertEqual([point.ebn0 for point in points], [0.0, 1.0])
+        self.assertEqual([point.bit_errors for point in points], [30, 4])
+        self.assertEqual(points[0].bits, 1000)
+        self.assertEqual(self.store.curve("abc"), ([0.0, 1.0], [0.03, 0.004], "turbo"))
+        self.assertEqual(self.store.find("tur"), [("abc", "turbo")])
+
+    def test_runs_add_up(self):
+        for bit_errors in ([30, 4, 0], [10, 2, 0]):
+            self.store.add_results(self.store.add_run({}), [make_result(bit_errors)], ["abc"])
+
+        points = self.store.points("abc")
+        self.assertEqual([point.frames for point in points], [20, 20])
+        self.assertEqual([point.bit_errors for point in points], [40, 6])
+
+    def test_merge(self):
+        self.store.add_results(self.store.add_run({}), [make_result([30, 4, 0])], ["abc"])
+
+        other = results.ResultsStore(os.path.join(self.directory, "other.db"))
+        other.add_results(other.add_run({}), [make_result([10, 2, 0], description="other")], ["def"])
+        other.add_results(other.add_run({}), [make_result([10, 2, 0])], ["abc"])
+        other.close()
+
+        for i in range(2):
+            self.store.merge(os.path.join(self.directory, "other.db"))
+
+        self.assertEqual([point.bit_errors for point in self.store.points("abc")], [40, 6])
+        self.assertEqual([point.bit_errors for point in self.store.points("def")], [10, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import multiprocessing
+import unittest
+
+from turbo_coder import decode
+from turbo_coder import encode
+from turbo_coder import simcore
+
+
+def uncoded_specimen(spec_id=0, ebn0s=(0.0, 2.0), repeat_count=5, **kwargs):
+    return simcore.Specimen(spec_id, 100, encode.PassEncoder(), decode.PassDecoder(), list(ebn0s),
+                            repeat_count, "uncoded", seed=1234, **kwargs)
+
+
+def _report(progress):
+    progress.update(1, "R", 1, 3, 7)
+
+
+class TestProgressCounters(unittest.TestCase):
+    def setUp(self):
+        self.specimens = [uncoded_specimen(0), uncoded_specimen(1)]
+        self.progress = simcore.ProgressCounters(len(self.specimens))
+
+    def tearDown(self):
+        self.progress.close()
+
+    def test_initial_status(self):
+        status = self.progress.read(self.specimens[0])
+        self.assertEqual(status.status, "N")
+        self.assertEqual(status.progress, 0)
+
+    def test_update_from_another_process(self):
+        process = multiprocessing.Process(target=_report, args=(self.progress,))
+        process.start()
+        process.join()
+
+        status = self.progress.read(self.specimens[1])
+        self.assertEqual(status.status, "R")
+        self.assertEqual(status.progress, 80)
+        self.assertAlmostEqual(status.current_estimate, 7 / 300)
+        self.assertEqual(self.progress.read(self.specimens[0]).status, "N")
+
+    def test_specimen_reports(self):
+        specimen = uncoded_specimen(0, progress=self.progress)
+        specimen.samplen()
+        self.assertEqual(self.progress.read(specimen).status, "F")
+
+
+if __name__ == '__main__':
+    unittest.main()
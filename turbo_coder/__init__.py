@@ -0,0 +1,3 @@
+"""Turbo code encoders, decoders and bit error rate simulations.
+"""
+__version__ = "0.1.0"
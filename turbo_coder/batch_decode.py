@@ -0,0 +1,443 @@
+"""Vectorized encoding and MAP decoding of many frames at once with NumPy.
+
+The recursions still step through the trellis one position at a time, but
+every step processes all frames and states with a few array operations.
+Metrics are kept in the log domain, so no normalization to probabilities is
+needed; each step subtracts the maximum metric to keep values bounded.
+
+Metrics are stored state-major, as arrays of shape (steps, states, frames),
+so the metrics of a state in all frames are contiguous and every operation
+runs over long rows of frames. They can be computed in float32, which
+halves memory traffic and fits twice the values in a SIMD register; the
+normalization keeps metrics small, so decisions rarely differ from float64
+(see benchmark.validate_precision).
+
+LazyMap computes LLRs only for requested ranges of bits, and
+screened_turbo_decode uses it for a cheap Max-Log estimate of the headers
+of frames, so only the frames whose header passes a check are turbo
+decoded.
+"""
+
+import numpy as np
+
+from .encode import termination_inputs
+from . import helpers
+
+_trellises = {}
+
+
+class Trellis(object):
+    """Arrays describing a lookup table. Branch b leaves state
+    from_state[b] with input inputs[b] and enters to_state[b], producing
+    outputs[b] (a row of values 0 or 1). An input is the number formed by
+    the branch's input_bits[b], of which there are two per step in radix-4
+    trellises.
+
+    States must be numbered from 0 and every state must have the same
+    number of incoming branches.
+    """
+
+    def _termination(self, lookup_table):
+        """Returns a tuple (inputs, longest path length) of the inputs that
+        bring every state to the zero state along the shortest path.
+        """
+        inputs = termination_inputs(lookup_table, self.zero_state)
+
+        tail_length = 0
+        for state in inputs:
+            length = 0
+            while state != self.zero_state:
+                state = lookup_table[state][inputs[state]][1]
+                length += 1
+            tail_length = max(tail_length, length)
+
+        return np.array([self._input_value(inputs[state]) for state in range(self.state_count)]), tail_length
+
+    def _input_value(self, i):
+        return sum(bit << (self.input_len - 1 - j) for j, bit in enumerate(helpers.input_bits(i)))
+
+    def __init__(self, lookup_table, radix=2):
+        """Initializes the trellis.
+
+        Parameters:
+        lookup_table -- a dict of dicts of tuples in the following structure:
+            table[current_state][input] -> (output, next_state).
+        radix -- 2 for one input bit per step, or 4 to collapse every two
+            steps into one (see helpers.collapse_lookup_table).
+        """
+        if radix == 4:
+            lookup_table = helpers.collapse_lookup_table(lookup_table)
+        elif radix != 2:
+            raise ValueError("Unsupported radix {}.".format(radix))
+
+        states = sorted(lookup_table)
+        if states != list(range(len(states))):
+            raise ValueError("States must be numbered from 0.")
+
+        input_values = sorted(lookup_table[0])
+
+        self.radix = radix
+        self.state_count = len(states)
+        self.zero_state = 0
+        self.input_len = len(helpers.input_bits(input_values[0]))
+        self.output_len = len(lookup_table[0][input_values[0]][0])
+
+        self.from_state = np.repeat(np.arange(self.state_count), len(input_values))
+        self.input_bits = np.array([helpers.input_bits(i) for state in states for i in input_values])
+        self.inputs = np.array([self._input_value(i) for state in states for i in input_values])
+        self.to_state = np.array([lookup_table[state][i][1] for state in states for i in input_values])
+        self.outputs = np.array([lookup_table[state][i][0] for state in states for i in input_values])
+
+        incoming = [np.flatnonzero(self.to_state == state) for state in states]
+        if len(set(len(branches) for branches in incoming)) != 1:
+            raise ValueError("States have different numbers of incoming branches.")
+        self.incoming = np.array(incoming)
+        self.outgoing = np.arange(len(self.to_state)).reshape(self.state_count, len(input_values))
+
+        bit_output_len = self.output_len // self.input_len
+        self.systematic = bool(np.all(self.outputs[:, ::bit_output_len] == self.input_bits))
+        self.termination_inputs, self.tail_length = self._termination(lookup_table)
+
+
+def encode(trellis, bits, terminate=True):
+    """Encodes frames of bits.
+
+    Parameters:
+    trellis -- a Trellis object. Frame lengths must be a multiple of its
+        trellis.input_len.
+    bits -- an array of shape (frames, frame_length) of values 0 or 1.
+    terminate -- if True, every frame is followed by trellis.tail_length
+        steps that bring the encoder to the zero state (frames that reach it
+        earlier stay there), so all frames have the same length.
+
+    Returns an array of shape (frames, steps * output_len) of values 0 or 1.
+    """
+    bits = np.asarray(bits, dtype=int)
+    frame_count, frame_length = bits.shape
+    if frame_length % trellis.input_len:
+        raise ValueError("Frame length must be a multiple of {}.".format(trellis.input_len))
+
+    inputs = bits.reshape(frame_count, -1, trellis.input_len).dot(
+        1 << np.arange(trellis.input_len - 1, -1, -1))
+    input_steps = inputs.shape[1]
+    steps = input_steps + (trellis.tail_length if terminate else 0)
+
+    branch_of = np.zeros((trellis.state_count, 2 ** trellis.input_len), dtype=int)
+    branch_of[trellis.from_state, trellis.inputs] = np.arange(len(trellis.inputs))
+
+    encoded = np.empty((frame_count, steps, trellis.output_len), dtype=np.int8)
+    state = np.zeros(frame_count, dtype=int)
+    for k in range(steps):
+        step_inputs = inputs[:, k] if k < input_steps else trellis.termination_inputs[state]
+        branch = branch_of[state, step_inputs]
+        encoded[:, k] = trellis.outputs[branch]
+        state = trellis.to_state[branch]
+
+    return encoded.reshape(frame_count, -1)
+
+
+def maximum_a_posteriori(trellis, noisy, channel_reliability, apriori=None,
+                         terminated=True, algorithm="log", dtype=np.float64):
+    """Calculates log-likelihood ratios of many frames with the MAP (BCJR)
+    algorithm in the log domain. The result equals decode.maximum_a_posteriori
+    up to floating point error.
+
+    Parameters:
+    trellis -- a Trellis object. With a radix-4 trellis, frames of an odd
+        number of bits are decoded with a known 0 bit prepended.
+    noisy -- an array of shape (frames, bits * output_len / input_len) of
+        channel samples.
+    channel_reliability -- L_c = 4 * R * (E_b / N_0); a number or an array
+        broadcastable to noisy (per-symbol reliability).
+    apriori -- an optional array of shape (frames, n) of a priori LLRs of the
+        first n input bits; the remaining ones are taken as 0.
+    terminated -- whether the frames end in the zero state.
+    algorithm -- "log" for the exact Log-MAP or "max-log" for Max-Log-MAP.
+    dtype -- the precision of the metrics, np.float64 or np.float32.
+
+    Returns an array of shape (frames, bits) of the given dtype.
+    """
+    combine = np.logaddexp.reduce if algorithm == "log" else np.max
+
+    gammas, padding = branch_metrics(trellis, noisy, channel_reliability, apriori)
+    frame_count, steps = gammas.shape[:2]
+    gammas = np.ascontiguousarray(gammas.transpose(1, 2, 0), dtype=dtype)
+
+    alphas = np.empty((steps + 1, trellis.state_count, frame_count), dtype=dtype)
+    alphas[0] = -np.inf
+    alphas[0][trellis.zero_state] = 0
+    _forward(trellis, gammas, alphas, combine)
+
+    betas = np.empty((steps + 1, trellis.state_count, frame_count), dtype=dtype)
+    if terminated:
+        betas[steps] = -np.inf
+        betas[steps][trellis.zero_state] = 0
+    else:
+        betas[steps] = 0
+    _backward(trellis, gammas, betas, combine)
+
+    return _llrs(trellis, gammas, alphas, betas, combine)[:, padding:]
+
+
+def _forward(trellis, gammas, alphas, combine):
+    """Fills alphas[1:] from alphas[0] with the forward recursion. gammas
+    are state-major branch metrics of shape (steps, branches, frames) and
+    alphas has one more step.
+    """
+    for k in range(len(gammas)):
+        metrics = alphas[k][trellis.from_state] + gammas[k]
+        alphas[k + 1] = combine(metrics[trellis.incoming], axis=1)
+        alphas[k + 1] -= alphas[k + 1].max(axis=0)
+
+
+def _backward(trellis, gammas, betas, combine):
+    """Fills betas[:-1] from betas[-1] with the backward recursion (see
+    _forward).
+    """
+    for k in range(len(gammas) - 1, -1, -1):
+        metrics = betas[k + 1][trellis.to_state] + gammas[k]
+        betas[k] = combine(metrics[trellis.outgoing], axis=1)
+        betas[k] -= betas[k].max(axis=0)
+
+
+def _llrs(trellis, gammas, alphas, betas, combine):
+    """Returns an array of shape (frames, steps * input_len) of the LLRs of
+    the steps of gammas, given the alphas and betas at their boundaries.
+    """
+    metrics = alphas[:-1][:, trellis.from_state] + gammas + betas[1:][:, trellis.to_state]
+
+    llrs = np.empty((len(gammas), trellis.input_len, gammas.shape[2]), dtype=gammas.dtype)
+    for j in range(trellis.input_len):
+        ones = np.flatnonzero(trellis.input_bits[:, j] == 1)
+        zeros = np.flatnonzero(trellis.input_bits[:, j] == 0)
+        llrs[:, j] = combine(metrics[:, ones], axis=1) - combine(metrics[:, zeros], axis=1)
+
+    return llrs.transpose(2, 0, 1).reshape(gammas.shape[2], -1)
+
+
+class LazyMap(object):
+    """MAP decoding of many frames whose LLRs are computed only for the
+    ranges of bits requested. Forward metrics are extended on demand up to
+    the end of the furthest range requested so far. Backward metrics either
+    cover the whole frame (computed once, on the first request) or, with a
+    window, start window steps beyond the end of each range with all states
+    equally likely; this sliding-window approximation is exact where the
+    window reaches the end of the frame.
+    """
+
+    def llrs(self, start, stop):
+        """Returns an array of shape (frames, stop - start) of the LLRs of
+        bits start to stop - 1.
+        """
+        first = (start + self.padding) // self.trellis.input_len
+        last = -(-(stop + self.padding) // self.trellis.input_len)
+        self._extend_alphas(last)
+
+        if self.window is None:
+            if self._betas is None:
+                self._betas = self._new_betas(self.steps, True)
+                _backward(self.trellis, self.gammas, self._betas, self.combine)
+            betas = self._betas[first:last + 1]
+        else:
+            end = min(last + self.window, self.steps)
+            betas = self._new_betas(end - first, end == self.steps)
+            _backward(self.trellis, self.gammas[first:end], betas, self.combine)
+            betas = betas[:last - first + 1]
+
+        llrs = _llrs(self.trellis, self.gammas[first:last], self.alphas[first:last + 1], betas, self.combine)
+        offset = start + self.padding - first * self.trellis.input_len
+        return llrs[:, offset:offset + stop - start]
+
+    def _extend_alphas(self, steps):
+        if steps > self._alpha_steps:
+            _forward(self.trellis, self.gammas[self._alpha_steps:steps],
+                     self.alphas[self._alpha_steps:steps + 1], self.combine)
+            self._alpha_steps = steps
+
+    def _new_betas(self, steps, at_end):
+        """Returns backward metrics of steps steps, initialized at the last
+        one: to the zero state at the end of a terminated frame, otherwise
+        to all states equally likely.
+        """
+        betas = np.empty((steps + 1,) + self.alphas.shape[1:], dtype=self.alphas.dtype)
+        betas[steps] = 0
+        if at_end and self.terminated:
+            betas[steps] = -np.inf
+            betas[steps][self.trellis.zero_state] = 0
+        return betas
+
+    def __init__(self, trellis, noisy, channel_reliability, apriori=None, terminated=True,
+                 algorithm="log", dtype=np.float64, window=None):
+        """Computes the branch metrics. Parameters are those of
+        maximum_a_posteriori, and:
+        window -- number of steps the backward recursion of a range starts
+            beyond its end, or None for exact backward metrics of the whole
+            frame.
+        """
+        self.trellis = trellis
+        self.terminated = terminated
+        self.combine = np.logaddexp.reduce if algorithm == "log" else np.max
+        self.window = window
+
+        gammas, self.padding = branch_metrics(trellis, noisy, channel_reliability, apriori)
+        self.steps = gammas.shape[1]
+        self.gammas = np.ascontiguousarray(gammas.transpose(1, 2, 0), dtype=dtype)
+
+        self.alphas = np.empty((self.steps + 1, trellis.state_count, gammas.shape[0]), dtype=dtype)
+        self.alphas[0] = -np.inf
+        self.alphas[0][trellis.zero_state] = 0
+        self._alpha_steps = 0
+        self._betas = None
+
+
+def branch_metrics(trellis, noisy, channel_reliability, apriori=None):
+    """Calculates log-domain branch (gamma) metrics for
+    maximum_a_posteriori, whose parameters it takes.
+
+    Returns a tuple (gammas, padding) of an array of shape
+    (frames, steps, branches) and the number of prepended 0 bits.
+    """
+    weighted = channel_reliability * np.asarray(noisy, dtype=float)
+    frame_count = weighted.shape[0]
+    bit_output_len = trellis.output_len // trellis.input_len
+    bit_count = weighted.shape[1] // bit_output_len
+    padding = -bit_count % trellis.input_len
+    steps = (bit_count + padding) // trellis.input_len
+
+    if padding:
+        weighted = np.hstack((np.zeros((frame_count, padding * bit_output_len)), weighted))
+
+    weighted = weighted.reshape(frame_count, steps, trellis.output_len)
+    gammas = 0.5 * np.dot(weighted, (2 * trellis.outputs - 1).T)
+    if apriori is not None:
+        apriori = np.asarray(apriori, dtype=float)
+        padded = np.zeros((frame_count, steps * trellis.input_len))
+        padded[:, padding:padding + apriori.shape[1]] = apriori
+        gammas += 0.5 * np.dot(padded.reshape(frame_count, steps, trellis.input_len),
+                               (2 * trellis.input_bits - 1).T)
+    if padding:
+        # The prepended bit is 0, so the first step cannot start with a 1:
+        gammas[:, 0, trellis.input_bits[:, 0] == 1] = -np.inf
+
+    return gammas, padding
+
+
+def turbo_decode(trellis, noisy, interleaver, iteration_count, channel_reliability, algorithm="log",
+                 dtype=np.float64):
+    """Decodes many turbo codewords of the same length at once. The result
+    equals the LLRs behind decode.turbo_decode up to floating point error.
+
+    Parameters:
+    trellis -- a Trellis of the constituent codes.
+    noisy -- an array of shape (frames, codeword_length) of channel samples
+        laid out as encode.TurboEncoder outputs them.
+    interleaver -- an interleave.Interleaver of the frame length.
+    iteration_count -- number of decoding iterations.
+    channel_reliability -- see maximum_a_posteriori.
+    algorithm, dtype -- see maximum_a_posteriori.
+
+    Returns an array of shape (frames, frame_length) of LLRs of the
+    information bits; use hard_decisions to get the bits.
+    """
+    noisy = (channel_reliability * np.asarray(noisy, dtype=float)).astype(dtype)
+    frame_count = noisy.shape[0]
+    frame_length = len(interleaver)
+    parity_len = trellis.output_len // trellis.input_len - 1
+    permutation = np.asarray(interleaver.permutation)
+    inverted_permutation = np.asarray(interleaver.inverted_permutation)
+
+    columns = noisy.reshape(frame_count, -1, 1 + 2 * parity_len)
+    systematic = columns[:, :, 0]
+    codes = [columns[:, :, 1:1 + parity_len], columns[:, :, 1 + parity_len:]]
+
+    isystematic = np.zeros_like(systematic)
+    isystematic[:, :frame_length] = systematic[:, inverted_permutation]
+
+    def constituent_decode(systematic, code, extrinsic):
+        sequence = np.concatenate((systematic[:, :, None], code), axis=2).reshape(frame_count, -1)
+        llrs = maximum_a_posteriori(trellis, sequence, 1, extrinsic, True, algorithm, dtype)
+        return llrs, llrs[:, :frame_length] - extrinsic - systematic[:, :frame_length]
+
+    extrinsic = np.zeros((frame_count, frame_length), dtype=dtype)
+    for i in range(iteration_count):
+        llrs, extrinsic = constituent_decode(systematic, codes[0], extrinsic)
+        extrinsic = extrinsic[:, inverted_permutation]
+
+        llrs, extrinsic = constituent_decode(isystematic, codes[1], extrinsic)
+        extrinsic = extrinsic[:, permutation]
+
+    return llrs[:, :frame_length][:, permutation]
+
+
+def turbo_header(trellis, noisy, header_length, channel_reliability, window=32, algorithm="max-log",
+                 dtype=np.float64):
+    """Estimates the LLRs of the first header_length information bits of
+    many turbo codewords cheaply, as a pre-pass deciding which frames are
+    worth a full turbo decode. Only the first constituent code is decoded,
+    since the interleaver spreads the header over the whole frame of the
+    second, and only up to window steps past the header (see LazyMap).
+
+    Parameters are those of turbo_decode, and:
+    window -- see LazyMap; None decodes the first constituent code exactly.
+    algorithm -- "max-log" by default, the cheaper one.
+
+    Returns an array of shape (frames, header_length).
+    """
+    noisy = channel_reliability * np.asarray(noisy, dtype=float)
+    frame_count = noisy.shape[0]
+    parity_len = trellis.output_len // trellis.input_len - 1
+
+    columns = noisy.reshape(frame_count, -1, 1 + 2 * parity_len)
+    sequence = columns[:, :, :1 + parity_len].reshape(frame_count, -1)
+    decoder = LazyMap(trellis, sequence, 1, None, True, algorithm, dtype, window)
+
+    return decoder.llrs(0, header_length)
+
+
+def screened_turbo_decode(trellis, noisy, interleaver, iteration_count, channel_reliability, header_length,
+                          accept, algorithm="log", dtype=np.float64, window=32):
+    """Turbo decodes only the frames whose header passes a check, e.g. an
+    address or header CRC, saving the decoding of frames that would be
+    discarded anyway. Headers are first estimated with turbo_header.
+
+    Parameters are those of turbo_decode, and:
+    header_length -- number of information bits the check looks at.
+    accept -- a function taking an array of shape (frames, header_length)
+        of header bits and returning a boolean array of the frames to
+        decode.
+    window -- see turbo_header.
+
+    Returns a tuple (accepted, llrs) of the boolean array returned by accept
+    and an array of shape (accepted frames, frame_length) of LLRs of the
+    information bits of the accepted frames.
+    """
+    noisy = np.asarray(noisy, dtype=float)
+    header = turbo_header(trellis, noisy, header_length, channel_reliability, window, "max-log", dtype)
+    accepted = np.asarray(accept(hard_decisions(header)), dtype=bool)
+
+    if np.ndim(channel_reliability) == 2:
+        channel_reliability = channel_reliability[accepted]
+    if not accepted.any():
+        return accepted, np.empty((0, len(interleaver)), dtype=dtype)
+
+    return accepted, turbo_decode(trellis, noisy[accepted], interleaver, iteration_count, channel_reliability,
+                                  algorithm, dtype)
+
+
+def hard_decisions(llrs):
+    """Returns an array of bits (uint8) of LLRs, like helpers.demodulaten
+    of their signs.
+    """
+    return (~np.signbit(llrs)).astype(np.uint8)
+
+
+def cached_trellis(lookup_table, radix=2):
+    """Returns a Trellis of the lookup table, building it only on the first
+    call for the table (which must not be modified afterwards).
+    """
+    key = id(lookup_table), radix
+    if key not in _trellises:
+        # The table is kept, so that its id is not reused:
+        _trellises[key] = (lookup_table, Trellis(lookup_table, radix))
+
+    return _trellises[key][1]
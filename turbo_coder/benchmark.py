@@ -0,0 +1,336 @@
+"""Throughput benchmarks for the codec components.
+
+Usage:
+    python -m turbo_coder.benchmark [--lengths 1000,10000] [--save baseline.json]
+                        [--compare baseline.json] [--tolerance 0.1]
+                        [--backend python] [--validate]
+
+Every case reports its throughput in information Mbit/s and the peak memory
+allocated while it ran. With --compare the process exits with status 1 if
+any case got slower than the baseline by more than the tolerance. The
+batch_turbo cases (which require NumPy) decode a batch of frames with
+batch_decode.turbo_decode in float64 and float32. With --validate the bit
+errors of float32 decoding are compared with float64 on the same frames
+(see validate_precision), and the process exits with status 1 if they
+differ by more than Monte Carlo noise.
+"""
+import argparse
+import importlib.util
+import json
+import math
+import random
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:    # pragma: no cover
+    tracemalloc = None
+
+from . import channel
+from . import decode
+from . import encode
+from . import helpers
+from . import interleave
+from . import lookup_tables
+from . import simcore
+
+LENGTHS = [1000, 10000, 100000]
+EBN0 = 1.0
+ITERATIONS = 2
+SEED = 2016
+# Information bits per batch of the batch_turbo cases:
+BATCH_BITS = 64000
+# Precision is validated in the waterfall region, where there are errors:
+VALIDATION_EBN0 = -4.0
+
+
+def find_tables():
+    """Returns a list of (name, lookup_table) tuples for every lookup table
+    defined in lookup_tables. Aliases (e.g. gzl_rsc) are skipped in favour of
+    the longest name of the same table.
+    """
+    names = {}
+    for name, value in vars(lookup_tables).items():
+        if name.startswith("_") or not isinstance(value, dict):
+            continue
+        if len(name) > len(names.get(id(value), "")):
+            names[id(value)] = name
+
+    return sorted((name, getattr(lookup_tables, name)) for name in names.values())
+
+
+def is_systematic(lookup_table):
+    """Checks if the first output bit of every transition equals its input.
+    Only such tables can be used as turbo code constituents.
+    """
+    return all(lookup_table[state][i][0][0] == i
+               for state in lookup_table for i in (0, 1))
+
+
+def _reliability(ebn0):
+    return channel._decibel_to_ratio(ebn0) * 2
+
+
+def _random_permutation(length):
+    permutation = list(range(length))
+    random.Random(SEED).shuffle(permutation)
+    return permutation
+
+
+def _noisy(encoded):
+    return list(channel.transmit_awgn(helpers.modulaten(encoded), EBN0))
+
+
+def make_cases(tables, lengths):
+    """Creates benchmark cases. Setup (data generation, encoding, noise) is
+    done here so that only the benchmarked call is timed.
+
+    Returns a list of tuples (case_id, bit_count, callable).
+    """
+    cases = []
+    for length in lengths:
+        data = list(helpers.generate_random(length))
+        other = list(helpers.generate_random(length))
+        il = interleave.Interleaver(_random_permutation(length))
+
+        cases.append(("interleaver/-/{}".format(length), length,
+                      lambda il=il, data=data: il.deinterleave(il.interleave(data))))
+        cases.append(("hamming_distance/-/{}".format(length), length,
+                      lambda data=data, other=other: helpers.hamming_distance(data, other)))
+
+        for name, table in tables:
+            case_id = lambda component: "{}/{}/{}".format(component, name, length)
+
+            # Recursive encoders never reach the zero state on zero input:
+            encoder_class = encode.RscEncoder if is_systematic(table) else encode.ConvoEncoder
+
+            encoder = encoder_class(table)
+            cases.append((case_id("convo_encode"), length,
+                          lambda encoder=encoder, data=data: list(encoder.encoden(data))))
+
+            noisy = _noisy(encoder_class(table).encoden(data))
+            cases.append((case_id("map"), length,
+                          lambda table=table, noisy=noisy:
+                          decode.maximum_a_posteriori(table, noisy, _reliability(EBN0), True)))
+            cases.append((case_id("map_radix4"), length,
+                          lambda table=table, noisy=noisy:
+                          decode.maximum_a_posteriori(table, noisy, _reliability(EBN0), True, radix=4)))
+
+            if not is_systematic(table):
+                continue
+
+            turbo_encoder = encode.TurboEncoder(il, encode.RscEncoder(table))
+            cases.append((case_id("turbo_encode"), length,
+                          lambda turbo_encoder=turbo_encoder, data=data:
+                          turbo_encoder.encoden(data)))
+
+            noisy = _noisy(turbo_encoder.encoden(data))
+            cases.append((case_id("turbo_decode"), length,
+                          lambda table=table, il=il, noisy=noisy:
+                          decode.turbo_decode(noisy, table, il, ITERATIONS, _reliability(EBN0))))
+
+            if importlib.util.find_spec("numpy"):
+                cases += make_batch_cases(name, table, il, turbo_encoder.encoden(data), length)
+
+            specimen = simcore.Specimen(
+                0, length, turbo_encoder,
+                lambda sequence, ebn0, table=table, il=il:
+                decode.turbo_decode(sequence, table, il, ITERATIONS, _reliability(ebn0)),
+                [EBN0])
+            cases.append((case_id("specimen_sample"), length,
+                          lambda specimen=specimen: specimen.sample(EBN0)))
+
+    return cases
+
+
+def make_batch_cases(name, table, il, encoded, length):
+    """Returns batch_turbo cases decoding BATCH_BITS // length frames (the
+    same codeword with independent noise) at once in both precisions.
+    """
+    import numpy as np
+    from . import batch_decode
+
+    frame_count = max(1, BATCH_BITS // length)
+    rng = random.Random(SEED)
+    modulated = list(helpers.modulaten(encoded))
+    batch = np.array([list(channel.transmit_awgn(modulated, EBN0, rng)) for i in range(frame_count)])
+    trellis = batch_decode.Trellis(table)
+
+    return [("batch_turbo_{}/{}/{}".format(precision, name, length), frame_count * length,
+             lambda batch=batch, dtype=dtype:
+             batch_decode.turbo_decode(trellis, batch, il, ITERATIONS, _reliability(EBN0), dtype=dtype))
+            for precision, dtype in (("f64", np.float64), ("f32", np.float32))]
+
+
+def validate_precision(table, length, frame_count=200, ebn0=VALIDATION_EBN0, iterations=ITERATIONS):
+    """Decodes the same random frames with batch_decode.turbo_decode in
+    float64 and float32. Returns a dict of both bit error counts, the number
+    of bits decoded differently and whether the error counts agree within
+    Monte Carlo noise (three standard deviations of their difference).
+    """
+    import numpy as np
+    from . import batch_decode
+
+    rng = random.Random(SEED)
+    il = interleave.Interleaver(_random_permutation(length))
+    encoder = encode.TurboEncoder(il, encode.RscEncoder(table))
+    trellis = batch_decode.Trellis(table)
+
+    frames = {}
+    for i in range(frame_count):
+        data = helpers.generate_random(length, rng)
+        noisy = list(channel.transmit_awgn(helpers.modulaten(encoder.encoden(data)), ebn0, rng))
+        frames.setdefault(len(noisy), []).append((data, noisy))
+
+    errors = {np.float64: 0, np.float32: 0}
+    differing = 0
+    for group in frames.values():
+        data = np.array([frame[0] for frame in group])
+        noisy = np.array([frame[1] for frame in group])
+        decisions = {}
+        for dtype in errors:
+            decisions[dtype] = batch_decode.hard_decisions(
+                batch_decode.turbo_decode(trellis, noisy, il, iterations, _reliability(ebn0), dtype=dtype))
+            errors[dtype] += int((decisions[dtype] != data).sum())
+        differing += int((decisions[np.float64] != decisions[np.float32]).sum())
+
+    return {
+        "errors_f64": errors[np.float64],
+        "errors_f32": errors[np.float32],
+        "differing_bits": differing,
+        "agree": abs(errors[np.float32] - errors[np.float64]) <=
+        3 * math.sqrt(errors[np.float32] + errors[np.float64]),
+    }
+
+
+def measure(func, bit_count, repeat):
+    """Runs func repeat times and returns a dict with the best throughput
+    (information Mbit/s), the best time (seconds) and the peak traced memory
+    (KiB; None if tracemalloc is not available).
+    """
+    best = float("inf")
+    for i in range(repeat):
+        start = timeit.default_timer()
+        func()
+        best = min(best, timeit.default_timer() - start)
+
+    peak_kib = None
+    if tracemalloc:
+        tracemalloc.start()
+        func()
+        peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "mbps": bit_count / best / 1e6 if best else float("inf"),
+        "peak_kib": peak_kib,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Compares results with a baseline. Returns a list of case ids whose
+    throughput dropped below (1 - tolerance) times the baseline's.
+    """
+    regressions = []
+    for case_id in sorted(results):
+        if case_id not in baseline:
+            continue
+        ratio = results[case_id]["mbps"] / baseline[case_id]["mbps"]
+        flag = ""
+        if ratio < 1 - tolerance:
+            regressions.append(case_id)
+            flag = "  REGRESSION"
+        print("{:<45} {:>10.4f} -> {:>10.4f} Mbit/s ({:+.1%}){}".format(
+            case_id, baseline[case_id]["mbps"], results[case_id]["mbps"], ratio - 1, flag))
+
+    return regressions
+
+
+def run(tables, lengths, repeat, components=None):
+    random.seed(SEED)
+
+    results = {}
+    for case_id, bit_count, func in make_cases(tables, lengths):
+        if components and case_id.split("/")[0] not in components:
+            continue
+
+        results[case_id] = measure(func, bit_count, repeat)
+        peak = results[case_id]["peak_kib"]
+        print("{:<45} {:>10.4f} Mbit/s {:>12} KiB".format(
+            case_id,
+            results[case_id]["mbps"],
+            "n/a" if peak is None else "{:.0f}".format(peak)))
+        sys.stdout.flush()
+
+    return results
+
+
+def _split(value, convert=str):
+    return [convert(item) for item in value.split(",") if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks codec components.")
+    parser.add_argument("--lengths", type=lambda v: _split(v, int), default=LENGTHS,
+                        help="comma separated frame lengths")
+    parser.add_argument("--tables", type=_split, default=None,
+                        help="comma separated lookup_tables names")
+    parser.add_argument("--components", type=_split, default=None,
+                        help="comma separated components (e.g. map,turbo_decode)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", choices=decode.available_backends(), default=decode.get_backend(),
+                        help="MAP decoding backend (see decode.set_backend)")
+    parser.add_argument("--save", metavar="FILE", help="save results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare with a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed relative throughput drop")
+    parser.add_argument("--validate", action="store_true",
+                        help="compare float32 with float64 batch decoding errors")
+    args = parser.parse_args(argv)
+    decode.set_backend(args.backend)
+
+    tables = find_tables()
+    if args.tables:
+        tables = [(name, table) for name, table in tables if name in args.tables]
+
+    results = run(tables, args.lengths, args.repeat, args.components)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": sys.version, "backend": args.backend, "results": results},
+                      f, indent=2, sort_keys=True)
+        print("\nBaseline saved:", args.save)
+
+    if args.validate:
+        print()
+        failed = []
+        for name, table in tables:
+            if not is_systematic(table):
+                continue
+            for length in args.lengths:
+                check = validate_precision(table, length, max(1, BATCH_BITS // length))
+                print("{:<45} f64 {:>8} f32 {:>8} errors, {} bits differ{}".format(
+                    "precision/{}/{}".format(name, length), check["errors_f64"], check["errors_f32"],
+                    check["differing_bits"], "" if check["agree"] else "  MISMATCH"))
+                if not check["agree"]:
+                    failed.append(name)
+        if failed:
+            print("\nfloat32 decoding disagrees with float64.")
+            return 1
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        print()
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n{} case(s) regressed.".format(len(regressions)))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import math
+
+from . import channel
+from . import encode
+
+
+def q_function(x):
+    """Returns the tail probability of the standard normal distribution.
+    """
+    return 0.5 * math.erfc(x / math.sqrt(2))
+
+
+def union_bound(spectrum, ebn0s, rate=1, frame_length=1):
+    """Calculates the union bound of the bit error rate of a code on an AWGN
+    channel with BPSK modulation.
+
+    Parameters:
+    spectrum -- a dict of codeword (or error event) distance to the total
+        information weight of the codewords at that distance.
+    ebn0s -- a list of Eb/N0 values in decibels.
+    rate -- the code rate. Pass 1 if ebn0s are signal-to-noise ratios per
+        channel symbol, as in channel.transmit_awgn.
+    frame_length -- number of information bits the weights are spread over
+        (1 for per-bit weights of convolutional codes).
+
+    Returns a list of floats.
+    """
+    bers = []
+    for ebn0 in ebn0s:
+        ratio = channel._decibel_to_ratio(ebn0)
+        ber = sum(weight / frame_length * q_function(math.sqrt(2 * distance * rate * ratio))
+                  for distance, weight in spectrum.items())
+        bers.append(ber)
+
+    return bers
+
+
+def tail_parity_weights(lookup_table):
+    """Returns a dict of state to the parity weight of the tail that brings a
+    recursive systematic encoder from that state to its zero state (see
+    encode.RscEncoder).
+    """
+    weights = {}
+    for state in lookup_table:
+        encoder = encode.RscEncoder(lookup_table)
+        zero_state = encoder.state
+        encoder.state = state
+
+        weights[state] = 0
+        while encoder.state != zero_state:
+            weights[state] += sum(encoder.encode(encoder._to_zero_state())[1:])
+
+    return weights
+
+
+def weight_enumerator(lookup_table, max_distance, max_length=1000):
+    """Calculates the distance spectrum of a convolutional code, i.e. the
+    terms of its transfer function T(W, D) up to D ** max_distance. Error
+    events are paths that leave the zero state and first return to it.
+
+    Parameters:
+    lookup_table -- see lookup_tables.
+    max_distance -- maximum output weight of the enumerated events.
+    max_length -- maximum event length; reaching it means the code has
+        zero-weight cycles (is catastrophic) and raises ValueError.
+
+    Returns a dict of output weight to a tuple
+    (event count, total input weight of the events).
+    """
+    zero_state = encode.ConvoEncoder(lookup_table).state
+
+    # (state, output weight) -> [path count, total input weight]
+    paths = {}
+    for input_bit in lookup_table[zero_state]:
+        output, next_state = lookup_table[zero_state][input_bit]
+        if next_state != zero_state and sum(output) <= max_distance:
+            _add_paths(paths, (next_state, sum(output)), 1, input_bit)
+
+    spectrum = {}
+    for length in range(max_length):
+        if not paths:
+            return dict((distance, tuple(total)) for distance, total in spectrum.items())
+
+        extended = {}
+        for (state, weight), (count, input_weight) in paths.items():
+            for input_bit in lookup_table[state]:
+                output, next_state = lookup_table[state][input_bit]
+                next_weight = weight + sum(output)
+                if next_weight > max_distance:
+                    continue
+
+                target = spectrum if next_state == zero_state else extended
+                key = next_weight if next_state == zero_state else (next_state, next_weight)
+                _add_paths(target, key, count, input_weight + count * input_bit)
+
+        paths = extended
+
+    raise ValueError("Error events longer than {} steps; is the code catastrophic?".format(max_length))
+
+
+def _add_paths(paths, key, count, input_weight):
+    total = paths.setdefault(key, [0, 0])
+    total[0] += count
+    total[1] += input_weight
+
+
+def convolutional_bound(lookup_table, ebn0s, rate=1, max_distance=20):
+    """Returns the union bound of a convolutional code's bit error rate for
+    the given Eb/N0 values (see union_bound), using the code's distance
+    spectrum up to max_distance.
+    """
+    spectrum = weight_enumerator(lookup_table, max_distance)
+    information_weights = dict((distance, input_weight)
+                               for distance, (count, input_weight) in spectrum.items())
+
+    return union_bound(information_weights, ebn0s, rate)
+
+
+def input_parity_enumerator(lookup_table, frame_length, max_input_weight, max_parity_weight):
+    """Calculates the input-redundancy weight enumerator of a terminated
+    recursive systematic code over a frame: the number of frames A[w][z] of
+    input weight w whose parity (including the termination tail) has
+    weight z.
+
+    Returns a list of lists of floats.
+    """
+    tail_weights = tail_parity_weights(lookup_table)
+    zero_state = encode.RscEncoder(lookup_table).state
+    empty = lambda: [[0.0] * (max_parity_weight + 1) for w in range(max_input_weight + 1)]
+
+    counts = {zero_state: empty()}
+    counts[zero_state][0][0] = 1.0
+
+    for k in range(frame_length):
+        extended = {}
+        for state, table in counts.items():
+            for input_bit in lookup_table[state]:
+                output, next_state = lookup_table[state][input_bit]
+                parity = sum(output[1:])
+                target = extended.get(next_state) or extended.setdefault(next_state, empty())
+
+                for w in range(max_input_weight + 1 - input_bit):
+                    row, target_row = table[w], target[w + input_bit]
+                    for z in range(max_parity_weight + 1 - parity):
+                        target_row[z + parity] += row[z]
+
+        counts = extended
+
+    enumerator = empty()
+    for state, table in counts.items():
+        tail = tail_weights[state]
+        for w in range(max_input_weight + 1):
+            for z in range(max_parity_weight + 1 - tail):
+                enumerator[w][z + tail] += table[w][z]
+
+    return enumerator
+
+
+def turbo_bound(lookup_table, frame_length, ebn0s, rate=1/3, max_input_weight=6, max_distance=40):
+    """Returns the union bound of a turbo code's bit error rate averaged over
+    all interleavers of the frame length (the uniform interleaver), for both
+    constituent encoders using the lookup table.
+
+    Parameters:
+    rate -- the code rate; see union_bound.
+    max_input_weight -- input weights taken into account.
+    max_distance -- codeword weights taken into account.
+
+    Returns a list of floats.
+    """
+    max_parity = max_distance - 2
+    enumerator = input_parity_enumerator(lookup_table, frame_length, max_input_weight, max_parity)
+
+    information_weights = {}
+    for w in range(1, max_input_weight + 1):
+        patterns = _binomial(frame_length, w)
+        for z1, count1 in enumerate(enumerator[w]):
+            for z2, count2 in enumerate(enumerator[w]):
+                distance = w + z1 + z2
+                if count1 and count2 and distance <= max_distance:
+                    information_weights[distance] = information_weights.get(distance, 0) + \
+                        w * count1 * count2 / patterns
+
+    return union_bound(information_weights, ebn0s, rate, frame_length)
+
+
+def _binomial(n, k):
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
@@ -0,0 +1,278 @@
+"""Recorded frames for decoder regression and throughput tests.
+
+A capture file holds the received soft values of simulated frames so that
+they can be decoded again, deterministically and without regenerating
+them. It starts with the magic bytes, the length of a JSON header (a
+little-endian uint32) and the header itself, padded to a multiple of 8
+bytes. Records follow, one per frame, each a fixed-size head (see
+head_dtype):
+    frame      -- uint64, the frame's index within its Eb/N0 point,
+    point      -- uint32, the index of the Eb/N0 point,
+    ebn0       -- float64, the Eb/N0 point,
+    errors     -- uint32, bit errors of the decoder that ran the simulation,
+    sample_count -- uint32, the number of samples,
+    bits       -- the transmitted information bits, packed (np.packbits),
+followed by sample_count float32 received soft values given to the decoder
+and, only with known channel state (see the channel_models module),
+sample_count float32 per-symbol channel reliabilities. Records differ in
+length since terminated codewords do.
+
+The header describes the layout and holds the specimen's metadata, e.g. the
+specification it was built from (see config), which is enough to rebuild
+its decoder. Captures are memory-mapped when read, so only the pages of the
+frames decoded are loaded.
+
+Usage:
+    python -m turbo_coder.capture FILE [--batch-size 256] [--limit N] [--frame N]
+"""
+import argparse
+import json
+import os
+import struct
+import time
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b"TURBOCAP"
+VERSION = 1
+
+# A record read from a capture; bits, samples and reliability (None without
+# known channel state) are arrays backed by the file.
+Record = namedtuple('Record', ['frame', 'point', 'ebn0', 'errors', 'bits', 'samples', 'reliability'])
+
+
+def head_dtype(frame_length):
+    """Returns the NumPy dtype of the fixed-size heads of records.
+    """
+    return np.dtype([
+        ("frame", "<u8"),
+        ("point", "<u4"),
+        ("ebn0", "<f8"),
+        ("errors", "<u4"),
+        ("sample_count", "<u4"),
+        ("bits", "u1", ((frame_length + 7) // 8,)),
+    ])
+
+
+class CaptureWriter(object):
+    """Appends frames to a new capture file. The header is written with the
+    first frame, when it is known whether there are reliabilities.
+    """
+
+    def write(self, frame, point, ebn0, errors, bits, samples, reliability=None):
+        """Appends a frame.
+
+        Parameters:
+        bits -- the transmitted information bits.
+        samples -- the soft values given to the decoder.
+        reliability -- per-symbol channel reliabilities, if known.
+        """
+        if self.reliability is None:
+            self._start(reliability is not None)
+        if (reliability is not None) != self.reliability:
+            raise ValueError("Frames of a capture must all have reliabilities or none.")
+
+        head = np.zeros(1, dtype=self.dtype)
+        head["frame"] = frame
+        head["point"] = point
+        head["ebn0"] = ebn0
+        head["errors"] = errors
+        head["sample_count"] = len(samples)
+        head["bits"] = np.packbits(np.asarray(bits, dtype=np.uint8))
+
+        self.file.write(head.tobytes())
+        self.file.write(np.asarray(samples, dtype="<f4").tobytes())
+        if reliability is not None:
+            self.file.write(np.asarray(reliability, dtype="<f4").tobytes())
+        self.frame_count += 1
+
+    def _start(self, reliability):
+        header = dict(self.header, version=VERSION, frame_length=self.frame_length, reliability=reliability)
+        encoded = json.dumps(header).encode("utf-8")
+        encoded += b" " * (-(len(MAGIC) + 4 + len(encoded)) % 8)
+
+        self.file.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        self.reliability = reliability
+
+    def close(self):
+        if self.reliability is None:
+            self._start(False)
+        self.file.close()
+
+    def __init__(self, path, frame_length, header=None):
+        """Creates the file, replacing an existing one.
+
+        Parameters:
+        frame_length -- number of information bits per frame.
+        header -- a JSON serializable dict of metadata to store.
+        """
+        folder = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.path = path
+        self.frame_length = frame_length
+        self.header = header or {}
+        self.dtype = head_dtype(frame_length)
+        self.reliability = None
+        self.frame_count = 0
+        self.file = open(path, "wb")
+
+
+class Capture(object):
+    """A capture file opened for reading. The file is a read-only
+    numpy.memmap; opening it only reads the record heads to index them.
+    """
+
+    def batches(self, batch_size=256, start=0, stop=None):
+        """Returns a generator of lists of consecutive Records.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for offset in range(start, stop, batch_size):
+            yield [self[index] for index in range(offset, min(offset + batch_size, stop))]
+
+    def bits(self, record):
+        """Returns a list of the information bits of a record.
+        """
+        return np.unpackbits(record.bits)[:self.header["frame_length"]].tolist()
+
+    def decoder(self):
+        """Rebuilds the specimen's decoder from the specification in the
+        header's metadata.
+        """
+        from . import config
+
+        metadata = self.header.get("metadata") or {}
+        if "spec" not in metadata:
+            raise ValueError("Capture {} does not describe its decoder.".format(self.path))
+
+        return config.build_configuration(metadata["spec"], metadata.get("directory", ""))["decoder_func"]
+
+    def __getitem__(self, index):
+        offset = self._offsets[index]
+        head = self._data[offset:offset + self.dtype.itemsize].view(self.dtype)[0]
+        sample_count = int(head["sample_count"])
+
+        offset += self.dtype.itemsize
+        samples = self._data[offset:offset + 4 * sample_count].view("<f4")
+        reliability = None
+        if self.header["reliability"]:
+            offset += 4 * sample_count
+            reliability = self._data[offset:offset + 4 * sample_count].view("<f4")
+
+        return Record(int(head["frame"]), int(head["point"]), float(head["ebn0"]), int(head["errors"]),
+                      head["bits"], samples, reliability)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError("{} is not a capture file.".format(path))
+            header_length, = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(header_length).decode("utf-8"))
+
+        if self.header.get("version") != VERSION:
+            raise ValueError("Unsupported capture version {}.".format(self.header.get("version")))
+
+        self.dtype = head_dtype(self.header["frame_length"])
+        self._data = np.memmap(path, np.uint8, "r")
+        arrays = 2 if self.header["reliability"] else 1
+
+        self._offsets = []
+        offset = len(MAGIC) + 4 + header_length
+        while offset + self.dtype.itemsize <= len(self._data):
+            self._offsets.append(offset)
+            head = self._data[offset:offset + self.dtype.itemsize].view(self.dtype)[0]
+            offset += self.dtype.itemsize + 4 * arrays * int(head["sample_count"])
+
+
+def decode_record(capture, record, decoder_func):
+    """Decodes a record and returns a list of the decoded bits.
+    """
+    samples = record.samples.astype(float).tolist()
+    if record.reliability is not None:
+        return decoder_func(samples, record.ebn0, record.reliability.astype(float).tolist())
+
+    return decoder_func(samples, record.ebn0)
+
+
+def replay(capture, decoder_func=None, batch_size=256, start=0, stop=None):
+    """Decodes the frames of a capture. Returns a dict with a list of
+    "points" (dicts of an Eb/N0 point's frames, bit errors and frame
+    errors), the "mismatches" (indices of the records whose errors differ
+    from the recorded ones), the number of "frames" and the "elapsed"
+    decoding time.
+
+    Parameters:
+    capture -- a Capture.
+    decoder_func -- the decoder, rebuilt from the header by default.
+    """
+    if decoder_func is None:
+        decoder_func = capture.decoder()
+
+    frame_length = capture.header["frame_length"]
+    points = {}
+    mismatches = []
+    elapsed = 0.0
+
+    index = start
+    for batch in capture.batches(batch_size, start, stop):
+        for record in batch:
+            bits = capture.bits(record)
+            start_time = time.time()
+            decoded = decode_record(capture, record, decoder_func)[:frame_length]
+            elapsed += time.time() - start_time
+
+            errors = sum(a != b for a, b in zip(bits, decoded))
+            if errors != record.errors:
+                mismatches.append(index)
+
+            point = points.setdefault(record.ebn0, [0, 0, 0])
+            point[0] += 1
+            point[1] += errors
+            point[2] += 1 if errors else 0
+            index += 1
+
+    return {
+        "points": [{"ebn0": ebn0, "frames": frames, "bit_errors": bit_errors, "frame_errors": frame_errors}
+                   for ebn0, (frames, bit_errors, frame_errors) in sorted(points.items())],
+        "mismatches": mismatches,
+        "frames": index - start,
+        "elapsed": elapsed,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Decodes the frames of a capture file.")
+    parser.add_argument("path", help="a capture file")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--limit", type=int, help="number of frames to decode")
+    parser.add_argument("--frame", type=int, help="decode only the record with this index")
+    args = parser.parse_args()
+
+    capture = Capture(args.path)
+    print("{}: {} frames of {} bits".format(args.path, len(capture), capture.header["frame_length"]))
+    print(json.dumps(capture.header.get("metadata"), indent=2, sort_keys=True))
+
+    if args.frame is not None:
+        replayed = replay(capture, start=args.frame, stop=args.frame + 1)
+    else:
+        replayed = replay(capture, batch_size=args.batch_size, stop=args.limit)
+
+    print("{:>8} {:>8} {:>12} {:>12} {:>12}".format("Eb/N0", "frames", "bit errors", "frame errors", "BER"))
+    for point in replayed["points"]:
+        print("{:>8} {:>8} {:>12} {:>12} {:>12.3e}".format(
+            point["ebn0"], point["frames"], point["bit_errors"], point["frame_errors"],
+            point["bit_errors"] / (point["frames"] * capture.header["frame_length"])))
+
+    if replayed["elapsed"]:
+        print("Decoded {} frames, {:.3f} Mbit/s".format(
+            replayed["frames"],
+            replayed["frames"] * capture.header["frame_length"] / replayed["elapsed"] / 1e6))
+    if replayed["mismatches"]:
+        print("Errors differ from the recorded ones in records:", replayed["mismatches"])
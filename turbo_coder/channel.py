@@ -0,0 +1,90 @@
+import math
+import random
+
+
+def _decibel_to_ratio(decibels):
+    """Converts a value in decibels to a power ratio.
+    """
+    return 10 ** (decibels / 10)
+
+
+def reliability(ebn0):
+    """Returns the channel reliability L_c = 4 * E_s / N_0 of the AWGN
+    channel for a signal-to-noise ratio per channel symbol in decibels.
+    """
+    return 4 * _decibel_to_ratio(ebn0)
+
+
+def noise_sigma(ebn0):
+    """Returns the standard deviation of the AWGN channel's noise for unit
+    energy symbols and a signal-to-noise ratio per channel symbol in decibels.
+    """
+    return math.sqrt(1 / (2 * _decibel_to_ratio(ebn0)))
+
+
+def transmit_awgn(sequence, ebn0, rng=random):
+    """Adds white Gaussian noise to a sequence of modulated values. Symbols
+    are assumed to have unit energy, so the noise variance is N0 / 2.
+
+    Parameters:
+    sequence -- an iterable of voltage values (see helpers.modulaten).
+    ebn0 -- signal-to-noise ratio per channel symbol in decibels.
+    rng -- a random.Random object (or the random module) to draw from.
+
+    Returns a generator.
+    """
+    sigma = noise_sigma(ebn0)
+    for value in sequence:
+        yield value + rng.gauss(0, sigma)
+
+
+def transmit_awgn_biased(sequence, ebn0, shift=0.0, scale=1.0, rng=random):
+    """Adds biased white Gaussian noise for importance sampling. The mean of
+    every symbol's noise is moved towards the decision boundary by shift
+    standard deviations, and its standard deviation is multiplied by scale.
+
+    The likelihood ratio of long sequences varies over many orders of
+    magnitude, so biasing works best with short frames and small shifts.
+
+    Parameters:
+    sequence -- an iterable of voltage values (see helpers.modulaten).
+    ebn0 -- signal-to-noise ratio per channel symbol in decibels.
+    shift -- mean shift in units of the unbiased standard deviation.
+    scale -- standard deviation scaling factor.
+    rng -- a random.Random object (or the random module) to draw from.
+
+    Returns a tuple (noisy_sequence, log_weight), where log_weight is the
+    logarithm of the likelihood ratio of the noise under the unbiased and the
+    biased distribution.
+    """
+    sigma = noise_sigma(ebn0)
+
+    noisy_sequence = []
+    log_weight = 0.0
+    for value in sequence:
+        mean = -math.copysign(shift * sigma, value) if value else 0.0
+        noise = rng.gauss(mean, scale * sigma)
+        noisy_sequence.append(value + noise)
+
+        log_weight += ((noise - mean) ** 2 / scale ** 2 - noise ** 2) / (2 * sigma ** 2)
+
+    log_weight += len(noisy_sequence) * math.log(scale)
+
+    return noisy_sequence, log_weight
+
+
+def unit_noise(length, rng=random):
+    """Returns a list of length samples of zero mean, unit variance Gaussian
+    noise. Scaled by noise_sigma (see add_noise), the same samples serve any
+    signal-to-noise ratio.
+    """
+    return [rng.gauss(0, 1) for i in range(length)]
+
+
+def add_noise(sequence, noise, ebn0):
+    """Returns a list of the modulated values plus unit variance noise (see
+    unit_noise) scaled to the given signal-to-noise ratio per channel symbol
+    in decibels.
+    """
+    sigma = noise_sigma(ebn0)
+    return [value + sigma * sample for value, sample in zip(sequence, noise)]
@@ -0,0 +1,175 @@
+"""Fading and burst-error channels with NumPy.
+
+A channel model describes the state of every transmitted symbol as a gain
+and a noise scale: a symbol x is received as
+    gain * x + noise_scale * sigma * n,
+where sigma is the AWGN standard deviation at the nominal signal-to-noise
+ratio (see channel.noise_sigma) and n is unit variance noise. States are
+generated for a whole batch of frames at once, as arrays of shape
+(frames, symbols).
+
+The receiver is assumed to know the channel state, which makes the channel
+reliability of BPSK samples per-symbol:
+    L_c = 4 * (E_s / N_0) * gain / noise_scale ** 2.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import channel
+
+# A frame drawn for transmission: its transmitted values (BPSK values or
+# modem symbols), channel states and unit variance noise, all 1-D arrays,
+# and the number of coded bits.
+Transmission = namedtuple('Transmission', ['values', 'gains', 'noise_scales', 'noise', 'length'])
+
+
+class FadingChannel(object):
+    """Rician fading, Rayleigh fading for a K-factor of 0. Gains are the
+    amplitudes of the fading coefficients (phase is assumed to be
+    compensated) and have unit mean power. Consecutive runs of block_length
+    symbols share a gain: 1 for fast fading, None for a gain per frame.
+    """
+
+    def states(self, frame_count, length, generator):
+        """Returns a tuple (gains, noise_scales) of arrays of shape
+        (frame_count, length).
+
+        Parameters:
+        generator -- a numpy.random.Generator.
+        """
+        block_length = self.block_length or length
+        block_count = -(-length // block_length)
+
+        line_of_sight = np.sqrt(self.k_factor / (self.k_factor + 1))
+        scatter = np.sqrt(1 / (2 * (self.k_factor + 1)))
+        coefficients = (line_of_sight +
+                        scatter * generator.standard_normal((frame_count, block_count)) +
+                        1j * scatter * generator.standard_normal((frame_count, block_count)))
+
+        gains = np.repeat(np.abs(coefficients), block_length, axis=1)[:, :length]
+        return gains, np.ones_like(gains)
+
+    def __init__(self, k_factor=0.0, block_length=1):
+        """Parameters:
+        k_factor -- the ratio of the line-of-sight to the scattered power.
+        block_length -- number of symbols sharing a gain, or None for the
+            whole frame.
+        """
+        self.k_factor = k_factor
+        self.block_length = block_length
+
+
+class GilbertElliottChannel(object):
+    """A two-state Markov channel: in the good state symbols get the
+    nominal AWGN, in the bad state the signal-to-noise ratio drops by
+    bad_snr_offset decibels, which causes bursts of errors. Frames start in
+    the stationary distribution of the states.
+    """
+
+    def states(self, frame_count, length, generator):
+        """Returns a tuple (gains, noise_scales) of arrays of shape
+        (frame_count, length) (see FadingChannel.states).
+        """
+        bad = self.bad_states(frame_count, length, generator)
+        noise_scales = np.where(bad, 10 ** (self.bad_snr_offset / 20), 1.0)
+
+        return np.ones_like(noise_scales), noise_scales
+
+    def bad_states(self, frame_count, length, generator):
+        """Returns a boolean array of shape (frame_count, length), True where
+        the channel is in the bad state. States are drawn as alternating runs
+        of geometric lengths rather than symbol by symbol.
+        """
+        bad_probability = self.p_good_bad / (self.p_good_bad + self.p_bad_good)
+        starts_bad = generator.random(frame_count) < bad_probability
+
+        run_count = 2
+        while True:
+            good_runs = generator.geometric(self.p_good_bad, (frame_count, run_count))
+            bad_runs = generator.geometric(self.p_bad_good, (frame_count, run_count))
+            runs = np.empty((frame_count, 2 * run_count), dtype=np.int64)
+            runs[:, 0::2] = np.where(starts_bad[:, None], bad_runs, good_runs)
+            runs[:, 1::2] = np.where(starts_bad[:, None], good_runs, bad_runs)
+            ends = np.cumsum(runs, axis=1)
+            if ends[:, -1].min() >= length:
+                break
+            run_count *= 2
+
+        positions = np.arange(length)
+        bad = np.empty((frame_count, length), dtype=bool)
+        for frame in range(frame_count):
+            run_index = np.searchsorted(ends[frame], positions, side="right")
+            bad[frame] = (run_index % 2 == 0) == starts_bad[frame]
+
+        return bad
+
+    def __init__(self, p_good_bad, p_bad_good, bad_snr_offset=-10.0):
+        """Parameters:
+        p_good_bad -- probability of moving from the good to the bad state
+            after a symbol.
+        p_bad_good -- probability of moving from the bad to the good state;
+            mean bursts are 1 / p_bad_good symbols long.
+        bad_snr_offset -- signal-to-noise ratio change in the bad state, in
+            decibels.
+        """
+        self.p_good_bad = p_good_bad
+        self.p_bad_good = p_bad_good
+        self.bad_snr_offset = bad_snr_offset
+
+
+def transmit(values, ebn0, gains, noise_scales, noise):
+    """Returns an array of received values.
+
+    Parameters:
+    values -- an array of transmitted values (BPSK values or symbols).
+    ebn0 -- nominal signal-to-noise ratio per channel symbol in decibels.
+    gains, noise_scales -- channel states (see FadingChannel.states).
+    noise -- unit variance noise of the values' shape.
+    """
+    return gains * np.asarray(values) + noise_scales * channel.noise_sigma(ebn0) * noise
+
+
+def reliabilities(ebn0, gains, noise_scales):
+    """Returns an array of per-symbol channel reliabilities of received
+    BPSK values given the channel states.
+    """
+    return channel.reliability(ebn0) * gains / noise_scales ** 2
+
+
+def draw(model, values, rng, modem=None):
+    """Draws the channel states and noise of a frame. The same Transmission
+    can be received at any signal-to-noise ratio (see receive).
+
+    Parameters:
+    model -- a channel model, e.g. a FadingChannel.
+    values -- BPSK values of the coded bits (see helpers.modulaten).
+    rng -- a random.Random object the frame's randomness is seeded from.
+    modem -- a modulation.Modem to map the coded bits with, or None for BPSK.
+    """
+    if modem:
+        transmitted = modem.modulate(values)
+        noise = modem.unit_noise(len(transmitted), rng)
+    else:
+        transmitted = np.asarray(values, dtype=float)
+        noise = np.random.default_rng(rng.getrandbits(64)).standard_normal(len(transmitted))
+
+    gains, noise_scales = model.states(1, len(transmitted), np.random.default_rng(rng.getrandbits(64)))
+
+    return Transmission(transmitted, gains[0], noise_scales[0], noise, len(values))
+
+
+def receive(transmission, ebn0, modem=None):
+    """Returns a tuple (received, reliabilities) of lists. Without a modem
+    these are the received BPSK values and their channel reliabilities,
+    with one the demapped LLRs (which already take the channel state into
+    account) and None.
+    """
+    received = transmit(transmission.values, ebn0, transmission.gains,
+                        transmission.noise_scales, transmission.noise)
+    if modem:
+        return modem.receive(received, ebn0, transmission.length,
+                             transmission.gains, transmission.noise_scales), None
+
+    return received.tolist(), reliabilities(ebn0, transmission.gains, transmission.noise_scales).tolist()
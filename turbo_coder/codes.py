@@ -0,0 +1,157 @@
+"""Builds lookup tables (see lookup_tables) of convolutional codes from
+generator polynomials in octal notation, e.g. convolutional((7, 5)) or
+recursive_systematic(13, 15).
+
+The most significant bit of a polynomial taps the current input (or, in
+recursive codes, the current feedback bit) and the least significant one the
+oldest register. States are numbered with the newest register bit as the most
+significant bit, like in the hand-written tables. For example,
+lookup_tables.gzl_rsc212 is recursive_systematic(7, 5) and
+lookup_tables.abrantes_convo213 is convolutional((7, 5)).
+
+Built tables are cached and shared; they must not be modified.
+"""
+
+_cache = {}
+
+
+def convolutional(generators, constraint_length=None):
+    """Returns the lookup table of a feedforward convolutional code with one
+    output per generator.
+
+    Parameters:
+    generators -- a sequence of polynomials in octal notation (strings or
+        numbers written with octal digits, e.g. 7 or "171").
+    constraint_length -- number of taps (memory + 1). Derived from the
+        polynomials if None.
+    """
+    generators = tuple(_parse_octal(g) for g in generators)
+    memory = _memory(generators, constraint_length)
+
+    key = ("convolutional", generators, memory)
+    if key not in _cache:
+        if _catastrophic(generators):
+            raise ValueError("Generators {} give a catastrophic code.".format(
+                tuple(oct(g) for g in generators)))
+
+        table = {}
+        for state in range(2 ** memory):
+            table[state] = {}
+            for input_bit in (0, 1):
+                register = input_bit << memory | state
+                output = tuple(_parity(g & register) for g in generators)
+                table[state][input_bit] = (output, register >> 1)
+
+        validate(table)
+        _cache[key] = table
+
+    return _cache[key]
+
+
+def recursive_systematic(feedback, feedforward, constraint_length=None):
+    """Returns the lookup table of a recursive systematic convolutional code.
+    The output is the input bit followed by one parity bit per feedforward
+    polynomial.
+
+    Parameters:
+    feedback -- the feedback polynomial in octal notation; its most
+        significant tap must be set.
+    feedforward -- a feedforward polynomial or a sequence of them.
+    constraint_length -- see convolutional.
+    """
+    if isinstance(feedforward, (int, str)):
+        feedforward = (feedforward,)
+    feedback = _parse_octal(feedback)
+    feedforward = tuple(_parse_octal(g) for g in feedforward)
+    memory = _memory((feedback,) + feedforward, constraint_length)
+
+    if not feedback >> memory & 1:
+        raise ValueError("The feedback polynomial {} does not tap the current bit.".format(oct(feedback)))
+
+    key = ("recursive_systematic", feedback, feedforward, memory)
+    if key not in _cache:
+        table = {}
+        for state in range(2 ** memory):
+            table[state] = {}
+            for input_bit in (0, 1):
+                fed_back = input_bit ^ _parity(feedback & state)
+                register = fed_back << memory | state
+                output = (input_bit,) + tuple(_parity(g & register) for g in feedforward)
+                table[state][input_bit] = (output, register >> 1)
+
+        validate(table)
+        _cache[key] = table
+
+    return _cache[key]
+
+
+def validate(lookup_table):
+    """Checks that a lookup table describes a binary trellis: states are
+    numbered from 0, every state has inputs 0 and 1, outputs are tuples of
+    values 0 or 1 of the same length, and every state is entered by exactly
+    two branches. Raises ValueError otherwise.
+    """
+    states = sorted(lookup_table)
+    if states != list(range(len(states))):
+        raise ValueError("States must be numbered from 0.")
+
+    output_len = len(lookup_table[0][0][0])
+    incoming = dict((state, 0) for state in states)
+    for state in states:
+        if sorted(lookup_table[state]) != [0, 1]:
+            raise ValueError("State {} must have inputs 0 and 1.".format(state))
+
+        for input_bit, (output, next_state) in lookup_table[state].items():
+            if not isinstance(output, tuple) or len(output) != output_len or \
+                    any(bit not in (0, 1) for bit in output):
+                raise ValueError("Invalid output {!r} of state {}.".format(output, state))
+            if next_state not in incoming:
+                raise ValueError("Unknown next state {} of state {}.".format(next_state, state))
+            incoming[next_state] += 1
+
+    if any(count != 2 for count in incoming.values()):
+        raise ValueError("Every state must be entered by exactly two branches.")
+
+
+def _parse_octal(polynomial):
+    value = int(str(polynomial), 8)
+    if value <= 0:
+        raise ValueError("Invalid polynomial {!r}.".format(polynomial))
+    return value
+
+
+def _memory(polynomials, constraint_length):
+    degree = max(p.bit_length() for p in polynomials)
+    if constraint_length is None:
+        constraint_length = degree
+    elif degree > constraint_length:
+        raise ValueError("Polynomials have more than {} taps.".format(constraint_length))
+
+    if constraint_length < 2:
+        raise ValueError("The constraint length must be at least 2.")
+
+    return constraint_length - 1
+
+
+def _parity(value):
+    return bin(value).count("1") % 2
+
+
+def _catastrophic(generators):
+    """A feedforward code is catastrophic when its generators have a common
+    factor other than a power of D (Massey-Sain).
+    """
+    divisor = 0
+    for g in generators:
+        divisor = _gcd_gf2(divisor, g)
+    while divisor and not divisor & 1:
+        divisor >>= 1
+    return divisor != 1
+
+
+def _gcd_gf2(a, b):
+    while b:
+        while a and a.bit_length() >= b.bit_length():
+            a ^= b << (a.bit_length() - b.bit_length())
+        a, b = b, a
+    return a
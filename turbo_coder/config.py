@@ -0,0 +1,254 @@
+"""Declarative simulation configurations.
+
+A configuration is a YAML (requires PyYAML) or JSON file such as:
+
+    workers: 4                  # number of processes (optional)
+    seed: 1234                  # seed of the run (optional)
+    defaults:                   # merged into every specimen (optional)
+      frame_length: 1000
+      ebn0s: [0.5, 1.0, 1.5]
+      repeat_count: 100         # frames per point, or a list of them
+    specimens:
+      - description: Turbo (2 iterations)
+        scheme: turbo           # uncoded, convolutional or turbo
+        code: gzl_rsc           # see build_table
+        interleaver: perm1k.txt # see interleave.from_spec
+        decoder: {iterations: 2, radix: 2, per_iteration: false}
+        all_zero: false
+        importance: {shift: 0.5, scale: 1.0}
+        modulation:             # BPSK samples if omitted
+          constellation: 16qam  # bpsk, qpsk, 16qam or 64qam
+          demapper: max-log     # or exact
+          bit_interleaver: 7    # seed of a random bit interleaver (BICM)
+        channel:                # AWGN if omitted
+          model: rayleigh       # rayleigh, rician or gilbert-elliott
+          block_length: 1       # symbols per fading gain, null per frame
+          k_factor: 0           # rician only
+          # p_good_bad, p_bad_good, bad_snr_offset: gilbert-elliott only
+        sweep: false            # simulate all Eb/N0 points at once
+        stopping:
+          without_errors: true  # skip points above one without errors
+          relative_error: 0.1   # stop a point once its confidence interval
+          confidence: 0.95      # is narrower than 10% of its estimate and
+          min_errors: 10        # it has at least 10 bit errors
+        capture:                # record frames (optional, see capture)
+          path: out/turbo.cap   # or just the path
+          errors_only: false    # only record frames with bit errors
+
+The scheme selects both the encoder and the decoding algorithm: hard
+decisions of uncoded BPSK symbols, MAP decoding of a terminated
+convolutional code or iterative turbo decoding. Relative interleaver paths
+are resolved against the configuration file's directory. With
+per_iteration a turbo specimen also records the errors after every
+iteration, which gives the curves of all iteration counts up to iterations
+in one run (stored as separate configurations, see
+simcore.iteration_results). Without relative_error points send all their
+repeat_count frames. With a modulation (which requires NumPy) the decoders
+are given the demapped LLRs, and Eb/N0 is the signal-to-noise ratio per
+constellation symbol; all_zero is only allowed with BPSK and QPSK, since
+on larger constellations the all-zero codeword is not representative.
+Channel models also require NumPy; their state is known to the decoders
+(see channel_models).
+Capturing frames requires NumPy too; a capture stores its specimen
+specification, so python -m turbo_coder.capture can decode it again.
+
+Specimen specifications are plain data, so configurations built from them
+(see build_configuration) hold only picklable objects and can be rebuilt in
+any process.
+"""
+import json
+import os
+
+from . import codes
+from . import decode
+from . import encode
+from . import interleave
+from . import lookup_tables
+from . import simcore
+
+SCHEMES = ("uncoded", "convolutional", "turbo")
+
+SPECIMEN_KEYS = ("description", "scheme", "code", "interleaver", "decoder", "frame_length",
+                 "ebn0s", "repeat_count", "all_zero", "importance", "modulation", "channel", "sweep", "stopping",
+                 "capture")
+
+_DEFAULT_SPEC = {
+    "scheme": "turbo",
+    "decoder": {"iterations": 1, "radix": 2},
+    "repeat_count": 1,
+    "all_zero": False,
+    "importance": None,
+    "modulation": None,
+    "channel": None,
+    "sweep": False,
+    "stopping": {"without_errors": True, "confidence": 0.95, "min_errors": 10},
+    "capture": None,
+}
+
+
+def load(path):
+    """Reads a configuration from a YAML or JSON file (by its extension).
+    Returns a dict.
+    """
+    with open(path, "r") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            import yaml
+            return yaml.safe_load(f)
+
+        return json.load(f)
+
+
+def specimen_specs(configuration):
+    """Returns a list of specimen specifications of a configuration with its
+    defaults (and the built-in ones) filled in. Mappings such as decoder are
+    merged key by key. Raises ValueError on unknown keys and schemes.
+    """
+    defaults = configuration.get("defaults") or {}
+
+    specs = []
+    for specimen in configuration.get("specimens") or []:
+        spec = {}
+        for layer in (_DEFAULT_SPEC, defaults, specimen):
+            for key, value in layer.items():
+                if isinstance(value, dict) and isinstance(spec.get(key), dict):
+                    spec[key] = dict(spec[key], **value)
+                else:
+                    spec[key] = value
+
+        unknown = set(spec) - set(SPECIMEN_KEYS)
+        if unknown:
+            raise ValueError("Unknown specimen keys: {}.".format(", ".join(sorted(unknown))))
+        if spec["scheme"] not in SCHEMES:
+            raise ValueError("Unknown scheme {!r}, expected one of: {}.".format(spec["scheme"], ", ".join(SCHEMES)))
+        for key in ("description", "frame_length", "ebn0s"):
+            if key not in spec:
+                raise ValueError("Specimen {!r} has no {}.".format(spec.get("description", ""), key))
+
+        specs.append(spec)
+
+    return specs
+
+
+def build_table(code):
+    """Returns a lookup table given either a name in lookup_tables, a dict
+    {"feedback": F, "feedforward": [G, ...]} of a recursive systematic code or
+    a dict {"generators": [G, ...]} of a feedforward code, with polynomials in
+    octal as in the codes module.
+    """
+    if isinstance(code, str):
+        table = getattr(lookup_tables, code, None)
+        if not isinstance(table, dict):
+            raise ValueError("Unknown lookup table {!r}.".format(code))
+        return table
+
+    constraint_length = code.get("constraint_length")
+    if "feedback" in code:
+        return codes.recursive_systematic(code["feedback"], code["feedforward"], constraint_length)
+    elif "generators" in code:
+        return codes.convolutional(code["generators"], constraint_length)
+
+    raise ValueError("A code needs either feedback and feedforward or generators: {!r}.".format(code))
+
+
+def build_channel_model(options):
+    """Returns a channel_models object given a dict of its "model" name
+    (rayleigh, rician or gilbert-elliott) and its parameters.
+    """
+    from . import channel_models
+
+    options = dict(options)
+    model = options.pop("model", None)
+    if model == "rayleigh":
+        return channel_models.FadingChannel(0.0, **options)
+    elif model == "rician":
+        return channel_models.FadingChannel(**options)
+    elif model == "gilbert-elliott":
+        return channel_models.GilbertElliottChannel(**options)
+
+    raise ValueError("Unknown channel model {!r}.".format(model))
+
+
+def build_configuration(spec, directory=""):
+    """Returns a dict of simcore.Specimen parameters built from a specimen
+    specification (see specimen_specs).
+
+    Parameters:
+    directory -- the directory relative interleaver paths are resolved against.
+    """
+    decoder = spec["decoder"]
+    if decoder.get("per_iteration") and spec["scheme"] != "turbo":
+        raise ValueError("Specimen {!r} is not iteratively decoded.".format(spec["description"]))
+    modem = None
+    channel_reliability = None
+    if spec["modulation"]:
+        from . import modulation
+
+        options = spec["modulation"]
+        if isinstance(options, str):
+            options = {"constellation": options}
+        modem = modulation.Modem(**options)
+        channel_reliability = 1
+        if spec["all_zero"] and not modem.constellation.symmetric:
+            raise ValueError("Specimen {!r} cannot send the all-zero codeword on {}, only on {}.".format(
+                spec["description"], modem.constellation.name, " or ".join(modulation.SYMMETRIC)))
+
+    if spec["scheme"] == "uncoded":
+        encoder = encode.PassEncoder()
+        decoder_func = decode.PassDecoder()
+    else:
+        table = build_table(spec["code"])
+        # Terminates along the shortest path, so feedforward codes work too:
+        constituent = encode.RscEncoder(table)
+        if spec["scheme"] == "convolutional":
+            encoder = constituent
+            decoder_func = decode.MapDecoder(table, decoder.get("radix", 2), channel_reliability)
+        else:
+            if not spec.get("interleaver"):
+                raise ValueError("Turbo specimen {!r} has no interleaver.".format(spec["description"]))
+            il = interleave.from_spec(spec["interleaver"], spec["frame_length"], directory)
+            encoder = encode.TurboEncoder(il, constituent)
+            decoder_func = decode.TurboDecoder(table, il, decoder.get("iterations", 1),
+                                               decoder.get("radix", 2), channel_reliability)
+
+    stopping = spec["stopping"]
+    stopping_rule = None
+    if stopping.get("relative_error"):
+        stopping_rule = simcore.StoppingRule(
+            stopping.get("confidence", 0.95), stopping["relative_error"], stopping.get("min_errors", 10))
+
+    capture = spec["capture"]
+    if capture:
+        if isinstance(capture, str):
+            capture = {"path": capture}
+        capture = dict(capture, metadata={"spec": spec, "directory": os.path.abspath(directory)})
+
+    return {
+        "description": spec["description"],
+        "frame_length": spec["frame_length"],
+        "encoder": encoder,
+        "decoder_func": decoder_func,
+        "ebn0s": spec["ebn0s"],
+        "repeat_count": spec["repeat_count"],
+        "all_zero": spec["all_zero"],
+        "importance": spec["importance"],
+        "modem": modem,
+        "channel_model": build_channel_model(spec["channel"]) if spec["channel"] else None,
+        "sweep": spec["sweep"],
+        "stop_without_errors": stopping.get("without_errors", True),
+        "stopping_rule": stopping_rule,
+        "capture": capture,
+        "per_iteration": bool(decoder.get("per_iteration")),
+    }
+
+
+def build_configurations(configuration, directory=""):
+    """Returns a list of dicts of simcore.Specimen parameters, one per
+    specimen of a configuration.
+    """
+    configurations = [build_configuration(spec, directory) for spec in specimen_specs(configuration)]
+
+    paths = [c["capture"]["path"] for c in configurations if c["capture"]]
+    if len(set(paths)) < len(paths):
+        raise ValueError("Specimens must not capture frames to the same file.")
+
+    return configurations
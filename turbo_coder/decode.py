@@ -0,0 +1,514 @@
+import importlib.util
+import math
+import numbers
+import os
+import warnings
+
+from . import channel
+from . import encode
+from . import helpers
+from . import interleave
+
+# Environment variable naming the backend to use instead of the default:
+BACKEND_VARIABLE = "TURBO_BACKEND"
+
+# Importing NumPy and Numba is slow, so it is skipped when they would not be used:
+kernels = None
+if os.environ.get(BACKEND_VARIABLE, "numba") == "numba" and importlib.util.find_spec("numba"):
+    from . import kernels
+
+_backends = {}
+_backend = None
+
+
+def register_backend(name, map_function):
+    """Registers a MAP decoding backend.
+
+    Parameters:
+    name -- the backend's name.
+    map_function -- a function taking the parameters of
+        maximum_a_posteriori and returning a list of LLRs.
+    """
+    _backends[name] = map_function
+
+
+def set_backend(name):
+    """Selects the backend used by maximum_a_posteriori (and so by
+    turbo_decode). Raises ValueError if it is not registered.
+    """
+    global _backend
+    if name not in _backends:
+        raise ValueError("Unknown backend {!r}, available: {}.".format(name, ", ".join(available_backends())))
+    _backend = name
+
+
+def get_backend():
+    """Returns the name of the selected backend.
+    """
+    return _backend
+
+
+def available_backends():
+    return sorted(_backends)
+
+
+def weigh_samples(noisy_sequence, channel_reliability):
+    """Returns a tuple (noisy_sequence, channel_reliability) with a scalar
+    reliability. Per-symbol reliabilities (a sequence, e.g. from known
+    channel state) are multiplied into the samples, which gives channel LLRs
+    and a reliability of 1.
+    """
+    if isinstance(channel_reliability, numbers.Number):
+        return noisy_sequence, channel_reliability
+
+    return [reliability * y for reliability, y in zip(channel_reliability, noisy_sequence)], 1
+
+
+def calc_transition_metrics(
+        lookup_table,
+        noisy_sequence,
+        channel_reliability,
+        normalize=False,
+        extrinsic=None):
+    """Calculates transition (gamma) metrics.
+
+    Parameters:
+    lookup_table -- a dict of dicts of tuples in the following structure:
+        table[current_state][input] -> (output, next_state).
+    noisy_sequence -- sequence that is being decoded.
+    channel_reliability -- L_c = 4 * R * (E_b / N_0), where R is code rate,
+        or a sequence of per-symbol reliabilities (see weigh_samples).
+    normalize -- specifies whether the metrics should be normalized.
+    extrinsic -- extrinsic information, a list of floats
+
+    Returns a list of lists of dicts in the following structure:
+        gamma[trellis_position][state][next_state] -> float
+    """
+    noisy_sequence, channel_reliability = weigh_samples(noisy_sequence, channel_reliability)
+    inputs = list(lookup_table[0])
+    output_len = len(lookup_table[0][inputs[0]][0])
+    input_len = len(helpers.input_bits(inputs[0]))
+    trellis_len = len(noisy_sequence) // output_len
+    state_count = len(lookup_table)
+
+    modulated_table = helpers.modulate_table(lookup_table)
+
+    if not extrinsic:
+        extrinsic = [0] * (trellis_len * input_len)
+    else:
+        extrinsic += [0] * (trellis_len * input_len - len(extrinsic))
+
+    transition_metrics = [None] * trellis_len
+
+    for k in range(trellis_len):
+        transition_metrics[k] = [None] * state_count
+        noisy_output = noisy_sequence[k * output_len:(k + 1) * output_len]
+        step_extrinsic = extrinsic[k * input_len:(k + 1) * input_len]
+
+        # A priori factors of the inputs are the same in every state:
+        exp1 = {}
+        for i in inputs:
+            exp1[i] = math.exp(sum(helpers.modulate(bit) * e
+                                   for bit, e in zip(helpers.input_bits(i), step_extrinsic)) / 2)
+
+        for s in range(state_count):
+            transition_metrics[k][s] = {}
+
+            for i in inputs:
+                state_output, next_state = modulated_table[s][i]
+
+                a = (channel_reliability / 2)
+                b = sum(c * y for c, y in zip(state_output, noisy_output))    # FIXME got a MemoryError here once
+                exp2 = math.exp(a * b)
+
+                transition_metrics[k][s][next_state] = exp1[i] * exp2
+
+        # if normalize:     # Commented out for performance
+        #     transition_metrics[k] = helpers.normalize_dicts(transition_metrics[k])
+
+    return transition_metrics
+
+
+def calc_forward_metrics(lookup_table, transition_metrics, normalize=False):
+    """Calculates forward (alpha) metrics.
+
+    Parameters:
+    lookup_table -- a dict of dicts of tuples in the following structure:
+        table[current_state][input] -> (output, next_state).
+    transition_metrics -- a list of list of lists in the following structure:
+        gamma[trellis_position][state][input] -> float
+    normalize -- specifies whether the metrics should be normalized.
+
+    Returns a list of lists in the following structure:
+        alpha[trellis_position][state] -> float
+    """
+    trellis_len = len(transition_metrics)
+    state_count = len(lookup_table)
+
+    forward_metrics = [None] * (trellis_len + 1)
+
+    inverted_table = helpers.invert_lookup_table(lookup_table)
+
+    # Coding always starts in zero state:
+    forward_metrics[0] = [0] * state_count
+    forward_metrics[0][0] = 1
+
+    for k in range(1, len(forward_metrics)):
+        forward_metrics[k] = [None] * state_count
+
+        for state in range(state_count):
+            prev_states = inverted_table[state]
+
+            alpha = 0
+            for prev_state in prev_states:
+                alpha += forward_metrics[k - 1][prev_state] * \
+                    transition_metrics[k - 1][prev_state][state]
+
+            forward_metrics[k][state] = alpha
+
+        if normalize:
+            forward_metrics[k] = helpers.normalize(forward_metrics[k])
+
+    return forward_metrics
+
+
+def calc_backward_metrics(lookup_table, transition_metrics, normalize=False):
+    """Calculates backward (beta) metrics.
+
+    Parameters:
+    lookup_table -- a dict of dicts of tuples in the following structure:
+        table[current_state][input] -> (output, next_state).
+    transition_metrics -- a list of list of lists in the following structure:
+        gamma[trellis_position][state][input] -> float
+    normalize -- specifies whether the metrics should be normalized.
+
+    Returns a list of lists in the following structure:
+        beta[trellis_position][state] -> float
+    """
+    trellis_len = len(transition_metrics)
+    state_count = len(lookup_table)
+
+    backward_metrics = [None] * (trellis_len + 1)
+
+    # Coding always ends in zero state:
+    backward_metrics[-1] = [0] * state_count
+    backward_metrics[-1][0] = 1
+
+    for k in range(len(backward_metrics) - 2, -1, -1):
+        backward_metrics[k] = [None] * state_count
+
+        for state in range(state_count):
+            next_states = tuple(lookup_table[state][i][1] for i in lookup_table[state])          # FIXME MemoryError
+
+            beta = 0
+            for next_state in next_states:
+                beta += backward_metrics[k + 1][next_state] * \
+                    transition_metrics[k][state][next_state]
+
+            backward_metrics[k][state] = beta
+
+        if normalize:
+            backward_metrics[k] = helpers.normalize(backward_metrics[k])
+
+    return backward_metrics
+
+
+def maximum_a_posteriori(
+        lookup_table,
+        noisy_sequence,
+        channel_reliability,
+        normalize=False,
+        extrinsic=None,
+        radix=2):
+    """Calculates log-likelihood ratios using maximum a posteriori (MAP)
+    algorithm with the selected backend (see set_backend). Parameters are
+    described in python_maximum_a_posteriori.
+
+    Returns a list of floats.
+    """
+    return _backends[_backend](lookup_table, noisy_sequence, channel_reliability,
+                               normalize, extrinsic, radix)
+
+
+def python_maximum_a_posteriori(
+        lookup_table,
+        noisy_sequence,
+        channel_reliability,
+        normalize=False,
+        extrinsic=None,
+        radix=2):
+    """Calculates log-likelihood ratios using
+    maximum a posteriori (MAP) algorithm.
+
+    Parameters:
+    lookup_table -- a dict of dicts of tuples in the following structure:
+        table[current_state][input] -> (output, next_state).
+    noisy_sequence -- sequence that is being decoded.
+    channel_reliability -- L_c = 4 * R * (E_b / N_0), where R is code rate,
+        or a sequence of per-symbol reliabilities (see weigh_samples).
+    normalize -- specifies whether the metrics should be normalized.
+    extrinsic -- extrinsic information, a list of floats
+    radix -- 2 to advance the recursions one bit per step, or 4 to advance
+        them two bits per step on a collapsed trellis (see
+        helpers.collapse_lookup_table). A sequence of an odd number of steps
+        is decoded with a known 0 bit prepended.
+
+    Returns a list of floats.
+    """
+    noisy_sequence, channel_reliability = weigh_samples(noisy_sequence, channel_reliability)
+
+    padding = 0
+    if radix == 4:
+        output_len = len(lookup_table[0][0][0])
+        padding = len(noisy_sequence) // output_len % 2
+        lookup_table = helpers.collapse_lookup_table(lookup_table)
+        noisy_sequence = [0] * (padding * output_len) + list(noisy_sequence)
+        extrinsic = [0] * padding + list(extrinsic or [])
+    elif radix != 2:
+        raise ValueError("Unsupported radix {}.".format(radix))
+
+    gammas = calc_transition_metrics(lookup_table, noisy_sequence,
+                                     channel_reliability, normalize, extrinsic)
+    if padding:
+        # The prepended bit is 0, so the first step cannot start with a 1:
+        for i, (output, next_state) in lookup_table[0].items():
+            if i[0]:
+                gammas[0][0][next_state] = 0
+
+    alphas = calc_forward_metrics(lookup_table, gammas, normalize)
+    betas = calc_backward_metrics(lookup_table, gammas, normalize)
+
+    input_len = len(helpers.input_bits(next(iter(lookup_table[0]))))
+    llrs = [0] * (len(gammas) * input_len)
+
+    for k in range(len(gammas)):
+        sums = [[0, 0] for j in range(input_len)]
+
+        for state in lookup_table:
+            for i in lookup_table[state]:
+                next_state = lookup_table[state][i][1]
+
+                metric = alphas[k][state] * \
+                    gammas[k][state][next_state] * \
+                    betas[k+1][next_state]
+
+                for j, bit in enumerate(helpers.input_bits(i)):
+                    sums[j][bit] += metric
+
+        for j in range(input_len):
+            llrs[k * input_len + j] = math.log(sums[j][1]) - math.log(sums[j][0]) if sums[j][0] != 0 and sums[j][1] != 0 else -float("inf")  # TODO cover the case where sums[0] == 0
+
+    return llrs[padding:]
+
+
+def binary_maximum_a_posteriori(
+        lookup_table,
+        noisy_sequence,
+        channel_reliability,
+        normalize=False,
+        radix=2):
+    """Calculates hard decoded values (0 or 1) using
+    maximum a posteriori (MAP) algorithm.
+
+    Parameters:
+    lookup_table -- a dict of dicts of tuples in the following structure:
+        table[current_state][input] -> (output, next_state).
+    noisy_sequence -- sequence that is being decoded.
+    channel_reliability -- L_c = 4 * R * (E_b / N_0), where R is code rate.
+    normalize -- specifies whether the metrics should be normalized.
+    radix -- see python_maximum_a_posteriori.
+
+    Returns a list of integers 0 or 1.
+    """
+    llrs = maximum_a_posteriori(lookup_table, noisy_sequence,
+                                channel_reliability, normalize, radix=radix)
+    return list(helpers.demodulaten(helpers.to_hard_values(llrs)))
+
+
+def decompose(sequence, r, encoder_count):
+    """Demultiplexes the sequence to one systematic and two code sequences,
+    e.g. ABCABCABC -> AAA, [BBB, CCC]
+
+    Parameters:
+    sequence -- the "flat" input sequence of bit values
+    r -- length of code output
+    coder_count -- number of constituent encoders
+    """
+    output_len = encoder_count * r + 1
+    if len(sequence) % output_len != 0:
+        raise ValueError("Sequence is of improper length.")
+
+    systematic = []
+    codes = [[] for i in range(encoder_count)]
+
+    for chunk in range(len(sequence) // output_len):
+        systematic.append(sequence[chunk * output_len])
+        for i in range(encoder_count):
+            start = chunk * output_len + i * r + 1
+            end = chunk * output_len + (i + 1) * r + 1
+            codes[i] += sequence[start:end]
+
+    return systematic, codes
+
+
+def turbo_decode(noisy_sequence, lookup_table, interleaver,
+                 iteration_count, channel_reliability, radix=2, all_iterations=False):
+    """Decodes a turbo codeword and returns a list of decoded bits.
+
+    Parameters:
+    channel_reliability -- L_c or a sequence of per-symbol reliabilities
+        (see weigh_samples).
+    all_iterations -- if True, returns a list of the decisions after every
+        iteration instead, so that one decoding gives the results of all
+        iteration counts up to iteration_count.
+    """
+    noisy_sequence, channel_reliability = weigh_samples(noisy_sequence, channel_reliability)
+    frame_length = len(interleaver)
+    output_len = len(lookup_table[0][0][0])
+
+    systematic, codes = decompose(noisy_sequence, output_len - 1, 2)
+    isystematic = interleaver.interleave(systematic[:frame_length])
+    isystematic += [0] * (len(systematic) - len(isystematic))
+
+    extrinsic = [0] * frame_length
+    decisions = []
+
+    for i in range(iteration_count):
+        llrs, extrinsic = turbo_constituent_decode(lookup_table, systematic, codes[0], channel_reliability, extrinsic, radix)
+        extrinsic = interleaver.interleave(extrinsic[:frame_length])
+
+        llrs, extrinsic = turbo_constituent_decode(lookup_table, isystematic, codes[1], channel_reliability, extrinsic, radix)
+        extrinsic = interleaver.deinterleave(extrinsic[:frame_length])
+
+        if all_iterations:
+            decisions.append(list(helpers.demodulaten(interleaver.deinterleave(llrs[:frame_length]))))
+
+    if all_iterations:
+        return decisions
+
+    return list(helpers.demodulaten(interleaver.deinterleave(llrs[:frame_length])))
+
+
+def turbo_constituent_decode(
+        lookup_table,
+        systematic,
+        code,
+        channel_reliability,
+        extrinsic,
+        radix=2):
+    noisy_seq = helpers.multiplexed(systematic, code)
+
+    llrs = maximum_a_posteriori(lookup_table, noisy_seq, channel_reliability,
+                                True, extrinsic, radix)
+    extrinsic_out = [llr - extr - channel_reliability * syst for llr, extr, syst in zip(llrs, extrinsic, systematic)]
+
+    return llrs, extrinsic_out
+
+
+class PassDecoder(object):
+    """Hard decisions of uncoded BPSK symbols, the counterpart of
+    encode.PassEncoder.
+
+    Decoders are callables taking (noisy_sequence, ebn0), where ebn0 is the
+    signal-to-noise ratio per channel symbol in decibels, and returning a list
+    of decoded bits. With known channel state they are also given per-symbol
+    channel reliabilities, which override the ones derived from ebn0. Unlike
+    closures they can be pickled, so configurations holding them can be sent
+    to pool and distributed workers.
+    """
+
+    def __call__(self, noisy_sequence, ebn0, channel_reliability=None):
+        return list(helpers.demodulaten(noisy_sequence))
+
+
+class MapDecoder(object):
+    """MAP decoding of a terminated convolutional code, the counterpart of
+    encode.ConvoEncoder and encode.RscEncoder.
+    """
+
+    def __call__(self, noisy_sequence, ebn0, channel_reliability=None):
+        return binary_maximum_a_posteriori(self.lookup_table, noisy_sequence,
+                                           self.reliability(ebn0, channel_reliability), True, self.radix)
+
+    def reliability(self, ebn0, channel_reliability=None):
+        if channel_reliability is not None:
+            return channel_reliability
+        if self.channel_reliability is None:
+            return channel.reliability(ebn0)
+        return self.channel_reliability
+
+    def __init__(self, lookup_table, radix=2, channel_reliability=None):
+        """Parameters:
+        lookup_table -- the code's lookup table.
+        radix -- see python_maximum_a_posteriori.
+        channel_reliability -- a fixed L_c, e.g. 1 when decoding LLRs of a
+            soft demapper (see the modulation module). By default it is
+            derived from the signal-to-noise ratio of BPSK samples.
+        """
+        self.lookup_table = lookup_table
+        self.radix = radix
+        self.channel_reliability = channel_reliability
+
+
+class TurboDecoder(MapDecoder):
+    """Iterative decoding of a turbo code of two identical constituent codes,
+    the counterpart of encode.TurboEncoder.
+    """
+
+    def __call__(self, noisy_sequence, ebn0, channel_reliability=None):
+        return turbo_decode(noisy_sequence, self.lookup_table, self.interleaver,
+                            self.iteration_count, self.reliability(ebn0, channel_reliability), self.radix)
+
+    def iterations(self, noisy_sequence, ebn0, channel_reliability=None):
+        """Returns a list of the decoded bits after every iteration.
+        """
+        return turbo_decode(noisy_sequence, self.lookup_table, self.interleaver,
+                            self.iteration_count, self.reliability(ebn0, channel_reliability), self.radix,
+                            all_iterations=True)
+
+    def __init__(self, lookup_table, interleaver, iteration_count, radix=2, channel_reliability=None):
+        """Parameters:
+        lookup_table -- the constituent codes' lookup table.
+        interleaver -- the interleaver of the second constituent code.
+        iteration_count -- number of decoding iterations.
+        radix, channel_reliability -- see MapDecoder.
+        """
+        super(TurboDecoder, self).__init__(lookup_table, radix, channel_reliability)
+        self.interleaver = interleaver
+        self.iteration_count = iteration_count
+
+
+register_backend("python", python_maximum_a_posteriori)
+if kernels and kernels.AVAILABLE:
+    register_backend("numba", kernels.maximum_a_posteriori)
+
+_requested = os.environ.get(BACKEND_VARIABLE)
+if _requested and _requested not in _backends:
+    # Unlike explicit set_backend calls, a backend unavailable on this host
+    # (e.g. numba without Numba installed) must not break the import:
+    warnings.warn("Backend {!r} of {} is not available, using the python one.".format(
+        _requested, BACKEND_VARIABLE), RuntimeWarning)
+    _requested = "python"
+set_backend(_requested or ("numba" if "numba" in _backends else "python"))
+
+
+if __name__ == '__main__':    # pragma: no cover
+    rsc_table = {
+        0: {0: ((0, 0), 0), 1: ((1, 1), 2)},
+        1: {0: ((0, 0), 2), 1: ((1, 1), 0)},
+        2: {0: ((0, 1), 3), 1: ((1, 0), 1)},
+        3: {0: ((0, 1), 1), 1: ((1, 0), 3)},
+    }
+    permutation = list(range(9, -1, -1))
+    il = interleave.Interleaver(permutation)
+    ie = encode.RscEncoder(rsc_table)
+    turbo_encoder = encode.TurboEncoder(il, ie)
+
+    data = [int(bit) for bit in "0000000001"]
+    encoded = turbo_encoder.encode_sequence(data)
+    modulated = list(helpers.modulaten(encoded))
+    noisy = list(channel.transmit_awgn(modulated, 0.3))
+    decoded = turbo_decode(noisy, rsc_table, il, 10, 2)
+
+    print(data)
+    print(decoded)
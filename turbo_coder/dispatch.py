@@ -0,0 +1,184 @@
+"""Batched decoding of heterogeneous streams of turbo frames.
+
+Frames of different codes, interleavers and iteration counts are grouped
+into buckets by their Signature, and every bucket is decoded at once with
+batch_decode.turbo_decode. Trellises and interleavers are built once per
+signature and kept in a least recently used cache, so a process serving
+many configurations does not rebuild them for every batch. Frames whose
+length is not that of a codeword of their signature are rejected.
+
+    dispatcher = Dispatcher()
+    key = signature("gzl_rsc", "random:3", 1000, iterations=4)
+    llrs = dispatcher.decode([(key, frame_llrs), ...])
+"""
+from collections import OrderedDict, namedtuple
+import json
+
+import numpy as np
+
+from . import batch_decode
+from . import config
+from . import interleave
+
+CACHE_SIZE = 16
+MAX_BATCH = 256
+
+# What frames must share to be decoded together; code is a JSON string of a
+# config.build_table argument and interleaver an interleave.from_spec one.
+Signature = namedtuple('Signature', ['code', 'interleaver', 'frame_length', 'iterations', 'radix', 'algorithm',
+                                     'directory'])
+
+
+def signature(code, interleaver, frame_length, iterations=1, radix=2, algorithm="log", directory=""):
+    """Returns the Signature of frames of a turbo code.
+
+    Parameters:
+    code -- a lookup table name or code dict (see config.build_table).
+    interleaver -- an interleaver specification (see interleave.from_spec).
+    radix, algorithm -- see batch_decode.Trellis and
+        batch_decode.maximum_a_posteriori.
+    directory -- the directory a relative interleaver path is resolved
+        against.
+    """
+    return Signature(json.dumps(code, sort_keys=True), interleaver, int(frame_length), int(iterations),
+                     int(radix), algorithm, directory)
+
+
+class Dispatcher(object):
+    """Decodes frames in buckets of the same signature, caching the built
+    trellis and interleaver of the cache_size most recently used
+    signatures.
+    """
+
+    def decode(self, frames):
+        """Decodes a list of (signature, llrs) pairs, where llrs are the
+        channel LLRs of a codeword. Returns a list of arrays of LLRs of the
+        information bits, in the order of the frames.
+        """
+        decoded = [None] * len(frames)
+        for key, indices in self.buckets(frames).items():
+            llrs = self.decode_bucket(key[0], np.array([frames[i][1] for i in indices]))
+            for i, frame_llrs in zip(indices, llrs):
+                decoded[i] = frame_llrs
+
+        return decoded
+
+    def buckets(self, frames):
+        """Returns an OrderedDict of lists of the indices of frames sharing a
+        signature and codeword length, by (signature, length). Codewords of a
+        signature differ in length when their encoders terminate in
+        different numbers of steps.
+        """
+        buckets = OrderedDict()
+        for i, (key, llrs) in enumerate(frames):
+            buckets.setdefault((key, len(llrs)), []).append(i)
+
+        return buckets
+
+    def decode_bucket(self, key, llrs):
+        """Decodes an array of shape (frames, codeword_length) of channel
+        LLRs of frames of a signature, max_batch frames at a time. Returns an
+        array of shape (frames, frame_length). Raises ValueError if
+        codeword_length is not one of the signature's codeword_lengths.
+        """
+        self.check_length(key, llrs.shape[1])
+        trellis, il, lengths = self.compiled(key)
+        return np.concatenate([
+            batch_decode.turbo_decode(trellis, llrs[start:start + self.max_batch], il, key.iterations, 1,
+                                      key.algorithm, self.dtype)
+            for start in range(0, len(llrs), self.max_batch)])
+
+    def check_length(self, key, length):
+        """Raises ValueError if length is not one of the codeword_lengths of
+        a signature.
+        """
+        lengths = self.codeword_lengths(key)
+        if length not in lengths:
+            raise ValueError("Codewords of {} bits have one of {} samples, not {}.".format(
+                key.frame_length, ", ".join(map(str, lengths)), length))
+
+    def codeword_lengths(self, key):
+        """Returns a tuple of the lengths codewords of a signature can have.
+        Constituent encoders terminate along the shortest path to the zero
+        state, so the codeword ends with 0 up to tail_length steps of
+        1 + 2 * parity_len samples each.
+        """
+        return self.compiled(key)[2]
+
+    def compiled(self, key):
+        """Returns a tuple (trellis, interleaver, codeword_lengths) of a
+        signature, from the cache if it was built recently.
+        """
+        cache_key = key.code, key.radix, key.interleaver, key.frame_length, key.directory
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            self.hits += 1
+            return self._cache[cache_key]
+
+        self.misses += 1
+        table = config.build_table(json.loads(key.code))
+        trellis = batch_decode.Trellis(table, key.radix)
+        il = interleave.from_spec(key.interleaver, key.frame_length, key.directory)
+        if len(il) != key.frame_length:
+            raise ValueError("Interleaver {!r} is {} bits long, not {}.".format(
+                key.interleaver, len(il), key.frame_length))
+
+        # Tails are counted in single bits, which radix-4 steps are not:
+        tail_length = (trellis if key.radix == 2 else batch_decode.Trellis(table)).tail_length
+        step_len = 1 + 2 * (trellis.output_len // trellis.input_len - 1)
+        lengths = tuple((key.frame_length + tail) * step_len for tail in range(tail_length + 1))
+
+        compiled = trellis, il, lengths
+        self._cache[cache_key] = compiled
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return compiled
+
+    def __init__(self, cache_size=CACHE_SIZE, max_batch=MAX_BATCH, dtype=np.float64):
+        """Parameters:
+        cache_size -- number of signatures whose trellis and interleaver
+            are kept.
+        max_batch -- maximum number of frames decoded at once, which bounds
+            the memory of the metrics arrays.
+        dtype -- the precision of the metrics (see
+            batch_decode.maximum_a_posteriori).
+        """
+        self.cache_size = cache_size
+        self.max_batch = max_batch
+        self.dtype = dtype
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+
+_dispatcher = None
+
+
+def decode_bucket(key, llrs):
+    """Decodes frames of a signature (see Dispatcher.decode_bucket) with a
+    dispatcher of this process. Being a module-level function, it can be
+    submitted to process pools.
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = Dispatcher()
+
+    return _dispatcher.decode_bucket(key, llrs)
+
+
+def decode_pooled(frames, executor):
+    """Decodes a list of (signature, llrs) pairs like Dispatcher.decode,
+    submitting every bucket to an executor (e.g. a
+    concurrent.futures.ProcessPoolExecutor) at once.
+    """
+    futures = []
+    for (key, length), indices in Dispatcher().buckets(frames).items():
+        futures.append((indices, executor.submit(decode_bucket, key, np.array([frames[i][1] for i in indices]))))
+
+    decoded = [None] * len(frames)
+    for indices, future in futures:
+        for i, frame_llrs in zip(indices, future.result()):
+            decoded[i] = frame_llrs
+
+    return decoded
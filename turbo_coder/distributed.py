@@ -0,0 +1,399 @@
+"""Distributed simulation: a coordinator serves chunks of frames to workers
+over TCP, which may run on other hosts.
+
+Coordinator:
+    turbo-sim CONFIG --port 6000 [--host 0.0.0.0] [--local-workers N] [--authkey KEY]
+or, in a script, instead of simcore.verbose_exec:
+    distributed.verbose_coordinate(configurations, port=6000)
+
+Workers:
+    python -m turbo_coder.distributed HOST:PORT [--processes N] [--authkey KEY]
+
+Configurations are pickled and sent to the workers, so encoders and decoders
+must be importable on the worker hosts (e.g. the decode module's decoder
+classes or module-level functions, not closures or lambdas).
+
+Coordinator and workers exchange pickles, so whoever can connect with the
+authentication key can run code on the other end. The coordinator listens
+on the loopback interface unless given a host, and the key comes from
+--authkey or the TURBO_AUTHKEY environment variable; without either the
+coordinator generates a random one and prints it for the workers.
+"""
+from collections import namedtuple, deque
+from multiprocessing.connection import Client, Listener
+import argparse
+import datetime
+import multiprocessing
+import os
+import secrets
+import socket
+import threading
+import time
+
+from . import helpers
+from . import simcore
+
+AUTHKEY_VARIABLE = "TURBO_AUTHKEY"
+HOST = "127.0.0.1"
+CHUNK_SIZE = 10
+
+Chunk = namedtuple('Chunk', ['id', 'spec_id', 'point', 'ebn0', 'start', 'count'])
+# iterations is the chunk's per-iteration totals (see simcore.Specimen.samplek):
+ChunkResult = namedtuple('ChunkResult', ['chunk_id', 'bit_errors', 'frame_errors', 'squared_errors', 'elapsed',
+                                         'iterations'], defaults=[None])
+
+
+def environment_authkey():
+    """Returns the authentication key of the TURBO_AUTHKEY environment
+    variable as bytes, or None if it is not set.
+    """
+    value = os.environ.get(AUTHKEY_VARIABLE)
+    return value.encode() if value else None
+
+
+def make_chunks(specimens, chunk_size=CHUNK_SIZE):
+    """Splits the frames of every specimen's Eb/N0 point into chunks of at
+    most chunk_size frames. Chunks are ordered by Eb/N0 point first, so that
+    the lowest points of all specimens are simulated first.
+    """
+    chunks = []
+    for spec in specimens:
+        for point, (ebn0, repeat) in enumerate(zip(spec.ebn0s, spec.repeat_count)):
+            for start in range(0, repeat, chunk_size):
+                chunks.append((point, spec.id, ebn0, start, min(chunk_size, repeat - start)))
+
+    chunks.sort(key=lambda item: item[:2])
+
+    return [Chunk(i, spec_id, point, ebn0, start, count)
+            for i, (point, spec_id, ebn0, start, count) in enumerate(chunks)]
+
+
+class Coordinator(object):
+    """Serves chunks to connected workers and collects their error counts.
+    A chunk whose worker disconnects before returning its result is put back
+    to be served to another worker.
+
+    As in simcore.Specimen.samplen, once an Eb/N0 point of a specimen is
+    finished without errors (and its stop_without_errors is set), chunks of
+    its higher points that have not been served yet are dropped. Pending
+    chunks of a point are also dropped once its estimate meets the specimen's
+    stopping rule, so its frame count depends on the order results arrive in.
+    Sweeping specimens (see simcore.Specimen.sweepn) are not supported, since
+    their points share frames, and neither is capturing frames. Per-iteration
+    errors are merged like the other totals.
+    """
+
+    def serve(self, on_progress=None, interval=0.2):
+        """Accepts workers until every chunk is done. Returns a list of
+        simcore.SampleResult objects, one per configuration.
+
+        Parameters:
+        on_progress -- an optional function called every interval seconds
+            with the coordinator.
+        """
+        accept_thread = threading.Thread(target=self._accept)
+        accept_thread.daemon = True
+        accept_thread.start()
+
+        last_progress = time.time()
+        with self.condition:
+            while not self.finished():
+                self.condition.wait(interval)
+                if on_progress and time.time() - last_progress >= interval:
+                    on_progress(self)
+                    last_progress = time.time()
+
+        self.listener.close()
+
+        return self.results()
+
+    def finished(self):
+        return not self.pending and not self.in_flight
+
+    def results(self):
+        results = []
+        for spec in self.specimens:
+            totals = [self.totals[spec.id, point] for point in range(len(spec.ebn0s))]
+            frame_counts = [total[0] for total in totals]
+            results.append(simcore.SampleResult(
+                spec.ebn0s,
+                [errors / (frames * spec.frame_length) if frames else 0
+                 for frames, errors, frame_errors, elapsed, squares in totals],
+                spec.description,
+                spec.frame_length,
+                spec.repeat_count,
+                frame_counts,
+                [total[1] for total in totals],
+                [total[2] for total in totals],
+                [total[3] for total in totals],
+                self.seed,
+                [simcore.ber_variance(frames, spec.frame_length, errors, squares)
+                 for frames, errors, frame_errors, elapsed, squares in totals],
+                spec.iteration_summary(frame_counts)))
+
+        return results
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except (IOError, OSError, EOFError):
+                return
+
+            handler = threading.Thread(target=self._handle, args=(conn,))
+            handler.daemon = True
+            handler.start()
+
+    def _handle(self, conn):
+        chunk = None
+        try:
+            kind, host = conn.recv()
+            with self.condition:
+                self.workers[id(conn)] = host
+            conn.send(("configurations", (self.configurations, self.seed)))
+
+            while True:
+                chunk = self._next_chunk()
+                if chunk is None:
+                    conn.send(("stop", None))
+                    return
+
+                conn.send(("chunk", chunk))
+                kind, result = conn.recv()
+                self._complete(chunk, result)
+                chunk = None
+
+        except (IOError, OSError, EOFError):
+            pass
+
+        finally:
+            with self.condition:
+                if chunk is not None and chunk.id in self.in_flight:
+                    del self.in_flight[chunk.id]
+                    self.pending.appendleft(chunk)
+                    self.reassigned += 1
+                self.workers.pop(id(conn), None)
+                self.condition.notify_all()
+            conn.close()
+
+    def _next_chunk(self):
+        """Returns the next chunk to serve or None when all chunks are done.
+        Waits while other workers still have chunks that may be put back.
+        """
+        with self.condition:
+            while not self.pending:
+                if not self.in_flight:
+                    return None
+                self.condition.wait()
+
+            chunk = self.pending.popleft()
+            self.in_flight[chunk.id] = chunk
+            return chunk
+
+    def _complete(self, chunk, result):
+        with self.condition:
+            del self.in_flight[chunk.id]
+
+            total = self.totals[chunk.spec_id, chunk.point]
+            total[0] += chunk.count
+            total[1] += result.bit_errors
+            total[2] += result.frame_errors
+            total[3] += result.elapsed
+            total[4] += result.squared_errors
+            self.done_count += 1
+
+            self.remaining[chunk.spec_id, chunk.point] -= 1
+            spec = self.specimens[chunk.spec_id]
+            if result.iterations:
+                spec.add_iteration_totals(chunk.point, result.iterations)
+            if not self.remaining[chunk.spec_id, chunk.point] and not total[1] and spec.stop_without_errors:
+                self._drop_higher_points(chunk.spec_id, chunk.point)
+            elif spec.precise_enough(total[0], total[1], total[4]):
+                self._drop_point(chunk.spec_id, chunk.point)
+
+            self.condition.notify_all()
+
+    def _drop_higher_points(self, spec_id, point):
+        self._drop([c for c in self.pending if c.spec_id == spec_id and c.point > point])
+
+    def _drop_point(self, spec_id, point):
+        self._drop([c for c in self.pending if c.spec_id == spec_id and c.point == point])
+
+    def _drop(self, dropped):
+        for c in dropped:
+            self.pending.remove(c)
+            self.remaining[c.spec_id, c.point] -= 1
+        self.done_count += len(dropped)
+
+    def __init__(self, configurations, address=(HOST, 6000), authkey=None,
+                 chunk_size=CHUNK_SIZE, seed=None):
+        """Initializes the coordinator and starts listening.
+
+        Parameters:
+        configurations -- a list of dicts of simcore.Specimen parameters.
+        address -- a (host, port) tuple to listen on; port 0 picks a free one.
+            Only the loopback interface by default; workers on other hosts
+            need e.g. ("0.0.0.0", port).
+        authkey -- a shared secret (bytes) the workers must know. Defaults to
+            the TURBO_AUTHKEY environment variable, or a random key if it is
+            not set (see generated_authkey).
+        chunk_size -- maximum number of frames in a chunk.
+        seed -- the seed of the run (a new one if None). Frames are the same
+            as simcore would simulate with this seed.
+        """
+        self.configurations = configurations
+        self.seed = helpers.new_seed() if seed is None else seed
+        self.specimens = simcore.create_specimens(configurations, self.seed)
+        if any(spec.sweep for spec in self.specimens):
+            raise ValueError("Sweeping specimens cannot be distributed.")
+        if any(spec.capture for spec in self.specimens):
+            raise ValueError("Capturing specimens cannot be distributed.")
+        self.chunks = make_chunks(self.specimens, chunk_size)
+
+        self.pending = deque(self.chunks)
+        self.in_flight = {}
+        self.workers = {}
+        self.done_count = 0
+        self.reassigned = 0
+
+        self.totals = {}
+        self.remaining = {}
+        for spec in self.specimens:
+            for point in range(len(spec.ebn0s)):
+                self.totals[spec.id, point] = [0, 0, 0, 0.0, 0]
+                self.remaining[spec.id, point] = 0
+        for chunk in self.chunks:
+            self.remaining[chunk.spec_id, chunk.point] += 1
+
+        self.generated_authkey = False
+        if authkey is None:
+            authkey = environment_authkey()
+        if authkey is None:
+            authkey = secrets.token_hex(16).encode()
+            self.generated_authkey = True
+        self.authkey = authkey
+
+        self.condition = threading.Condition()
+        self.listener = Listener(address, authkey=authkey)
+        self.address = self.listener.address
+
+
+def work(address, authkey):
+    """Connects to a coordinator and simulates the chunks it serves until it
+    tells to stop or disconnects.
+    """
+    conn = Client(address, authkey=authkey)
+    try:
+        conn.send(("hello", socket.gethostname()))
+        kind, (configurations, seed) = conn.recv()
+        specimens = simcore.create_specimens(configurations, seed)
+
+        while True:
+            kind, chunk = conn.recv()
+            if kind == "stop":
+                return
+
+            start_time = time.time()
+            bit_errors, frame_errors, squared_errors, iterations = \
+                specimens[chunk.spec_id].samplek(chunk.point, chunk.start, chunk.count)
+
+            conn.send(("result", ChunkResult(
+                chunk.id, bit_errors, frame_errors, squared_errors, time.time() - start_time, iterations)))
+
+    except (IOError, OSError, EOFError):
+        pass
+
+    finally:
+        conn.close()
+
+
+def start_workers(address, process_count, authkey):
+    """Starts worker processes on this host. Returns a list of them.
+    """
+    processes = []
+    for i in range(process_count):
+        process = multiprocessing.Process(target=work, args=(address, authkey))
+        process.daemon = True
+        process.start()
+        processes.append(process)
+
+    return processes
+
+
+def verbose_coordinate(configurations, port=6000, local_workers=0, authkey=None,
+                       chunk_size=CHUNK_SIZE, seed=None, name=None, host=HOST):
+    """Runs the configurations on workers connecting to the given port,
+    printing progress, and saves the results like simcore.verbose_exec.
+
+    Parameters:
+    local_workers -- number of worker processes to start on this host.
+    authkey, host -- see Coordinator.
+    name -- names the JSON file; defaults to the name of the calling script.
+    """
+    print("TURBO SIMCORE (distributed)")
+    print("Running {} specimens:".format(len(configurations)))
+    for config in configurations:
+        print("  - " + config['description'])
+
+    coordinator = Coordinator(configurations, (host, port), authkey, chunk_size, seed)
+    print("Listening on {}:{}, {} chunks".format(host, coordinator.address[1], len(coordinator.chunks)))
+    if coordinator.generated_authkey:
+        print("Workers authenticate with --authkey {}".format(coordinator.authkey.decode()))
+
+    workers = start_workers(("localhost", coordinator.address[1]), local_workers, coordinator.authkey)
+
+    print(time.strftime("Started %H:%M:%S\n"))
+    start_time = time.time()
+
+    results = coordinator.serve(lambda c: print_progress(c, time.time() - start_time))
+    print_progress(coordinator, time.time() - start_time)
+
+    for process in workers:
+        process.join()
+
+    time_elapsed = time.time() - start_time
+    print(time.strftime("\n\nFinished %H:%M:%S"))
+
+    info = {
+        "date": datetime.datetime.isoformat(datetime.datetime.now()),
+        "time_elapsed": time_elapsed,
+        "specimens": len(configurations),
+        "chunks": len(coordinator.chunks),
+        "reassigned_chunks": coordinator.reassigned,
+        "seed": coordinator.seed,
+    }
+    out_file = simcore.save_results(info, results, name)
+    print("File saved:", out_file)
+
+    simcore.store_results(info, *simcore.iteration_results(configurations, results))
+
+    return results
+
+
+def print_progress(coordinator, time_elapsed):
+    print("\r[{}] {:<8.0f} chunks {}/{} workers {} reassigned {}".format(
+        simcore._spinner(),
+        time_elapsed,
+        coordinator.done_count,
+        len(coordinator.chunks),
+        len(coordinator.workers),
+        coordinator.reassigned), end=' ', flush=True)
+
+
+def _parse_address(value):
+    host, port = value.rsplit(":", 1)
+    return host, int(port)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Runs simulation workers.")
+    parser.add_argument("address", type=_parse_address, help="coordinator HOST:PORT")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--authkey", type=str.encode, default=environment_authkey(),
+                        help="the coordinator's key (defaults to the {} variable)".format(AUTHKEY_VARIABLE))
+    args = parser.parse_args()
+    if not args.authkey:
+        parser.error("an authentication key is required, with --authkey or {}".format(AUTHKEY_VARIABLE))
+
+    for process in start_workers(args.address, args.processes, args.authkey):
+        process.join()
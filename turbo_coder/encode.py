@@ -1,6 +1,6 @@
 from itertools import chain
 
-from helpers import multiplexed
+from .helpers import multiplexed
 
 
 class PassEncoder(object):
@@ -54,22 +54,58 @@ class ConvoEncoder(object):
         """
         self.lookup_table = lookup_table
         # The first state in lookup_table is considered zero state:
-        self._zero_state = lookup_table.keys()[0]
+        self._zero_state = next(iter(lookup_table))
         self.state = self._zero_state
 
 
 class RscEncoder(ConvoEncoder):
     """A basic Recursive Convolutional Encoder. It brings itself to zero state
-    by summing the values of its state registers. State values are expected to
-    be numeric values.
+    along the shortest path in its trellis, i.e. by feeding back the state
+    registers so that zeros are shifted in.
     """
 
     def _to_zero_state(self):
-        """Returns the input required to bring the encoder to zero state. It is
-        determined by converting state value (a number) to binary system and
-        modulo 2 summing its binary digits.
+        """Returns the input required to bring the encoder closer to zero state.
         """
-        return sum(map(int, bin(self.state)[2:])) % 2
+        return self._termination_inputs[self.state]
+
+    def __init__(self, lookup_table):
+        super(RscEncoder, self).__init__(lookup_table)
+        self._termination_inputs = termination_inputs(lookup_table, self._zero_state)
+
+
+def termination_inputs(lookup_table, zero_state):
+    """Finds the shortest paths from every state to the zero state with a
+    breadth-first search over the trellis.
+
+    Returns a dict of state to the first input of its path. The input of the
+    zero state keeps the encoder there, if there is such an input.
+    Raises ValueError if some state cannot reach the zero state.
+    """
+    inputs = {zero_state: 0}
+    for input_bit, (output, next_state) in lookup_table[zero_state].items():
+        if next_state == zero_state:
+            inputs[zero_state] = input_bit
+
+    reached = set([zero_state])
+    frontier = [zero_state]
+    while frontier:
+        found = []
+        for state in lookup_table:
+            if state in reached:
+                continue
+            for input_bit, (output, next_state) in sorted(lookup_table[state].items()):
+                if next_state in frontier:
+                    inputs[state] = input_bit
+                    found.append(state)
+                    break
+        reached.update(found)
+        frontier = set(found)
+
+    if len(reached) != len(lookup_table):
+        raise ValueError("Not every state can reach the zero state.")
+
+    return inputs
 
 
 class TurboEncoder(object):
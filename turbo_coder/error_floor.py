@@ -0,0 +1,181 @@
+"""Error floor analysis of turbo codes by searching for low-weight codewords.
+
+The error floor of a turbo code is caused by input patterns of low weight
+that both constituent encoders map to low-weight parity sequences. Such
+patterns are found by enumerating inputs of weight 2, 3 and 4 whose bits lie
+within a span, either in the original order or in the interleaved one.
+
+Usage:
+    python -m turbo_coder.error_floor TABLE INTERLEAVER [--span 20] [--max-distance 30]
+
+INTERLEAVER is either "block:WIDTHxHEIGHT" or a path to a JSON permutation
+(e.g. configs/perm1k.txt).
+"""
+from itertools import combinations
+import argparse
+
+from . import bounds
+from . import encode
+from . import interleave
+from . import lookup_tables
+
+
+class ParityWeigher(object):
+    """Calculates parity weights of a recursive systematic constituent
+    encoder for sparse input patterns, the way encode.TurboEncoder encodes
+    them (parity bits only, including the termination tail).
+    """
+
+    def weight(self, positions, frame_length, limit=float("inf")):
+        """Returns the parity weight of a frame with ones at the given sorted
+        positions, or None if it exceeds the limit.
+        """
+        state = self._zero_state
+        weight = 0
+        k = positions[0]
+
+        for index, position in enumerate(positions):
+            while k < position:
+                if state == self._zero_state:
+                    k = position
+                    break
+                state, weight = self._step(state, 0, weight)
+                k += 1
+                if weight > limit:
+                    return None
+
+            state, weight = self._step(state, 1, weight)
+            k += 1
+
+        while state != self._zero_state:
+            if k == frame_length:
+                weight += self.tail_weights[state]
+                break
+            state, weight = self._step(state, 0, weight)
+            k += 1
+            if weight > limit:
+                return None
+
+        return weight if weight <= limit else None
+
+    def _step(self, state, input_bit, weight):
+        output, next_state = self.lookup_table[state][input_bit]
+        return next_state, weight + sum(output[1:])
+
+    def __init__(self, lookup_table):
+        """Initializes the weigher.
+
+        Parameters:
+        lookup_table -- a lookup table of a recursive systematic code (see
+            lookup_tables).
+        """
+        self.lookup_table = lookup_table
+        self._zero_state = encode.RscEncoder(lookup_table).state
+        self.tail_weights = bounds.tail_parity_weights(lookup_table)
+
+
+def input_patterns(frame_length, weight, span):
+    """Returns a generator of sorted tuples of weight positions from 0 to
+    frame_length - 1, where the last position is less than span away from
+    the first one.
+    """
+    for first in range(frame_length):
+        rest = range(first + 1, min(first + span, frame_length))
+        for others in combinations(rest, weight - 1):
+            yield (first,) + others
+
+
+def weight_spectrum(lookup_table, interleaver, weights=(2, 3, 4), span=20, max_distance=30):
+    """Finds the turbo codewords of low-weight inputs.
+
+    Parameters:
+    lookup_table -- the lookup table of both constituent encoders.
+    interleaver -- an interleave.Interleaver object.
+    weights -- input weights to enumerate.
+    span -- maximum distance between the first and the last input bit, in
+        the original or in the interleaved order.
+    max_distance -- codewords of greater weight are not recorded.
+
+    Returns a dict of codeword weight to a tuple
+    (multiplicity, total information weight).
+    """
+    weigher = ParityWeigher(lookup_table)
+    frame_length = len(interleaver)
+    permutation = interleaver.permutation
+    inverted_permutation = interleaver.inverted_permutation
+
+    spectrum = {}
+    seen = set()
+    for weight in weights:
+        for pattern in input_patterns(frame_length, weight, span):
+            # The same pattern, compact in the interleaved order:
+            originals = tuple(sorted(inverted_permutation[i] for i in pattern))
+
+            for positions in (pattern, originals):
+                if positions in seen:
+                    continue
+                seen.add(positions)
+
+                distance = _codeword_weight(weigher, permutation, positions, frame_length, max_distance)
+                if distance is not None:
+                    multiplicity, information_weight = spectrum.get(distance, (0, 0))
+                    spectrum[distance] = (multiplicity + 1, information_weight + weight)
+
+    return spectrum
+
+
+def _codeword_weight(weigher, permutation, positions, frame_length, limit):
+    weight = len(positions)
+
+    parity = weigher.weight(positions, frame_length, limit - weight)
+    if parity is None:
+        return None
+    weight += parity
+
+    interleaved = sorted(permutation[i] for i in positions)
+    parity = weigher.weight(interleaved, frame_length, limit - weight)
+    if parity is None:
+        return None
+
+    return weight + parity
+
+
+def minimum_distance(spectrum):
+    """Returns the smallest codeword weight found, or None.
+    """
+    return min(spectrum) if spectrum else None
+
+
+def error_floor(spectrum, frame_length, ebn0s, rate=1/3):
+    """Predicts the error floor of a turbo code with the union bound over the
+    low-weight codewords found by weight_spectrum.
+
+    Returns a list of BER values.
+    """
+    information_weights = dict((distance, information_weight)
+                               for distance, (multiplicity, information_weight) in spectrum.items())
+
+    return bounds.union_bound(information_weights, ebn0s, rate, frame_length)
+
+
+if __name__ == '__main__':    # pragma: no cover
+    parser = argparse.ArgumentParser(description="Searches low-weight turbo codewords.")
+    parser.add_argument("table", help="a lookup_tables name, e.g. gzl_rsc")
+    parser.add_argument("interleaver", help="block:WIDTHxHEIGHT or a JSON permutation file")
+    parser.add_argument("--span", type=int, default=20)
+    parser.add_argument("--max-distance", type=int, default=30)
+    args = parser.parse_args()
+
+    il = interleave.from_spec(args.interleaver)
+    spectrum = weight_spectrum(getattr(lookup_tables, args.table), il,
+                               span=args.span, max_distance=args.max_distance)
+
+    print("Minimum distance found:", minimum_distance(spectrum))
+    print("{:>8} {:>12} {:>12}".format("weight", "codewords", "info weight"))
+    for distance in sorted(spectrum):
+        print("{:>8} {:>12} {:>12}".format(distance, *spectrum[distance]))
+
+    ebn0s = [1, 2, 3, 4, 5, 6]
+    print("\nUnion bound (Eb/N0 in dB, rate 1/3):")
+    for ebn0, ber in zip(ebn0s, error_floor(spectrum, len(il), ebn0s)):
+        print("{:>8} {:>12.3e}".format(ebn0, ber))
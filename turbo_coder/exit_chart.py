@@ -0,0 +1,150 @@
+"""EXIT (extrinsic information transfer) charts of constituent codes.
+
+A constituent MAP decoder is given a priori LLRs modelled as Gaussian with
+a chosen mutual information I_A with the input bits, and the mutual
+information I_E of its extrinsic output is measured. For a turbo code with
+two identical constituent codes, iterative decoding converges when the
+transfer curve lies above the diagonal, i.e. the tunnel between the curve
+and its mirror image is open.
+
+Usage:
+    python -m turbo_coder.exit_chart TABLE [EBN0 ...] [--rate R] [--frames N] [--length N]
+"""
+import argparse
+import math
+
+import numpy as np
+
+from . import batch_decode
+from . import channel
+from . import lookup_tables
+
+# Parameters of the J function approximation by Brannstrom et al.
+H1, H2, H3 = 0.3073, 0.8935, 1.1064
+MAX_INFORMATION = 0.9999
+
+
+def j_function(sigma):
+    """Returns the mutual information between a bit and its LLR, when the LLR
+    is Gaussian with variance sigma ** 2 and mean sigma ** 2 / 2 times the
+    modulated bit.
+    """
+    return (1 - 2 ** (-H1 * sigma ** (2 * H2))) ** H3
+
+
+def inverse_j(information):
+    """Returns sigma for which j_function(sigma) equals the given mutual
+    information.
+    """
+    information = min(max(information, 0), MAX_INFORMATION)
+    return (-math.log(1 - information ** (1 / H3), 2) / H1) ** (1 / (2 * H2))
+
+
+def mutual_information(llrs, bits):
+    """Estimates the mutual information between bits and their LLRs by time
+    averaging, assuming the LLRs are consistent.
+
+    Parameters:
+    llrs -- an array of LLRs.
+    bits -- an array of the same shape of values 0 or 1.
+    """
+    modulated = 2 * np.asarray(bits) - 1
+    return 1 - np.mean(np.logaddexp(0, -modulated * np.asarray(llrs))) / math.log(2)
+
+
+def apriori_llrs(bits, information, rng=np.random):
+    """Returns Gaussian a priori LLRs of bits (an array of values 0 or 1)
+    with the given mutual information.
+    """
+    sigma = inverse_j(information)
+    modulated = 2 * np.asarray(bits) - 1
+    return sigma ** 2 / 2 * modulated + sigma * rng.standard_normal(modulated.shape)
+
+
+def transfer_curve(lookup_table, ebn0, apriori_informations=None, frame_length=1000,
+                   frames=20, rate=1, seed=None, algorithm="log", radix=2):
+    """Calculates the EXIT curve of a constituent code.
+
+    Parameters:
+    lookup_table -- see lookup_tables.
+    ebn0 -- Eb/N0 in decibels.
+    apriori_informations -- a list of I_A values, by default 0 to 1 in steps
+        of 0.1.
+    frame_length -- number of input bits of a frame.
+    frames -- number of frames decoded at once for every I_A value.
+    rate -- the code rate. Pass 1 if ebn0 is the signal-to-noise ratio per
+        channel symbol, as in channel.transmit_awgn.
+    seed -- seed of the random number generator.
+    algorithm -- see batch_decode.maximum_a_posteriori.
+    radix -- radix of the decoder's trellis, see batch_decode.Trellis.
+
+    Returns a list of (I_A, I_E) tuples.
+    """
+    if apriori_informations is None:
+        apriori_informations = [i / 10 for i in range(11)]
+
+    rng = np.random.RandomState(seed)
+    trellis = batch_decode.Trellis(lookup_table)
+    decoder_trellis = batch_decode.Trellis(lookup_table, radix)
+
+    bits = rng.randint(0, 2, (frames, frame_length))
+    encoded = batch_decode.encode(trellis, bits)
+
+    ratio = rate * channel._decibel_to_ratio(ebn0)
+    noisy = 2.0 * encoded - 1 + math.sqrt(1 / (2 * ratio)) * rng.standard_normal(encoded.shape)
+    channel_reliability = 4 * ratio
+
+    curve = []
+    for information in apriori_informations:
+        apriori = apriori_llrs(bits, information, rng)
+        llrs = batch_decode.maximum_a_posteriori(decoder_trellis, noisy, channel_reliability,
+                                                 apriori, algorithm=algorithm)
+
+        extrinsic = llrs[:, :frame_length] - apriori
+        if trellis.systematic:
+            systematic = noisy[:, :frame_length * trellis.output_len:trellis.output_len]
+            extrinsic -= channel_reliability * systematic
+
+        curve.append((information, mutual_information(extrinsic, bits)))
+
+    return curve
+
+
+def tunnel_open(curve):
+    """Returns whether the iterations of a turbo code with two identical
+    constituent codes of the given transfer curve reach full information,
+    i.e. the curve stays above the diagonal up to its last point.
+    """
+    return all(extrinsic > apriori for apriori, extrinsic in curve[:-1])
+
+
+def decoding_threshold(lookup_table, ebn0s, **kwargs):
+    """Returns the lowest of the Eb/N0 values at which the EXIT tunnel of a
+    turbo code with two identical constituent codes is open, or None.
+    Keyword arguments are passed to transfer_curve.
+    """
+    for ebn0 in sorted(ebn0s):
+        if tunnel_open(transfer_curve(lookup_table, ebn0, **kwargs)):
+            return ebn0
+
+    return None
+
+
+if __name__ == '__main__':    # pragma: no cover
+    parser = argparse.ArgumentParser(description="Calculates EXIT curves of a constituent code.")
+    parser.add_argument("table", help="a lookup_tables name, e.g. gzl_rsc")
+    parser.add_argument("ebn0s", type=float, nargs="*", default=[-5, -4.5, -4, -3.5])
+    parser.add_argument("--rate", type=float, default=1)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--length", type=int, default=1000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--radix", type=int, choices=(2, 4), default=2)
+    args = parser.parse_args()
+
+    table = getattr(lookup_tables, args.table)
+    for ebn0 in args.ebn0s:
+        curve = transfer_curve(table, ebn0, frame_length=args.length, frames=args.frames,
+                               rate=args.rate, seed=args.seed, radix=args.radix)
+        print("Eb/N0 {} dB, tunnel {}".format(ebn0, "open" if tunnel_open(curve) else "closed"))
+        for apriori, extrinsic in curve:
+            print("  I_A {:.2f}  I_E {:.4f}".format(apriori, extrinsic))
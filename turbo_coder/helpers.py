@@ -1,7 +1,8 @@
-from __future__ import division
-from itertools import chain, islice, izip, izip_longest
+from itertools import chain, islice, zip_longest
 from types import GeneratorType
-import collections
+import binascii
+import collections.abc
+import hashlib
 import math
 import random
 
@@ -9,7 +10,7 @@ import random
 def nested_to_string(iterable):
     """Converts a nested iterable to a string.
     """
-    if isinstance(iterable, collections.Iterable):
+    if isinstance(iterable, collections.abc.Iterable) and not isinstance(iterable, str):
         return "".join([nested_to_string(item) for item in iterable])
     else:
         return str(iterable)
@@ -50,7 +51,7 @@ def modulate_table(lookup_table):
     modulated_table = {}
     for state in lookup_table:
         modulated_table[state] = {}
-        for i in (0, 1):
+        for i in lookup_table[state]:
             output = tuple(modulaten(lookup_table[state][i][0]))
             next_state = lookup_table[state][i][1]
             modulated_table[state][i] = (output, next_state)
@@ -79,7 +80,7 @@ def invert_lookup_table(lookup_table):
 
     inverted = [None] * state_count
 
-    for state in xrange(state_count):
+    for state in range(state_count):
         inverted[state] = list(_invert_state(lookup_table, state))
 
     return inverted
@@ -95,6 +96,38 @@ def _invert_state(lookup_table, goal_state):
                 yield state
 
 
+def collapse_lookup_table(lookup_table):
+    """Collapses every two steps of a trellis into one radix-4 step with four
+    branches per state. Inputs of the returned table are tuples of two input
+    bits and its outputs are the outputs of both steps concatenated.
+
+    Returns a dict of dicts of tuples in the following structure:
+        table[current_state][(input, input)] -> (output, next_state)
+    """
+    collapsed = {}
+    for state in lookup_table:
+        collapsed[state] = {}
+        for first in lookup_table[state]:
+            first_output, middle_state = lookup_table[state][first]
+            for second in lookup_table[middle_state]:
+                second_output, next_state = lookup_table[middle_state][second]
+                collapsed[state][first, second] = (first_output + second_output, next_state)
+
+        next_states = [next_state for output, next_state in collapsed[state].values()]
+        if len(set(next_states)) != len(next_states):
+            raise ValueError("Two-step paths from state {} merge; "
+                             "collapsing needs a code memory of at least 2.".format(state))
+
+    return collapsed
+
+
+def input_bits(i):
+    """Returns the input bits of a lookup table input as a tuple, which is
+    either an input bit or a tuple of them (see collapse_lookup_table).
+    """
+    return i if isinstance(i, tuple) else (i,)
+
+
 def hamming_distance(list_a, list_b):
     """Calculates the Hamming distance between two sequences.
     Hamming distance between two strings of equal length is the number of
@@ -106,18 +139,47 @@ def hamming_distance(list_a, list_b):
         raise ValueError("Empty sequence.")
 
     diff_count = 0
-    for a, b in izip(list_a, list_b):
+    for a, b in zip(list_a, list_b):
         if a != b:
             diff_count += 1
 
     return diff_count
 
 
-def generate_random(length):    # pragma: no cover
+def generate_random(length, rng=random):    # pragma: no cover
     """Generates a list of random values of ones and zeroes.
+
+    Parameters:
+    length -- number of values.
+    rng -- a random.Random object (or the random module) to draw from.
+    """
+    if not length:
+        return []
+
+    bits = format(rng.getrandbits(length), "0{}b".format(length))
+    return [int(bit) for bit in bits]
+
+
+def derive_seed(*keys):
+    """Derives a 64-bit seed from a sequence of numbers, e.g.
+    (run seed, specimen id, Eb/N0 point, frame). Seeds of different key
+    sequences are unrelated, so random streams seeded with them are
+    independent no matter in which process or order they are drawn.
+    """
+    digest = hashlib.sha256(repr(keys).encode("ascii")).digest()
+    return int(binascii.hexlify(digest[:8]), 16)
+
+
+def make_rng(*keys):
+    """Returns a random.Random object seeded by derive_seed(*keys).
+    """
+    return random.Random(derive_seed(*keys))
+
+
+def new_seed():
+    """Returns a fresh 63-bit seed from the operating system's entropy.
     """
-    values = (0, 1)
-    return (random.choice(values) for i in xrange(length))
+    return random.SystemRandom().getrandbits(63)
 
 
 def normalize(iterable):
@@ -154,7 +216,7 @@ def multiplexed(*sequences):
     """Returns a list of multiplexed iterables. If iterables are of uneven
     length, missing values are filled in with None.
     """
-    return list(chain(*izip_longest(*sequences, fillvalue=None)))
+    return list(chain(*zip_longest(*sequences, fillvalue=None)))
 
 
 def nth(iterable, n, default=None):
@@ -0,0 +1,182 @@
+import json
+import math
+import numbers
+import os
+import random
+import weakref
+
+# Live interleavers by (class, permutation, attributes), see Interleaver.__new__:
+_interned = weakref.WeakValueDictionary()
+
+
+class Interleaver(object):
+    """A generic interleaver class that uses a permutation table to
+    interleave a sequence of bits.
+
+    Interleavers are immutable and interned: constructing one with the same
+    permutation as a live interleaver returns that instance, so encoders,
+    decoders and specimens (also when unpickled in workers) share one
+    instance and its permutation is validated and inverted only once. The
+    permutations are tuples and attributes cannot be set or deleted, so no
+    user of a shared instance can change it for the others.
+    """
+
+    def interleave(self, sequence):
+        return self._interleave(self.permutation, sequence)
+
+    def deinterleave(self, sequence):
+        return self._interleave(self.inverted_permutation, sequence)
+
+    def _interleave(self, permutation, sequence):
+        """Returns a list representing the interleaved sequence.
+
+        Parameters:
+        permutation -- the permutation describing interleaving method.
+        sequence -- an iterable to interleave.
+        """
+        if len(sequence) != len(permutation):
+            raise ValueError("Sequence length is not equal to frame length.")
+
+        interleaved_sequence = [None] * len(sequence)
+        for i, value in zip(permutation, sequence):
+            interleaved_sequence[i] = value
+
+        return interleaved_sequence
+
+    @classmethod
+    def _is_permutation(self, iterable):
+        """Checks if a given iterable is a permutation of numbers from 0 to N+1.
+        Returns boolean.
+        """
+        return self._invert_permutation(iterable) is not None
+
+    @classmethod
+    def _invert_permutation(self, permutation):
+        """Returns a tuple of the inverse permutation, or None if permutation
+        is not a permutation of range(len(permutation)). Validates and inverts
+        in a single linear pass.
+        """
+        length = len(permutation)
+        inverted_permutation = [None] * length
+        for i, position in enumerate(permutation):
+            if not (isinstance(position, numbers.Integral) and 0 <= position < length) or \
+                    inverted_permutation[position] is not None:
+                return None
+            inverted_permutation[position] = i
+
+        return tuple(inverted_permutation)
+
+    @classmethod
+    def _intern(cls, permutation, **attributes):
+        """Returns the live interleaver of the class with the permutation and
+        attributes, creating it if there is none.
+        """
+        permutation = tuple(permutation)
+        key = cls, permutation, tuple(sorted(attributes.items()))
+        interleaver = _interned.get(key)
+        if interleaver is None:
+            inverted_permutation = cls._invert_permutation(permutation)
+            if inverted_permutation is None:
+                raise ValueError("Parameter permutation is not valid.")
+
+            interleaver = object.__new__(cls)
+            interleaver.__dict__.update(attributes, permutation=permutation,
+                                        inverted_permutation=inverted_permutation)
+            _interned[key] = interleaver
+
+        return interleaver
+
+    def __new__(cls, permutation):
+        return cls._intern(permutation)
+
+    def __reduce__(self):
+        return Interleaver, (self.permutation,)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} objects are immutable.".format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("{} objects are immutable.".format(type(self).__name__))
+
+    def __init__(self, permutation):
+        """Initializes the interleaver.
+
+        Parameters:
+        permutation -- an iterable of number from 0 to N where N+1 is the size
+            of frame and the interleaver. It is stored as a tuple.
+        """
+
+    def __len__(self):
+        return len(self.permutation)
+
+
+class BlockInterleaver(Interleaver):
+    @classmethod
+    def _create_block_permutation(self, w, h):
+        positions = range(w * h)
+        permutation = [None] * len(positions)
+        for i, value in enumerate(positions):
+            permutation[i // h + w * (i % h)] = value
+
+        return permutation
+
+    def __new__(cls, width, height):
+        return cls._intern(cls._create_block_permutation(width, height), width=width, height=height)
+
+    def __reduce__(self):
+        return BlockInterleaver, (self.width, self.height)
+
+    def __init__(self, width, height):
+        pass
+
+    def __len__(self):
+        return self.width * self.height
+
+
+def lexicographic_permutation(length, index):
+    """Returns the index-th (counting from 0) permutation of range(length) in
+    lexicographic order, without enumerating the preceding ones. Small
+    indices only permute the last few positions.
+    """
+    tail = 1
+    while tail < length and math.factorial(tail) <= index:
+        tail += 1
+    if math.factorial(tail) <= index:
+        raise ValueError("There are fewer than {} permutations of {} elements.".format(index + 1, length))
+
+    permutation = list(range(length - tail))
+    remaining = list(range(length - tail, length))
+    for i in range(tail, 0, -1):
+        position, index = divmod(index, math.factorial(i - 1))
+        permutation.append(remaining.pop(position))
+
+    return permutation
+
+
+def from_spec(spec, frame_length=None, directory=""):
+    """Creates an interleaver from a textual specification:
+        block:WIDTHxHEIGHT -- a BlockInterleaver;
+        lexicographic:K -- the K-th lexicographic permutation of the frame;
+        random:SEED -- a random permutation of the frame;
+        anything else -- a path to a JSON permutation file.
+
+    Parameters:
+    frame_length -- the frame length, required by lexicographic and random
+        interleavers.
+    directory -- the directory relative paths are resolved against.
+    """
+    kind, _, argument = spec.partition(":")
+    if kind == "block":
+        width, height = map(int, argument.split("x"))
+        return BlockInterleaver(width, height)
+    elif kind in ("lexicographic", "random"):
+        if frame_length is None:
+            raise ValueError("Interleaver {!r} requires a frame length.".format(spec))
+        if kind == "lexicographic":
+            return Interleaver(lexicographic_permutation(frame_length, int(argument)))
+        permutation = list(range(frame_length))
+        random.Random(int(argument)).shuffle(permutation)
+        return Interleaver(permutation)
+
+    with open(os.path.join(directory, spec), "r") as f:
+        return Interleaver(json.load(f))
@@ -0,0 +1,119 @@
+"""Compiled MAP decoding kernels for single frames.
+
+The forward, backward and LLR recursions run as explicit loops over typed
+arrays of a batch_decode.Trellis, which Numba compiles to machine code when
+it is installed. Without Numba the same loops run interpreted (slowly), so
+the module can still be imported and checked; decode only selects this
+backend automatically when AVAILABLE is True.
+"""
+import math
+
+import numpy as np
+
+from . import batch_decode
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+AVAILABLE = numba is not None
+
+
+def _jit(func):
+    return numba.njit(cache=True)(func) if AVAILABLE else func
+
+
+@_jit
+def _add_logs(a, b):
+    """Returns log(exp(a) + exp(b)).
+    """
+    if a < b:
+        a, b = b, a
+    if b == -np.inf:
+        return a
+    return a + math.log1p(math.exp(b - a))
+
+
+@_jit
+def _forward(from_state, incoming, gammas, alphas):
+    for k in range(gammas.shape[0]):
+        top = -np.inf
+        for state in range(incoming.shape[0]):
+            alpha = -np.inf
+            for d in range(incoming.shape[1]):
+                branch = incoming[state, d]
+                alpha = _add_logs(alpha, alphas[k, from_state[branch]] + gammas[k, branch])
+            alphas[k + 1, state] = alpha
+            top = max(top, alpha)
+
+        for state in range(incoming.shape[0]):
+            alphas[k + 1, state] -= top
+
+
+@_jit
+def _backward(to_state, outgoing, gammas, betas):
+    for k in range(gammas.shape[0] - 1, -1, -1):
+        top = -np.inf
+        for state in range(outgoing.shape[0]):
+            beta = -np.inf
+            for d in range(outgoing.shape[1]):
+                branch = outgoing[state, d]
+                beta = _add_logs(beta, betas[k + 1, to_state[branch]] + gammas[k, branch])
+            betas[k, state] = beta
+            top = max(top, beta)
+
+        for state in range(outgoing.shape[0]):
+            betas[k, state] -= top
+
+
+@_jit
+def _llrs(from_state, to_state, input_bits, gammas, alphas, betas, llrs):
+    input_len = input_bits.shape[1]
+    for k in range(gammas.shape[0]):
+        for j in range(input_len):
+            ones = -np.inf
+            zeros = -np.inf
+            for branch in range(gammas.shape[1]):
+                metric = alphas[k, from_state[branch]] + gammas[k, branch] + \
+                    betas[k + 1, to_state[branch]]
+                if input_bits[branch, j]:
+                    ones = _add_logs(ones, metric)
+                else:
+                    zeros = _add_logs(zeros, metric)
+            llrs[k * input_len + j] = ones - zeros
+
+
+def maximum_a_posteriori(
+        lookup_table,
+        noisy_sequence,
+        channel_reliability,
+        normalize=False,
+        extrinsic=None,
+        radix=2):
+    """Calculates log-likelihood ratios like decode.maximum_a_posteriori,
+    whose parameters it takes. Metrics are always kept in the log domain, so
+    normalize has no effect.
+
+    Returns a list of floats.
+    """
+    trellis = batch_decode.cached_trellis(lookup_table, radix)
+    gammas, padding = batch_decode.branch_metrics(
+        trellis, [noisy_sequence], channel_reliability, [extrinsic] if extrinsic else None)
+    gammas = gammas[0]
+    steps = gammas.shape[0]
+
+    alphas = np.empty((steps + 1, trellis.state_count))
+    alphas[0] = -np.inf
+    alphas[0, trellis.zero_state] = 0
+    _forward(trellis.from_state, trellis.incoming, gammas, alphas)
+
+    betas = np.empty((steps + 1, trellis.state_count))
+    betas[steps] = -np.inf
+    betas[steps, trellis.zero_state] = 0
+    _backward(trellis.to_state, trellis.outgoing, gammas, betas)
+
+    llrs = np.empty(steps * trellis.input_len)
+    _llrs(trellis.from_state, trellis.to_state, trellis.input_bits, gammas, alphas, betas, llrs)
+
+    return llrs[padding:].tolist()
@@ -1,6 +1,9 @@
 # Lookup table is a dict of dicts of tuples in the following structure:
 #     table[current_state][input] -> (output, next_state)
 # Output must be a tuple.
+#
+# Tables of other codes can be built from generator polynomials, see codes.
+from . import codes
 
 gzl_convo213 = {
     0: {0: ((0, 0), 0), 1: ((1, 0), 2)},
@@ -49,6 +52,7 @@ gzl_rsc213b = {     # Significantly better than gzl_rsc213a
     6: {0: ((0, 0), 3), 1: ((1, 1), 7)},
     7: {0: ((0, 0), 7), 1: ((1, 1), 3)},
 }
+gzl_rsc213 = gzl_rsc213b
 
 
 # A convolutional code from "From BCJR to Turbo" by Abrantes
@@ -79,3 +83,6 @@ jordan_nichols_rsc = {
     14: {0: ((0, 0), 15), 1: ((1, 1), 7)},
     15: {0: ((0, 1), 7), 1: ((1, 0), 15)},
 }
+
+# The 8-state constituent code of the UMTS and LTE turbo codes
+umts_rsc = codes.recursive_systematic(13, 15)
@@ -0,0 +1,182 @@
+"""Gray-mapped QAM modulation and soft demapping with NumPy.
+
+Constellations have unit average symbol energy, so ebn0 keeps meaning the
+signal-to-noise ratio per channel symbol (E_s / N_0) as in the channel
+module, with noise of variance N_0 / 2 per real dimension. Demappers return
+log-likelihood ratios log(P(b = 1) / P(b = 0)) of the coded bits, which the
+decoders take with a channel reliability of 1.
+
+Mapping and demapping work on arrays of any leading shape, e.g.
+(frames, symbols), so a batch of frames is processed at once.
+"""
+
+import numpy as np
+
+from . import channel
+
+BITS_PER_SYMBOL = {"bpsk": 1, "qpsk": 2, "16qam": 4, "64qam": 6}
+# Constellations where every bit sees the same channel whatever the other
+# bits of its symbol are, so the all-zero codeword is representative:
+SYMMETRIC = ("bpsk", "qpsk")
+DEMAPPERS = ("max-log", "exact")
+
+
+class Constellation(object):
+    """A Gray-mapped square QAM constellation, or BPSK. points[label] is the
+    symbol of a label, the number whose binary digits (most significant
+    first) are the symbol's bits. The first half of the bits selects the
+    in-phase and the second half the quadrature amplitude. BPSK maps 0 to -1
+    and 1 to +1 like helpers.modulate.
+    """
+
+    @property
+    def symmetric(self):
+        """Whether error rates do not depend on the transmitted bits (see
+        SYMMETRIC). On larger QAM constellations the all-zero codeword
+        always maps to the same corner point, which is farther from the
+        other points than average.
+        """
+        return self.name in SYMMETRIC
+
+    def modulate(self, bits):
+        """Returns an array of complex symbols.
+
+        Parameters:
+        bits -- an array of values 0 or 1 whose last dimension is a
+            multiple of bits_per_symbol.
+        """
+        bits = np.asarray(bits, dtype=np.intp)
+        shape = bits.shape[:-1] + (bits.shape[-1] // self.bits_per_symbol, self.bits_per_symbol)
+        return self.points[bits.reshape(shape) @ self._weights]
+
+    def demodulate(self, symbols, noise_variance, demapper="max-log"):
+        """Returns an array of LLRs, bits_per_symbol per symbol.
+
+        Parameters:
+        symbols -- an array of received complex symbols.
+        noise_variance -- N_0, the variance of the complex noise (twice the
+            variance per real dimension), either a number or an array of the
+            symbols' shape.
+        demapper -- "exact" sums the likelihoods of all the symbols with a
+            bit set and cleared, "max-log" only takes the closest ones.
+        """
+        if demapper not in DEMAPPERS:
+            raise ValueError("Unknown demapper {!r}, expected one of: {}.".format(demapper, ", ".join(DEMAPPERS)))
+
+        symbols = np.asarray(symbols)
+        metrics = -np.abs(symbols[..., None] - self.points) ** 2 / np.asarray(noise_variance)[..., None]
+
+        llrs = np.empty(symbols.shape + (self.bits_per_symbol,))
+        for j, ones in enumerate(self._ones):
+            if demapper == "max-log":
+                llrs[..., j] = metrics[..., ones].max(-1) - metrics[..., ~ones].max(-1)
+            else:
+                llrs[..., j] = (np.logaddexp.reduce(metrics[..., ones], -1) -
+                                np.logaddexp.reduce(metrics[..., ~ones], -1))
+
+        return llrs.reshape(symbols.shape[:-1] + (-1,))
+
+    def __init__(self, name):
+        """Parameters:
+        name -- one of the BITS_PER_SYMBOL keys.
+        """
+        if name not in BITS_PER_SYMBOL:
+            raise ValueError("Unknown constellation {!r}, expected one of: {}.".format(
+                name, ", ".join(BITS_PER_SYMBOL)))
+
+        self.name = name
+        self.bits_per_symbol = k = BITS_PER_SYMBOL[name]
+
+        if k == 1:
+            self.points = np.array([-1, 1], dtype=complex)
+        else:
+            levels = 2 ** (k // 2)
+            amplitudes = np.empty(levels)
+            for position in range(levels):
+                amplitudes[position ^ (position >> 1)] = 2 * position - (levels - 1)
+            amplitudes /= np.sqrt(2 * (levels ** 2 - 1) / 3)
+
+            labels = np.arange(2 ** k)
+            self.points = amplitudes[labels >> (k // 2)] + 1j * amplitudes[labels % levels]
+
+        self._weights = 2 ** np.arange(k - 1, -1, -1)
+        self._ones = [(np.arange(2 ** k) >> (k - 1 - j)) & 1 == 1 for j in range(k)]
+
+
+class Modem(object):
+    """Maps coded bits to a constellation and demaps received symbols to
+    LLRs, optionally through a random bit interleaver (bit-interleaved coded
+    modulation), which spreads the bits of a symbol, whose reliabilities
+    differ, over the codeword.
+
+    Codewords are padded with zeros to a whole number of symbols; the LLRs of
+    the padding are dropped.
+    """
+
+    def transmit(self, values, ebn0, rng):
+        """Sends a codeword over the AWGN channel. Returns a list of LLRs.
+
+        Parameters:
+        values -- BPSK values of the coded bits (see helpers.modulaten).
+        ebn0 -- signal-to-noise ratio per channel symbol in decibels.
+        rng -- a random.Random object the noise is drawn from.
+        """
+        symbols = self.modulate(values)
+        noise = self.unit_noise(len(symbols), rng)
+
+        return self.receive(symbols + channel.noise_sigma(ebn0) * noise, ebn0, len(values))
+
+    def modulate(self, values):
+        """Returns an array of the symbols of a codeword given as BPSK values.
+        """
+        bits = (np.asarray(values) > 0).astype(np.intp)
+        if self.bit_interleaver is not None:
+            interleaved = np.empty_like(bits)
+            interleaved[self._permutation(len(bits))] = bits
+            bits = interleaved
+
+        padding = -len(bits) % self.constellation.bits_per_symbol
+        return self.constellation.modulate(np.concatenate([bits, np.zeros(padding, np.intp)]))
+
+    def unit_noise(self, count, rng):
+        """Returns an array of count complex noise samples of unit variance
+        per real dimension, seeded from rng.
+        """
+        generator = np.random.default_rng(rng.getrandbits(64))
+        return generator.standard_normal(count) + 1j * generator.standard_normal(count)
+
+    def receive(self, symbols, ebn0, length, gains=None, noise_scales=None):
+        """Returns a list of the LLRs of the first length coded bits of the
+        received symbols.
+
+        Parameters:
+        gains, noise_scales -- known per-symbol channel states (see the
+            channel_models module), if any. Symbols are divided by their
+            gains before demapping.
+        """
+        noise_variance = 2 * channel.noise_sigma(ebn0) ** 2
+        if gains is not None:
+            symbols = symbols / gains
+            noise_variance = noise_variance * (noise_scales / gains) ** 2
+        llrs = self.constellation.demodulate(symbols, noise_variance, self.demapper)[:length]
+        if self.bit_interleaver is not None:
+            llrs = llrs[self._permutation(length)]
+
+        return llrs.tolist()
+
+    def _permutation(self, length):
+        return np.random.default_rng(self.bit_interleaver).permutation(length)
+
+    def __init__(self, constellation, demapper="max-log", bit_interleaver=None):
+        """Parameters:
+        constellation -- a BITS_PER_SYMBOL key.
+        demapper -- see Constellation.demodulate.
+        bit_interleaver -- the seed of a random bit interleaver, or None
+            to map the coded bits in order.
+        """
+        if demapper not in DEMAPPERS:
+            raise ValueError("Unknown demapper {!r}, expected one of: {}.".format(demapper, ", ".join(DEMAPPERS)))
+
+        self.constellation = Constellation(constellation)
+        self.demapper = demapper
+        self.bit_interleaver = bit_interleaver
@@ -0,0 +1,88 @@
+import itertools
+import json
+import os
+import sys
+
+from . import results
+
+
+def parse_json(json_string):
+    """
+    """
+    data = json.loads(json_string)
+    return data
+
+
+def plot_ber(ber_curve_list):
+    """Plots given BER curves.
+
+    Parameters:
+    ber_curve_list -- a list of tuples (snr_list, ber_list, labels) where
+        snr_list is a list of SNR points (horizontal axis) and
+        ber_list is a list of BER points (vertical axis).
+    """
+    import matplotlib.pyplot as plt
+
+    marker = itertools.cycle("sd^ovD")
+    style = lambda: "-" + next(marker)
+
+    for snr_list, ber_list, label in ber_curve_list:
+        plt.semilogy(snr_list, ber_list, style(), label=label)
+
+    plt.xlabel('Eb/N0 (dB)')
+    plt.ylabel('BER')
+    plt.grid(True, which="both")
+    plt.legend()
+
+    plt.show()
+
+
+def parse_file(path):
+    with open(path, "r") as source:
+        json_string = source.read()
+    return parse_json(json_string)
+
+
+def find_file(id):
+    out_folder = os.path.abspath("out")
+    file_names = os.listdir(out_folder)
+    file_names = [x for x in file_names if x.startswith(id)]
+    if file_names:
+        return os.path.join(os.path.abspath("out"), file_names[0])
+
+    return id
+
+
+def query_store(path, patterns):
+    """Returns BER curves of the configurations in a results store whose
+    hash starts with (or description contains) any of the patterns.
+    """
+    store = results.ResultsStore(path)
+    try:
+        hashes = []
+        for pattern in patterns or [""]:
+            hashes += [h for h, description in store.find(pattern) if h not in hashes]
+        return [store.curve(h) for h in hashes]
+    finally:
+        store.close()
+
+if __name__ == '__main__':
+    if sys.argv[1].endswith(".db"):
+        ber_curves = query_store(sys.argv[1], sys.argv[2:])
+    else:
+        path = find_file(sys.argv[1])
+
+        data = parse_file(path)
+
+        ber_curves = []
+        for result in data["results"]:
+            for iteration, summary in enumerate(result.get("iterations") or []):
+                ber_curves.append((result["ebn0s"], summary["bers"],
+                                   "{} [iteration {}]".format(result["description"], iteration + 1)))
+            if not result.get("iterations"):
+                ber_curves.append((result["ebn0s"], result["bers"], result["description"]))
+
+    try:
+        plot_ber(ber_curves)
+    except KeyboardInterrupt:
+        pass
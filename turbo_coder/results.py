@@ -0,0 +1,208 @@
+import collections
+import datetime
+import hashlib
+import json
+import sqlite3
+import types
+import uuid
+
+# Keys of a configuration that describe what is simulated (or recorded)
+# rather than the simulated system itself; they do not take part in the
+# configuration hash.
+_NON_HASHED_KEYS = ("description", "ebn0s", "repeat_count", "capture", "per_iteration")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created TEXT,
+    info TEXT
+);
+CREATE TABLE IF NOT EXISTS configs (
+    config_hash TEXT PRIMARY KEY,
+    description TEXT,
+    frame_length INTEGER
+);
+CREATE TABLE IF NOT EXISTS points (
+    run_id TEXT,
+    config_hash TEXT,
+    ebn0 REAL,
+    frames INTEGER,
+    bits INTEGER,
+    bit_errors INTEGER,
+    frame_errors INTEGER,
+    iterations TEXT,
+    elapsed REAL,
+    PRIMARY KEY (run_id, config_hash, ebn0)
+);
+CREATE INDEX IF NOT EXISTS points_by_config ON points (config_hash, ebn0);
+"""
+
+Point = collections.namedtuple('Point', ['ebn0', 'frames', 'bits', 'bit_errors', 'frame_errors', 'iterations', 'elapsed'])
+
+
+def config_hash(configuration):
+    """Returns a hex digest identifying a simulation configuration (a dict
+    of Specimen parameters). Eb/N0 points, repeat counts and the description
+    are not taken into account, so runs of the same system at different
+    points share the hash.
+
+    Functions are identified by their module, name and closure contents;
+    globals they refer to are not inspected.
+    """
+    hashed = dict((key, value) for key, value in configuration.items()
+                  if key not in _NON_HASHED_KEYS)
+    return hashlib.sha1(_canonical(hashed).encode("utf-8")).hexdigest()
+
+
+def _canonical(obj):
+    """Returns a string representation of obj that does not depend on
+    memory addresses or dict ordering.
+    """
+    if isinstance(obj, dict):
+        items = sorted((_canonical(key), _canonical(value)) for key, value in obj.items())
+        return "{" + ",".join("{}:{}".format(key, value) for key, value in items) + "}"
+    elif isinstance(obj, (list, tuple)):
+        return "[" + ",".join(_canonical(item) for item in obj) + "]"
+    elif isinstance(obj, types.FunctionType):
+        cells = [cell.cell_contents for cell in obj.__closure__ or ()]
+        return "{}.{}{}".format(obj.__module__, obj.__name__, _canonical(cells))
+    elif hasattr(obj, "__dict__"):
+        return "{}.{}{}".format(type(obj).__module__, type(obj).__name__, _canonical(vars(obj)))
+    else:
+        return repr(obj)
+
+
+def _merge_histograms(histograms):
+    total = collections.Counter()
+    for histogram in histograms:
+        if histogram:
+            total.update(dict((int(key), value) for key, value in json.loads(histogram).items()))
+
+    return dict(total) or None
+
+
+class ResultsStore(object):
+    """An SQLite store of simulated points. Every run appends one row per
+    (configuration hash, Eb/N0) point; queries sum the statistics of all runs,
+    so points simulated in separate (or partial) runs are combined.
+    """
+
+    def add_run(self, info):
+        """Records a run and returns its id.
+
+        Parameters:
+        info -- a JSON serializable dict describing the run.
+        """
+        run_id = uuid.uuid4().hex
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO runs VALUES (?, ?, ?)",
+                (run_id, datetime.datetime.now().isoformat(), json.dumps(info)))
+
+        return run_id
+
+    def add_config(self, config_hash, description, frame_length):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO configs VALUES (?, ?, ?)",
+                (config_hash, description, frame_length))
+
+    def add_point(self, run_id, config_hash, ebn0, frames, bits, bit_errors,
+                  frame_errors, elapsed, iterations=None):
+        """Appends statistics of a point.
+
+        Parameters:
+        iterations -- an optional dict of decoder iteration counts to the
+            number of frames decoded with that many iterations.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, config_hash, ebn0, frames, bits, bit_errors, frame_errors,
+                 json.dumps(iterations) if iterations else None, elapsed))
+
+    def add_results(self, run_id, results, config_hashes):
+        """Appends every simulated point of simcore.SampleResult objects.
+
+        Parameters:
+        config_hashes -- a list of configuration hashes, one per result.
+        """
+        for result, hashed in zip(results, config_hashes):
+            self.add_config(hashed, result.description, result.frame_length)
+            for i, ebn0 in enumerate(result.ebn0s):
+                if not result.frame_counts[i]:
+                    continue
+                self.add_point(
+                    run_id, hashed, ebn0,
+                    result.frame_counts[i],
+                    result.frame_counts[i] * result.frame_length,
+                    result.bit_errors[i],
+                    result.frame_errors[i],
+                    result.elapsed[i])
+
+    def merge(self, path):
+        """Copies runs, configurations and points of another store into this
+        one. Points already present are left unchanged, so merging the same
+        store twice has no effect.
+        """
+        # A database cannot be detached inside the transaction that used it:
+        self.connection.execute("ATTACH DATABASE ? AS other", (path,))
+        try:
+            with self.connection:
+                for table in ("runs", "configs", "points"):
+                    self.connection.execute(
+                        "INSERT OR IGNORE INTO {0} SELECT * FROM other.{0}".format(table))
+        finally:
+            self.connection.execute("DETACH DATABASE other")
+
+    def find(self, pattern=""):
+        """Returns a list of (config_hash, description) tuples of the
+        configurations whose hash starts with the pattern or whose description
+        contains it.
+        """
+        rows = self.connection.execute(
+            "SELECT config_hash, description FROM configs "
+            "WHERE config_hash LIKE ? OR description LIKE ? ORDER BY description",
+            (pattern + "%", "%" + pattern + "%"))
+
+        return rows.fetchall()
+
+    def points(self, config_hash):
+        """Returns a list of Point tuples of a configuration, with statistics
+        of all the runs summed up, sorted by Eb/N0.
+        """
+        rows = self.connection.execute(
+            "SELECT ebn0, SUM(frames), SUM(bits), SUM(bit_errors), SUM(frame_errors), "
+            "GROUP_CONCAT(iterations, '\n'), SUM(elapsed) "
+            "FROM points WHERE config_hash = ? GROUP BY ebn0 ORDER BY ebn0",
+            (config_hash,))
+
+        return [Point(ebn0, frames, bits, bit_errors, frame_errors,
+                      _merge_histograms((iterations or "").splitlines()), elapsed)
+                for ebn0, frames, bits, bit_errors, frame_errors, iterations, elapsed in rows]
+
+    def curve(self, config_hash):
+        """Returns a BER curve of a configuration as a tuple
+        (ebn0s, bers, description).
+        """
+        description = self.connection.execute(
+            "SELECT description FROM configs WHERE config_hash = ?",
+            (config_hash,)).fetchone()
+        points = self.points(config_hash)
+
+        return ([point.ebn0 for point in points],
+                [point.bit_errors / point.bits for point in points],
+                description[0] if description else config_hash)
+
+    def close(self):
+        self.connection.close()
+
+    def __init__(self, path):
+        """Opens (or creates) a store.
+
+        Parameters:
+        path -- the SQLite database file.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
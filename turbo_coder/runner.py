@@ -0,0 +1,70 @@
+"""Runs the simulations of a configuration file (see the config module).
+
+Usage:
+    turbo-sim CONFIG [--workers N] [--seed SEED] [--dry-run]
+    turbo-sim CONFIG --port PORT [--host HOST] [--local-workers N] [--authkey KEY]
+
+With --port the specimens are simulated by distributed workers (see the
+distributed module) instead of a local pool of processes.
+"""
+import argparse
+import multiprocessing
+import os
+
+from . import config
+from . import distributed
+from . import simcore
+
+
+def run(path, workers=None, seed=None, port=None, local_workers=0, dry_run=False, host=None, authkey=None):
+    """Runs the configuration file at path. Options other than None override
+    the ones of the file. Returns a list of simcore.SampleResult objects, or
+    the list of built configurations on a dry run.
+    """
+    configuration = config.load(path)
+    configurations = config.build_configurations(configuration, os.path.dirname(os.path.abspath(path)))
+
+    if workers is None:
+        workers = configuration.get("workers") or multiprocessing.cpu_count()
+    if seed is None:
+        seed = configuration.get("seed")
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    if dry_run:
+        for spec in configurations:
+            print("{:<40} {}".format(spec["description"], simcore.results_store.config_hash(spec)))
+        return configurations
+
+    if port is not None:
+        return distributed.verbose_coordinate(configurations, port, local_workers, authkey, seed=seed, name=name,
+                                              host=host or distributed.HOST)
+
+    return simcore.verbose_exec(configurations, workers, seed, name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Runs the simulations of a configuration file.")
+    parser.add_argument("config", help="a YAML or JSON configuration file")
+    parser.add_argument("--workers", type=int, help="number of processes (overrides the file)")
+    parser.add_argument("--seed", type=int, help="seed of the run (overrides the file)")
+    parser.add_argument("--port", type=int, help="serve chunks to distributed workers on this port")
+    parser.add_argument("--local-workers", type=int, default=0,
+                        help="distributed workers to start on this host (with --port)")
+    parser.add_argument("--host", help="interface to listen on (with --port), {} by default".format(
+        distributed.HOST))
+    parser.add_argument("--authkey", type=str.encode,
+                        help="the workers' key (with --port), by default {} or a random one".format(
+                            distributed.AUTHKEY_VARIABLE))
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only build the specimens and print their configuration hashes")
+    args = parser.parse_args(argv)
+
+    try:
+        run(args.config, args.workers, args.seed, args.port, args.local_workers, args.dry_run, args.host,
+            args.authkey)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
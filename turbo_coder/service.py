@@ -0,0 +1,299 @@
+"""Asynchronous turbo decoding service with micro-batching.
+
+Clients connect over TCP or a Unix socket and send one JSON request per
+line, e.g.
+    {"id": 1, "code": "gzl_rsc", "interleaver": "random:3", "frame_length": 1000,
+     "iterations": 4, "samples": [...], "ebn0": 1.5}
+with the fields:
+    id           -- any value, echoed in the response,
+    code         -- the constituent code (see config.build_table),
+    interleaver  -- see interleave.from_spec,
+    frame_length -- number of information bits,
+    iterations   -- number of decoding iterations (1 by default),
+    radix, algorithm -- see batch_decode.Trellis and
+        batch_decode.maximum_a_posteriori (2 and "log" by default),
+    samples      -- the received codeword, laid out as encode.TurboEncoder
+        outputs it,
+    ebn0         -- the signal-to-noise ratio of BPSK samples, or instead
+    reliability  -- the channel reliability, a number (e.g. 1 for LLRs) or a
+        list of per-sample ones,
+    llrs         -- true to also return the LLRs of the information bits.
+Responses are JSON lines {"id", "bits", "latency"} (and "llrs"), or
+{"id", "error"}, written as frames finish, so not necessarily in order.
+Samples of a length no codeword of the code can have (see
+dispatch.Dispatcher.codeword_lengths) are rejected with an error.
+A request {"stats": true} returns the queue depth and latency percentiles
+(see DecodingService.stats).
+
+Concurrent frames of the same signature (see the dispatch module) and
+length are decoded together on a pool of worker processes. A batch is
+dispatched once it has max_batch frames or its first frame has waited
+max_wait seconds, which bounds the latency batching adds.
+
+Usage:
+    python -m turbo_coder.service (--port 7000 | --unix PATH) [--workers 2]
+        [--max-batch 64] [--max-wait 0.002] [--directory DIR]
+"""
+from collections import deque
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import socket
+import time
+
+import numpy as np
+
+from . import batch_decode
+from . import channel
+from . import dispatch
+
+MAX_BATCH = 64
+MAX_WAIT = 0.002
+
+
+def percentile(values, fraction):
+    """Returns the nearest-rank percentile of a sorted list, or None if it
+    is empty.
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+class DecodingService(object):
+    """Collects frames into batches by signature and decodes them on an
+    executor.
+    """
+
+    async def decode(self, request):
+        """Decodes the frame of a request (see the module's docstring).
+        Returns the response dict. Raises ValueError and KeyError on invalid
+        requests, among them samples of the wrong length; these are checked
+        against the signature's trellis and interleaver, built once and kept
+        in the service's dispatcher cache.
+        """
+        arrival = time.time()
+        samples = np.asarray(request["samples"], dtype=float)
+        if "reliability" in request:
+            reliability = np.asarray(request["reliability"], dtype=float)
+        elif "ebn0" in request:
+            reliability = channel.reliability(request["ebn0"])
+        else:
+            raise ValueError("A request needs either ebn0 or reliability.")
+
+        key = (dispatch.signature(request["code"], request["interleaver"], request["frame_length"],
+                                  request.get("iterations", 1), request.get("radix", 2),
+                                  request.get("algorithm", "log"), self.directory),
+               len(samples))
+        self.dispatcher.check_length(*key)
+        future = asyncio.get_event_loop().create_future()
+        self._enqueue(key, samples * reliability, future)
+        llrs = await future
+
+        latency = time.time() - arrival
+        self.latencies.append(latency)
+        response = {"id": request.get("id"), "bits": batch_decode.hard_decisions(llrs).tolist(),
+                    "latency": latency}
+        if request.get("llrs"):
+            response["llrs"] = llrs.tolist()
+
+        return response
+
+    def stats(self):
+        """Returns a dict of the number of frames waiting for a batch
+        ("queued") and being decoded ("in_flight"), the decoded frames and
+        batches, the mean batch size and the latency percentiles in seconds
+        of the latest decoded frames.
+        """
+        latencies = sorted(self.latencies)
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "frames": self.frame_count,
+            "batches": self.batch_count,
+            "mean_batch_size": self.frame_count / self.batch_count if self.batch_count else None,
+            "latency": {name: percentile(latencies, fraction)
+                        for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))},
+        }
+
+    async def handle(self, reader, writer):
+        """Serves a connection until the client closes it.
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, line, writer, lock):
+        request = {}
+        try:
+            request = json.loads(line.decode("utf-8"))
+            if request.get("stats"):
+                response = dict(self.stats(), id=request.get("id"))
+            else:
+                response = await self.decode(request)
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            response = {"id": request.get("id") if isinstance(request, dict) else None,
+                        "error": "{}: {}".format(type(e).__name__, e)}
+
+        async with lock:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    def _enqueue(self, key, llrs, future):
+        batch = self._batches.setdefault(key, [])
+        batch.append((llrs, future))
+        self.queued += 1
+
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = asyncio.get_event_loop().call_later(self.max_wait, self._flush, key)
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        batch = self._batches.pop(key, None)
+        if batch:
+            self.queued -= len(batch)
+            self.in_flight += len(batch)
+            asyncio.ensure_future(self._run(key, batch))
+
+    async def _run(self, key, batch):
+        futures = [future for llrs, future in batch]
+        try:
+            llrs = await asyncio.get_event_loop().run_in_executor(
+                self.executor, dispatch.decode_bucket, key[0], np.array([llrs for llrs, future in batch]))
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(ValueError("Decoding failed: {}".format(e)))
+        else:
+            for future, frame_llrs in zip(futures, llrs):
+                if not future.done():
+                    future.set_result(frame_llrs)
+        finally:
+            self.in_flight -= len(batch)
+            self.frame_count += len(batch)
+            self.batch_count += 1
+
+    def __init__(self, workers=1, max_batch=MAX_BATCH, max_wait=MAX_WAIT, directory="", history=10000):
+        """Parameters:
+        workers -- number of decoding processes, or 0 to decode in a thread
+            of this process.
+        max_batch -- maximum number of frames decoded together.
+        max_wait -- maximum time in seconds a frame waits for its batch to
+            fill.
+        directory -- the directory relative interleaver paths are resolved
+            against.
+        history -- number of latest frames the latency percentiles cover.
+        """
+        if workers:
+            self.executor = concurrent.futures.ProcessPoolExecutor(workers)
+        else:
+            self.executor = concurrent.futures.ThreadPoolExecutor(1)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.directory = directory
+        self.dispatcher = dispatch.Dispatcher()
+
+        self.latencies = deque(maxlen=history)
+        self.queued = 0
+        self.in_flight = 0
+        self.frame_count = 0
+        self.batch_count = 0
+        self._batches = {}
+        self._timers = {}
+
+
+class Client(object):
+    """A blocking client of a decoding service, for scripts and tests.
+    """
+
+    def decode(self, **request):
+        """Sends a request (see the module's docstring) and returns the
+        response dict.
+        """
+        return self._call(request)
+
+    def stats(self):
+        return self._call({"stats": True})
+
+    def _call(self, request):
+        self.file.write(json.dumps(request).encode("utf-8") + b"\n")
+        self.file.flush()
+        return json.loads(self.file.readline().decode("utf-8"))
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __init__(self, address):
+        """Parameters:
+        address -- a (host, port) tuple or the path of a Unix socket.
+        """
+        if isinstance(address, str):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(address)
+        else:
+            self.socket = socket.create_connection(address)
+        self.file = self.socket.makefile("rwb")
+
+
+async def serve(service, port=None, unix=None, host="localhost", stats_interval=None):
+    """Serves the service on a TCP port or a Unix socket until cancelled.
+    """
+    if unix:
+        server = await asyncio.start_unix_server(service.handle, unix)
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+    print("Serving on", ", ".join(str(s.getsockname()) for s in server.sockets), flush=True)
+
+    try:
+        while True:
+            await asyncio.sleep(stats_interval or 3600)
+            if stats_interval:
+                print(json.dumps(service.stats()), flush=True)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serves turbo decoding over a socket.")
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--port", type=int, help="TCP port to listen on")
+    address.add_argument("--unix", help="path of a Unix socket to listen on")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--workers", type=int, default=1, help="decoding processes, 0 for a thread")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait", type=float, default=MAX_WAIT, help="seconds")
+    parser.add_argument("--directory", default="", help="directory of interleaver files")
+    parser.add_argument("--stats-interval", type=float, help="print stats every so many seconds")
+    args = parser.parse_args()
+
+    service = DecodingService(args.workers, args.max_batch, args.max_wait, args.directory)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(serve(service, args.port, args.unix, args.host, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown()
+        loop.close()
@@ -0,0 +1,965 @@
+from collections import namedtuple
+from collections.abc import Iterable
+from pprint import pprint, pformat
+
+import array
+import copy
+import datetime
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import types
+import uuid
+from multiprocessing import shared_memory
+
+from . import channel
+from . import helpers
+from . import results as results_store
+
+
+# iterations is None, or with per-iteration decisions a list of dicts of the
+# "bers", "bit_errors" and "frame_errors" per point after every iteration:
+SampleResult = namedtuple('SampleResult', ['ebn0s', 'bers', 'description', 'frame_length', 'repeat_count',
+                                           'frame_counts', 'bit_errors', 'frame_errors', 'elapsed', 'seed',
+                                           'variances', 'iterations'], defaults=[None])
+SpecimenStatus = namedtuple('SpecimenStatus', ['id', 'status', 'progress', 'current_estimate'])
+# A point stops once it has min_errors bit errors and the confidence interval
+# of its BER estimate is narrower than relative_error times the estimate:
+StoppingRule = namedtuple('StoppingRule', ['confidence', 'relative_error', 'min_errors'])
+
+STORE_PATH = os.path.join("out", "results.db")
+
+# Status codes: not started, running, finished.
+STATUS_CODES = "NRF"
+
+# Set in pool workers by _init_worker:
+_progress = None
+_statistics = None
+
+
+_discrete_time = lambda: int(time.time() * 5)
+_minutes_time = lambda: int(time.time()) // 60
+_spinner = lambda: "-\\|/"[_discrete_time() % 4]
+
+
+class SharedArray(object):
+    """A two-dimensional array of numbers in a multiprocessing.shared_memory
+    block. Pickling it only pickles a descriptor (the block's name, shape and
+    type code) and unpickling attaches to the same block, so processes it is
+    passed to read and write the rows in place instead of copying them. Only
+    the creating process unlinks the block.
+    """
+
+    def row(self, index):
+        """Returns a list of the values of a row.
+        """
+        columns = self.shape[1]
+        return self.view[index * columns:(index + 1) * columns].tolist()
+
+    def set_row(self, index, values):
+        columns = self.shape[1]
+        self.view[index * columns:(index + 1) * columns] = array.array(self.typecode, values)
+
+    def close(self):
+        """Detaches from the block, and unlinks it in the creating process.
+        """
+        self.view.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __reduce__(self):
+        return SharedArray, (self.shape, self.typecode, self.memory.name)
+
+    def __init__(self, shape, typecode="d", name=None):
+        """Creates a zeroed block, or attaches to an existing one.
+
+        Parameters:
+        shape -- a tuple (rows, columns).
+        typecode -- an array module type code of the values.
+        name -- the name of the block to attach to, or None to create one.
+        """
+        self.shape = tuple(shape)
+        self.typecode = typecode
+        self.owner = name is None
+        size = self.shape[0] * self.shape[1] * array.array(typecode).itemsize
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            self.memory.buf[:size] = bytes(size)
+        else:
+            self.memory = shared_memory.SharedMemory(name)
+        self.view = self.memory.buf[:size].cast(typecode)
+
+
+class ProgressCounters(object):
+    """Progress counters of specimens kept in shared memory. Every specimen
+    owns a slot of FIELDS that only it writes, so no locking is done; the
+    parent only reads the slots and may occasionally see a half updated one,
+    which is fine for displaying progress.
+    """
+    FIELDS = ('status', 'point', 'point_frames', 'point_errors')
+
+    def update(self, spec_id, status, point, point_frames, point_errors):
+        self.array.set_row(spec_id, [STATUS_CODES.index(status), point, point_frames, point_errors])
+
+    def read(self, specimen):
+        """Returns a SpecimenStatus of the given specimen.
+        """
+        status, point, point_frames, point_errors = self.array.row(specimen.id)
+
+        bits = point_frames * specimen.frame_length
+        return SpecimenStatus(
+            specimen.id,
+            STATUS_CODES[status],
+            specimen.get_progress(point, point_frames),
+            point_errors / bits if bits else 0.0)
+
+    def close(self):
+        self.array.close()
+
+    def __init__(self, specimen_count):
+        self.array = SharedArray((specimen_count, len(self.FIELDS)), "q")
+
+
+class PointStatistics(object):
+    """Running totals of FIELDS of every Eb/N0 point of every specimen, kept
+    in shared memory. Workers update the rows of their specimen's points in
+    place as frames are decoded, and the parent reads all points at any time
+    without the workers sending them (e.g. to log the points of running
+    specimens). Like ProgressCounters, a row has a single writer and reads
+    are not locked.
+    """
+    FIELDS = ('frames', 'bit_errors', 'frame_errors', 'squared_errors', 'elapsed')
+
+    def update(self, spec_id, point, frames, bit_errors, frame_errors, squared_errors, elapsed):
+        self.array.set_row(self.offsets[spec_id] + point,
+                           [frames, bit_errors, frame_errors, squared_errors, elapsed])
+
+    def read(self, specimen):
+        """Returns a list of dicts of FIELDS and the BER estimate, one per
+        Eb/N0 point of the specimen.
+        """
+        points = []
+        for point in range(len(specimen.ebn0s)):
+            totals = dict(zip(self.FIELDS, self.array.row(self.offsets[specimen.id] + point)))
+            bits = totals["frames"] * specimen.frame_length
+            totals["ber"] = totals["bit_errors"] / bits if bits else 0.0
+            points.append(totals)
+
+        return points
+
+    def close(self):
+        self.array.close()
+
+    def __init__(self, specimens):
+        """Parameters:
+        specimens -- the Specimen objects of the run, whose ids index them.
+        """
+        self.offsets = {}
+        row_count = 0
+        for spec in specimens:
+            self.offsets[spec.id] = row_count
+            row_count += len(spec.ebn0s)
+
+        self.array = SharedArray((row_count, len(self.FIELDS)), "d")
+
+
+class Specimen(object):
+    def samplen(self):
+        """Samples the Eb/N0 points one after another (or all at once, see
+        sweepn). A point sends repeat_count frames, fewer if the stopping rule
+        is met earlier. Returns a SampleResult.
+        """
+        if self.sweep:
+            return self.sweepn()
+
+        for point, (ebn0, repeat) in enumerate(zip(self.ebn0s, self.repeat_count)):
+            self.curr_point = point
+            start_time = time.time()
+
+            error_count = 0
+            frame_error_count = 0
+            squared_error_count = 0
+            for i in range(repeat):
+                self.current_frame = i + 1
+
+                iteration_errors, weight = self.sample_iterations(ebn0, self.frame_rng(point, i))
+                self.add_iteration_errors(point, iteration_errors, weight)
+                errors = iteration_errors[-1] * weight
+                error_count += errors
+                frame_error_count += weight if errors else 0
+                squared_error_count += errors ** 2
+
+                self.current_errors = error_count
+                if self.current_frame % self.report_every == 0:
+                    self.set_status("R")
+                    self.record_point(point, i + 1, error_count, frame_error_count, squared_error_count,
+                                      time.time() - start_time)
+
+                if self.precise_enough(i + 1, error_count, squared_error_count):
+                    break
+
+            frames = self.current_frame if repeat else 0
+            self.record_point(point, frames, error_count, frame_error_count, squared_error_count,
+                              time.time() - start_time)
+            p = error_count / (frames * self.frame_length) if frames else 0
+            self.bers.append(p)
+            self.variances.append(ber_variance(frames, self.frame_length, error_count, squared_error_count))
+            self.frame_counts.append(frames)
+            self.bit_errors.append(error_count)
+            self.frame_errors.append(frame_error_count)
+            self.elapsed.append(time.time() - start_time)
+
+            if not p and self.stop_without_errors:
+                while len(self.bers) < len(self.ebn0s):
+                    self.bers.append(0)
+                    self.variances.append(0)
+                    self.frame_counts.append(0)
+                    self.bit_errors.append(0)
+                    self.frame_errors.append(0)
+                    self.elapsed.append(0.0)
+                break
+
+        self.close_capture()
+        self.set_status("F")
+
+        return SampleResult(
+            self.ebn0s,
+            self.bers,
+            self.description,
+            self.frame_length,
+            self.repeat_count,
+            self.frame_counts,
+            self.bit_errors,
+            self.frame_errors,
+            self.elapsed,
+            self.seed,
+            self.variances,
+            self.iteration_summary())
+
+    def samplek(self, point, start, count):
+        """Samples frames start to start + count - 1 of an Eb/N0 point without
+        reporting progress. The frames are the same as samplen would send, so
+        a point can be split into chunks in any way.
+        Returns a tuple (bit_errors, frame_errors, squared_errors,
+        iteration_totals), where squared_errors is the sum of squared
+        per-frame bit error counts and iteration_totals, None unless
+        per-iteration errors are recorded, a list of [bit_errors,
+        frame_errors] of the chunk after every iteration (see
+        add_iteration_totals).
+        """
+        bit_errors = 0
+        frame_errors = 0
+        squared_errors = 0
+        iteration_totals = None
+        for i in range(start, start + count):
+            iteration_errors, weight = self.sample_iterations(self.ebn0s[point], self.frame_rng(point, i))
+            if self.per_iteration:
+                if iteration_totals is None:
+                    iteration_totals = [[0, 0] for errors in iteration_errors]
+                _add_iteration_errors(iteration_totals, iteration_errors, weight)
+            errors = iteration_errors[-1] * weight
+            bit_errors += errors
+            frame_errors += weight if errors else 0
+            squared_errors += errors ** 2
+
+        return bit_errors, frame_errors, squared_errors, iteration_totals
+
+    def sweepn(self):
+        """Samples all the Eb/N0 points at once. The data of every frame is
+        generated, encoded and modulated once, and one vector of unit variance
+        noise is scaled to the noise level of every point still running, so
+        only decoding is repeated per point. Errors of neighbouring points are
+        correlated (which smooths the curve) but estimates are not biased.
+
+        A point stops after repeat_count frames or once the stopping rule is
+        met, and then no longer costs decoding time. If a point stops without
+        errors and stop_without_errors is set, the higher points are dropped
+        after the current frame, keeping the frames they already decoded.
+        Elapsed times only count decoding. Returns a SampleResult.
+        """
+        if self.importance:
+            raise ValueError("Importance sampling does not support sweeping.")
+
+        point_count = len(self.ebn0s)
+        frames = [0] * point_count
+        bit_errors = [0] * point_count
+        frame_errors = [0] * point_count
+        squared_errors = [0] * point_count
+        elapsed = [0.0] * point_count
+        finished = [False] * point_count
+
+        frame = 0
+        while not all(finished):
+            rng = self.sweep_rng(frame)
+            if self.all_zero:
+                data = None
+                modulated_data = self.zero_codeword()
+            else:
+                data = helpers.generate_random(self.frame_length, rng)
+                modulated_data = list(helpers.modulaten(self.encoder.encoden(data)))
+            if self.channel_model:
+                from . import channel_models
+                transmission = channel_models.draw(self.channel_model, modulated_data, rng, self.modem)
+            elif self.modem:
+                symbols = self.modem.modulate(modulated_data)
+                noise = self.modem.unit_noise(len(symbols), rng)
+            else:
+                noise = channel.unit_noise(len(modulated_data), rng)
+
+            cutoff = point_count
+            for point, ebn0 in enumerate(self.ebn0s):
+                if finished[point]:
+                    continue
+
+                start_time = time.time()
+                reliability = None
+                if self.channel_model:
+                    received, reliability = channel_models.receive(transmission, ebn0, self.modem)
+                elif self.modem:
+                    received = self.modem.receive(symbols + channel.noise_sigma(ebn0) * noise,
+                                                  ebn0, len(modulated_data))
+                else:
+                    received = channel.add_noise(modulated_data, noise, ebn0)
+                iteration_errors = self.decode_errors(data, received, ebn0, reliability)
+                errors = iteration_errors[-1]
+                self.add_iteration_errors(point, iteration_errors)
+                elapsed[point] += time.time() - start_time
+
+                if self.capture:
+                    self.capture_frame(frame, point, ebn0, data, received, reliability, errors)
+
+                frames[point] += 1
+                bit_errors[point] += errors
+                frame_errors[point] += 1 if errors else 0
+                squared_errors[point] += errors ** 2
+
+                if (frames[point] >= self.repeat_count[point] or
+                        self.precise_enough(frames[point], bit_errors[point], squared_errors[point])):
+                    finished[point] = True
+                    if not bit_errors[point] and self.stop_without_errors:
+                        cutoff = min(cutoff, point)
+
+            # Higher points are dropped only once they have decoded this frame
+            # too, so every point ends after a whole number of frames:
+            finished[cutoff:] = [True] * (point_count - cutoff)
+            frame += 1
+            if frame % self.report_every == 0 or all(finished):
+                self.report_sweep(frames, bit_errors, finished)
+                for point in range(point_count):
+                    self.record_point(point, frames[point], bit_errors[point], frame_errors[point],
+                                      squared_errors[point], elapsed[point])
+
+        for point in range(point_count):
+            bits = frames[point] * self.frame_length
+            self.bers.append(bit_errors[point] / bits if bits else 0)
+            self.variances.append(ber_variance(frames[point], self.frame_length,
+                                               bit_errors[point], squared_errors[point]) if bits else 0)
+        self.frame_counts = frames
+        self.bit_errors = bit_errors
+        self.frame_errors = frame_errors
+        self.elapsed = elapsed
+
+        self.close_capture()
+        self.set_status("F")
+
+        return SampleResult(
+            self.ebn0s,
+            self.bers,
+            self.description,
+            self.frame_length,
+            self.repeat_count,
+            self.frame_counts,
+            self.bit_errors,
+            self.frame_errors,
+            self.elapsed,
+            self.seed,
+            self.variances,
+            self.iteration_summary())
+
+    def report_sweep(self, frames, bit_errors, finished):
+        """Reports progress of a sweep as progress of its lowest running point.
+        """
+        running = [point for point, done in enumerate(finished) if not done]
+        if running:
+            self.curr_point = running[0]
+            self.current_frame = frames[running[0]]
+            self.current_errors = bit_errors[running[0]]
+            self.set_status("R")
+
+    def add_iteration_errors(self, point, iteration_errors, weight=1):
+        """Adds a frame's (weighted) bit errors after every iteration to the
+        totals of a point, if per-iteration errors are recorded.
+        """
+        if not self.per_iteration:
+            return
+
+        totals = self._iteration_totals.setdefault(point, [[0, 0] for errors in iteration_errors])
+        _add_iteration_errors(totals, iteration_errors, weight)
+
+    def add_iteration_totals(self, point, iteration_totals):
+        """Adds the per-iteration totals of a chunk of frames (see samplek) to
+        the totals of a point.
+        """
+        totals = self._iteration_totals.setdefault(point, [[0, 0] for total in iteration_totals])
+        for total, (bit_errors, frame_errors) in zip(totals, iteration_totals):
+            total[0] += bit_errors
+            total[1] += frame_errors
+
+    def iteration_summary(self, frame_counts=None):
+        """Returns the iterations field of the SampleResult (see its
+        definition), None unless per-iteration errors are recorded.
+
+        Parameters:
+        frame_counts -- the frames sent per point, the specimen's own by
+            default.
+        """
+        if not self.per_iteration:
+            return None
+        if frame_counts is None:
+            frame_counts = self.frame_counts
+
+        summary = []
+        for iteration in range(self.decode.iteration_count):
+            totals = [self._iteration_totals.get(point, [[0, 0]] * self.decode.iteration_count)[iteration]
+                      for point in range(len(self.ebn0s))]
+            summary.append({
+                "bers": [bit_errors / (frames * self.frame_length) if frames else 0
+                         for frames, (bit_errors, frame_errors) in zip(frame_counts, totals)],
+                "bit_errors": [bit_errors for bit_errors, frame_errors in totals],
+                "frame_errors": [frame_errors for bit_errors, frame_errors in totals],
+            })
+
+        return summary
+
+    def record_point(self, point, frames, bit_errors, frame_errors, squared_errors, elapsed):
+        """Writes the running totals of a point to the shared statistics, if
+        there are any (see PointStatistics).
+        """
+        if self.statistics:
+            self.statistics.update(self.id, point, frames, bit_errors, frame_errors, squared_errors, elapsed)
+
+    def precise_enough(self, frames, bit_errors, squared_errors):
+        """Returns whether a point's BER estimate meets the stopping rule
+        (always False without one).
+        """
+        rule = self.stopping_rule
+        if rule is None or bit_errors < rule.min_errors:
+            return False
+
+        variance = ber_variance(frames, self.frame_length, bit_errors, squared_errors)
+        if variance is None:
+            return False
+
+        ber = bit_errors / (frames * self.frame_length)
+        low, high = confidence_interval(ber, variance, rule.confidence)
+        return high - low <= rule.relative_error * ber
+
+    def sweep_rng(self, frame):
+        """Returns the random stream of a frame of a sweep (see frame_rng).
+        """
+        return helpers.make_rng(self.seed, self.id, "sweep", frame)
+
+    def frame_rng(self, point, frame):
+        """Returns the random stream of a frame, used for both its data and
+        noise. Streams are derived from (seed, specimen id, Eb/N0 point, frame),
+        so a run is reproducible regardless of how its frames are split between
+        processes.
+        """
+        return helpers.make_rng(self.seed, self.id, point, frame)
+
+    def sample(self, ebn0, rng=random):
+        """Sends a frame and returns its number of bit errors, weighted by the
+        likelihood ratio of its noise when importance sampling is used.
+        """
+        errors, weight = self.sample_weighted(ebn0, rng)
+        return errors * weight
+
+    def sample_weighted(self, ebn0, rng=random):
+        """Sends a frame and returns a tuple (bit_errors, weight), where weight
+        is the likelihood ratio of the frame's noise (1 unless importance
+        sampling is used).
+
+        In all-zero mode the encoder's all-zero codeword is sent and errors are
+        the non-zero decisions. For linear codes the error rate does not depend
+        on the transmitted codeword, so data generation, encoding and
+        interleaving can be skipped.
+        """
+        iteration_errors, weight = self.sample_iterations(ebn0, rng)
+        return iteration_errors[-1], weight
+
+    def sample_iterations(self, ebn0, rng=random):
+        """Like sample_weighted, but returns a tuple (iteration_errors, weight)
+        with a list of the bit errors after every iteration (see
+        decode_errors).
+        """
+        if self.all_zero:
+            data = None
+            modulated_data = self.zero_codeword()
+        else:
+            data = helpers.generate_random(self.frame_length, rng)
+            modulated_data = list(helpers.modulaten(self.encoder.encoden(data)))
+
+        received, reliability, weight = self.send(modulated_data, ebn0, rng)
+        iteration_errors = self.decode_errors(data, received, ebn0, reliability)
+
+        if self.capture:
+            self.capture_frame(self.current_frame - 1, self.curr_point, ebn0, data,
+                               received, reliability, iteration_errors[-1])
+
+        return iteration_errors, weight
+
+    def decode_errors(self, data, received, ebn0, reliability=None):
+        """Decodes received data and returns a list of its bit errors after
+        every decoding iteration if per_iteration is set, otherwise a list of
+        the errors of the decoder's result.
+        """
+        if not self.per_iteration:
+            return [self.count_errors(data, self.decode_received(received, ebn0, reliability))]
+
+        if reliability is None:
+            decisions = self.decode.iterations(received, ebn0)
+        else:
+            decisions = self.decode.iterations(received, ebn0, reliability)
+        return [self.count_errors(data, decoded_data) for decoded_data in decisions]
+
+    def count_errors(self, data, decoded_data):
+        """Returns the number of bit errors of decoded data, or of its
+        non-zero decisions if data is None (in all-zero mode).
+        """
+        if data is None:
+            decoded_data = decoded_data[:self.frame_length]
+            return len(decoded_data) - decoded_data.count(0)
+
+        return helpers.hamming_distance(data, decoded_data)
+
+    def capture_frame(self, frame, point, ebn0, data, received, reliability, errors):
+        """Writes a frame to the capture file (see the capture module) unless
+        only frames with errors are captured and it has none.
+        """
+        if not errors and self.capture.get("errors_only"):
+            return
+
+        if self._capture_writer is None:
+            from . import capture
+            header = {
+                "description": self.description,
+                "specimen_id": self.id,
+                "seed": self.seed,
+                "sweep": self.sweep,
+                "ebn0s": self.ebn0s,
+                "errors_only": bool(self.capture.get("errors_only")),
+                "metadata": self.capture.get("metadata"),
+            }
+            self._capture_writer = capture.CaptureWriter(self.capture["path"], self.frame_length, header)
+
+        if data is None:
+            data = [0] * self.frame_length
+        self._capture_writer.write(frame, point, ebn0, errors, data, received, reliability)
+
+    def close_capture(self):
+        if self._capture_writer is not None:
+            self._capture_writer.close()
+            self._capture_writer = None
+
+    def zero_codeword(self):
+        """Returns the modulated all-zero codeword. It is encoded only once.
+        """
+        if self._zero_codeword is None:
+            encoded_data = self.encoder.encoden([0] * self.frame_length)
+            self._zero_codeword = list(helpers.modulaten(encoded_data))
+
+        return self._zero_codeword
+
+    def send(self, modulated_data, ebn0, rng=random):
+        """Sends modulated data over the channel (see add_noise, or the
+        channel model if there is one). Returns a tuple (received, reliability,
+        weight), where reliability is a list of per-symbol channel
+        reliabilities if the channel state is known, otherwise None.
+        """
+        if not self.channel_model:
+            noisy_data, weight = self.add_noise(modulated_data, ebn0, rng)
+            return noisy_data, None, weight
+
+        if self.importance:
+            raise ValueError("Importance sampling does not support channel models.")
+
+        from . import channel_models
+        transmission = channel_models.draw(self.channel_model, modulated_data, rng, self.modem)
+        received, reliability = channel_models.receive(transmission, ebn0, self.modem)
+        return received, reliability, 1
+
+    def decode_received(self, received, ebn0, reliability=None):
+        """Decodes received data, passing per-symbol channel reliabilities
+        (known channel state) to the decoder if there are any.
+        """
+        if reliability is None:
+            return self.decode(received, ebn0)
+        return self.decode(received, ebn0, reliability)
+
+    def add_noise(self, modulated_data, ebn0, rng=random):
+        """Returns a tuple (noisy_data, weight). Without importance sampling
+        the weight is always 1. With a modem the modulated data (BPSK values
+        of the coded bits) is sent as its symbols, and noisy_data are the
+        demapped LLRs.
+        """
+        if self.modem:
+            if self.importance:
+                raise ValueError("Importance sampling only supports BPSK without a modem.")
+            return self.modem.transmit(modulated_data, ebn0, rng), 1
+
+        if not self.importance:
+            return list(channel.transmit_awgn(modulated_data, ebn0, rng)), 1
+
+        noisy_data, log_weight = channel.transmit_awgn_biased(
+            modulated_data, ebn0, rng=rng, **self.importance)
+
+        return noisy_data, math.exp(log_weight)
+
+    def transmit(self, data, ebn0, rng=random):
+        if isinstance(data, types.GeneratorType):
+            data = list(data)
+
+        encoded_data = list(self.encoder.encoden(data))
+        encoded_data = helpers.modulaten(encoded_data)
+
+        received, reliability, weight = self.send(list(encoded_data), ebn0, rng)
+
+        return self.decode_received(received, ebn0, reliability)
+
+    def set_status(self, state):
+        if self.progress:
+            self.progress.update(
+                self.id,
+                state,
+                self.curr_point,
+                self.current_frame,
+                self.current_errors)
+
+    def get_progress(self, point, frame):
+        """Returns the percentage of frames sent when the given frame of the
+        given Eb/N0 point is sent.
+        """
+        total_frames_sent = sum(self.repeat_count[:point]) + frame
+        progress = total_frames_sent / sum(self.repeat_count)
+        return int(progress * 100)
+
+    def __init__(self, spec_id, frame_length, encoder, decoder_func, ebn0s, repeat_count=1, description="",
+                 progress=None, report_every=10, seed=None, all_zero=False, importance=None,
+                 stop_without_errors=True, sweep=False, stopping_rule=None, modem=None,
+                 channel_model=None, capture=None, statistics=None, per_iteration=False):
+        self.id = spec_id
+        self.description = description
+        self.seed = helpers.new_seed() if seed is None else seed
+
+        self.frame_length = frame_length
+        self.encoder = encoder
+        self.decode = decoder_func
+        self.all_zero = all_zero
+        self._zero_codeword = None
+        self.importance = importance
+        self.modem = modem
+        self.channel_model = channel_model
+        self.capture = capture
+        self._capture_writer = None
+        self.stop_without_errors = stop_without_errors
+        self.sweep = sweep
+        self.stopping_rule = stopping_rule
+        self.per_iteration = per_iteration
+        self._iteration_totals = {}
+        if per_iteration and not hasattr(decoder_func, "iterations"):
+            raise ValueError("The decoder cannot return decisions after every iteration.")
+        if all_zero and modem and not modem.constellation.symmetric:
+            raise ValueError("The all-zero codeword gives biased error rates on {}.".format(
+                modem.constellation.name))
+
+        self.ebn0s = ebn0s
+        self.bers = []
+        self.variances = []
+        self.frame_counts = []
+        self.bit_errors = []
+        self.frame_errors = []
+        self.elapsed = []
+
+        if not isinstance(repeat_count, Iterable):
+            self.repeat_count = [repeat_count] * len(ebn0s)
+        elif len(repeat_count) == len(ebn0s):
+            self.repeat_count = repeat_count
+        else:
+            raise ValueError(
+                "Mismatched lengths of ebn0s ({}) and repeat_count ({})."
+                .format(len(ebn0s), len(repeat_count)))
+
+        self.progress = progress
+        self.statistics = statistics
+        self.report_every = report_every
+        self.curr_point = 0
+        self.current_frame = 0
+        self.current_errors = 0
+        self.set_status("N")
+
+
+def _add_iteration_errors(totals, iteration_errors, weight=1):
+    for total, errors in zip(totals, iteration_errors):
+        total[0] += errors * weight
+        total[1] += weight if errors else 0
+
+
+def ber_variance(frame_count, frame_length, error_sum, squared_error_sum):
+    """Returns the variance of a BER estimate from the sums of per-frame
+    (possibly weighted) bit error counts and of their squares. Frames are the
+    independent samples; None if fewer than two frames were sent.
+    """
+    if frame_count < 2:
+        return None
+
+    mean = error_sum / frame_count
+    frame_variance = (squared_error_sum - frame_count * mean ** 2) / (frame_count - 1)
+    return max(frame_variance, 0) / frame_count / frame_length ** 2
+
+
+def confidence_interval(ber, variance, confidence=0.95):
+    """Returns a (low, high) normal approximation confidence interval of a
+    BER estimate of the given variance (see ber_variance).
+    """
+    half_width = statistics.NormalDist().inv_cdf((1 + confidence) / 2) * math.sqrt(variance)
+    return max(ber - half_width, 0.0), ber + half_width
+
+
+def create_specimens(configurations, seed=None):
+    """Creates specimens of a run. All of them share the run's seed (a new
+    one if seed is None).
+    """
+    if seed is None:
+        seed = helpers.new_seed()
+
+    specimens = []
+    for i, config in enumerate(configurations):
+        specimens.append(Specimen(i, seed=seed, **config))
+
+    return specimens
+
+
+def iteration_results(configurations, results):
+    """Returns a tuple (results, config_hashes) of results to store. A result
+    with per-iteration errors is replaced by one SampleResult per iteration,
+    stored under the hash of its configuration decoding with that many
+    iterations, so that it adds to the points of such specimens. The frames
+    were decoded once for all iterations, so their elapsed time is split
+    evenly across the rows instead of being counted once per iteration.
+    """
+    stored = []
+    hashes = []
+    for config, result in zip(configurations, results):
+        if not result.iterations:
+            stored.append(result)
+            hashes.append(results_store.config_hash(config))
+            continue
+
+        elapsed = [seconds / len(result.iterations) for seconds in result.elapsed]
+        for iteration, summary in enumerate(result.iterations):
+            decoder = copy.copy(config["decoder_func"])
+            decoder.iteration_count = iteration + 1
+            stored.append(result._replace(
+                bers=summary["bers"],
+                description="{} [iteration {}]".format(result.description, iteration + 1),
+                bit_errors=summary["bit_errors"],
+                frame_errors=summary["frame_errors"],
+                elapsed=elapsed,
+                variances=[None] * len(result.ebn0s),
+                iterations=None))
+            hashes.append(results_store.config_hash(dict(config, decoder_func=decoder)))
+
+    return stored, hashes
+
+
+def _init_worker(progress, statistics=None):
+    global _progress, _statistics
+    _progress = progress
+    _statistics = statistics
+
+
+def _sample_specimen(specimen):
+    if _progress:
+        specimen.progress = _progress
+    if _statistics:
+        specimen.statistics = _statistics
+    return specimen.samplen()
+
+
+def pool_exec(configurations, process_count=6, seed=None):
+    specimens = create_specimens(configurations, seed)
+
+    pool = multiprocessing.Pool(process_count)
+    result = pool.map(_sample_specimen, specimens)
+
+    return result
+
+
+def verbose_exec(configurations, process_count=6, seed=None, name=None):
+    """Runs the configurations on a pool of processes, printing progress, and
+    saves the results to a JSON file in "out" and to the results store.
+
+    Parameters:
+    name -- names the JSON file; defaults to the name of the calling script.
+    """
+    import humanize
+
+    print("TURBO SIMCORE")
+    print("Running {} specimens:".format(len(configurations)))
+    for config in configurations:
+        print("  - " + config['description'])
+    print("Number of processes: {}".format(process_count))
+
+    specimens = create_specimens(configurations, seed)
+    progress = ProgressCounters(len(specimens))
+    statistics = PointStatistics(specimens)
+
+    pool = multiprocessing.Pool(process_count, _init_worker, (progress, statistics))
+
+    async_result = pool.map_async(_sample_specimen, specimens)
+
+    log = create_log()
+    log.write(pformat(configurations) + "\n" * 2)
+
+    print(time.strftime("Started %H:%M:%S\n"))
+    start_time = time.time()
+
+    display_stats(log, progress, specimens, async_result, start_time, statistics=statistics)
+
+    time_elapsed = time.time() - start_time
+    print(time.strftime("\nFinished %H:%M:%S"))
+    print("Time elapsed: {}\n".format(humanize.naturaldelta(time_elapsed)))
+
+    try:
+        results = async_result.get()
+    finally:
+        pool.close()
+        progress.close()
+        statistics.close()
+
+    [pprint(dict(item._asdict())) for item in results]
+
+    info = {
+        "date": datetime.datetime.isoformat(datetime.datetime.now()),
+        "time_elapsed": time_elapsed,
+        "specimens": len(specimens),
+        "processes": process_count,
+        "log_file": log.name,
+        "seed": specimens[0].seed if specimens else seed,
+    }
+    out_file = save_results(info, results, name)
+    print("\nFile saved:", out_file)
+
+    store_results(info, *iteration_results(configurations, results))
+
+    close_log(log, results)
+
+    return results
+
+
+def display_stats(log, progress, specimens, async_result, start_time, interval=0.2, statistics=None):
+    """Displays progress of the specimens until async_result is ready. Wakes
+    up every interval seconds (or as soon as the result is ready) and reads
+    the progress counters. Every minute the progress and, if given, the
+    PointStatistics of all points are logged.
+    """
+    timer_mins = _minutes_time()
+    time_elapsed = lambda: time.time() - start_time
+    read_stats = lambda: dict((spec.id, progress.read(spec)) for spec in specimens)
+
+    while not async_result.ready():
+        async_result.wait(interval)
+        print_stats(read_stats(), time_elapsed())
+
+        if timer_mins != _minutes_time():
+            log_stats(log, read_stats())
+            if statistics:
+                log_stats(log, dict((spec.id, statistics.read(spec)) for spec in specimens))
+        timer_mins = _minutes_time()
+
+    print_stats(read_stats(), time_elapsed())
+    print()
+
+
+def print_stats(stats, time_elapsed):
+    import humanize
+
+    print('\r[{}] {:<10}'.format(_spinner(), humanize.naturaldelta(time_elapsed)), end=' ')
+    for spec_id, status in stats.items():
+        print("[{:<2}{}{:>4}% {:<.6f}]".format(
+            spec_id,
+            status.status,
+            status.progress,
+            status.current_estimate), end=' ')
+    sys.stdout.flush()
+
+
+def save_results(info, results, name=None):
+    data = dict(info)
+    data["results"] = [item._asdict() for item in results]
+    data = json.dumps(data)
+
+    out_folder = os.path.abspath("out")
+    if not os.path.exists(out_folder):
+        os.makedirs(out_folder)
+
+    if name is None:
+        name = os.path.basename(inspect.stack()[2][1])[:-3]
+    out_file = "{}_{}.json".format(
+        hex(len(os.listdir(out_folder)))[2:],
+        name)
+    out_file = os.path.join(out_folder, out_file)
+
+    with open(out_file, 'w') as f:
+        f.write(data)
+
+    return out_file
+
+
+def store_results(info, results, config_hashes, path=STORE_PATH):
+    """Appends the simulated points to the results store.
+    """
+    store = results_store.ResultsStore(path)
+    try:
+        run_id = store.add_run(info)
+        store.add_results(run_id, results, config_hashes)
+    finally:
+        store.close()
+
+
+def create_log():
+    logs_folder = os.path.abspath("logs")
+    if not os.path.exists(logs_folder):
+        os.makedirs(logs_folder)
+
+    log_uuid = str(uuid.uuid4())
+    log_file = os.path.join(logs_folder, "{}.log".format(log_uuid))
+
+    log_file = open(log_file, "a")
+    log_file.write("{}\n".format(_iso_time()))
+
+    print("Log created:", log_file.name)
+
+    return log_file
+
+
+def close_log(log, results):
+    log.write("\n\n{}\n".format(_iso_time()))
+    log.write(pformat(results))
+
+    log.close()
+
+
+def log_stats(log, stats):
+    log.write("[{}] {}\n".format(_iso_time(), stats))
+
+
+def _iso_time():
+    return datetime.datetime.isoformat(datetime.datetime.now())